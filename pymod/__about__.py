@@ -15,4 +15,4 @@
 # see <https://www.gnu.org/licenses/>.
 #
 
-__version__ = '1.1.3'
+__version__ = '1.2.0'
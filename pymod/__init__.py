@@ -16,5 +16,8 @@
 #
 
 from .pymod import Module           # noqa: F401
+from .moduledata import ModuleData  # noqa: F401
+from .timeline import Timeline      # noqa: F401
+from .sinks import NullSink, RawSink, WavSink, PyAudioSink  # noqa: F401
 
 __all__ = []
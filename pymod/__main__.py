@@ -15,6 +15,7 @@
 # see <https://www.gnu.org/licenses/>.
 #
 
+import sys
 import traceback
 import argparse
 import pymod
@@ -41,12 +42,20 @@ def main():
         parser.add_argument("-v", "--verbose", action="store_true", help="If playing, this displays the pattern as it's being played. If rendering, this shows the progress of each pattern.")
         parser.add_argument("-c", "--channels", action="store_true", help="Renders each channel to its own file. If playing, this does nothing. Each channel's volume is identical to when playing/rendering all channels at once, and stereo modes are accounted for.")
         parser.add_argument("-b", "--buffer", type=int, default=pymod.Module.buffer_size_default(), help=f"Change the buffer size for realtime playback (default is {pymod.Module.buffer_size_default()})")
+        parser.add_argument("--preroll", type=float, default=pymod.Module.preroll_default(), help=f"How many seconds are mixed before realtime playback starts, so it doesn't stutter if the mixing falls behind (default is {pymod.Module.preroll_default()})")
         parser.add_argument("-q", "--quiet", action="store_true", help="Shows absolutely no info while playing/rendering a module")
         parser.add_argument("-le", "--legacy", action="store_true", help="Simulates the quirks of ProTracker 2.3")
         parser.add_argument("-a", "--amplify", type=float, default=1, help="Amplifies playback by the specified factor (e.g. 1 for normal volume, 2 for double volume, 0.5 for half volume)")
         parser.add_argument("-i", "--interpolate", action="store_true", help="Use linear interpolation when playing back samples, resulting in a smoother, cleaner sound")
+        parser.add_argument("--interpolation", type=str, default="linear", help="The kind of interpolation used by --interpolate and E09: " + ", ".join(pymod.Module.interpolations()) + " (cubic and sinc sound cleaner at lower sample rates)")
+        parser.add_argument("--filter_model", type=str, default="simple", help="How the filter is simulated: " + ", ".join(pymod.Module.filter_models()) + " (a500 and a1200 model the filters in those Amigas)")
+        parser.add_argument("-e", "--engine", type=str, default="python", help="Selects what mixes the audio: " + ", ".join(pymod.Module.engines()) + " (numpy and paula are much quicker, and need NumPy installed)")
         parser.add_argument("--startpos", type=int, default=0, help="Start playing the module at the given position")
         parser.add_argument("--patternscount", type=int, help="Number of patterns to play in total")
+        parser.add_argument("--resume", action="store_true", help="Saves the render every so often, so if it's interrupted, running the same command again carries on from where it left off")
+        parser.add_argument("--stream", action="store_true", help="Writes the render to the file as it goes, instead of keeping all of it in memory until the end (for very long renders)")
+        parser.add_argument("--sink", type=str, help="Sends the audio somewhere else, as quickly as it can be mixed: null (it's thrown away, for measuring how quickly a module's mixed) or raw (raw signed 16-bit little endian PCM, written to the --render file, or to stdout for piping into another program)")
+        parser.add_argument("--seek", type=float, default=0, help="Start playing/rendering the module this many seconds in (counting from the start position)")
         args = parser.parse_args()
 
         module = pymod.Module(args.input_file.name)
@@ -55,17 +64,34 @@ def main():
         module.set_play_mode(args.play_mode.lower())
         module.set_verbose(args.verbose)
         module.set_buffer_size(args.buffer)
+        module.set_preroll(args.preroll)
         module.set_quiet(args.quiet)
         module.set_legacy(args.legacy)
         module.set_amplify(args.amplify)
         module.set_interpolate(args.interpolate)
+        module.set_interpolation(args.interpolation.lower())
+        module.set_filter_model(args.filter_model.lower())
+        module.set_engine(args.engine.lower())
         module.set_start_pos(args.startpos)
         if args.patternscount is not None:
             module.set_nb_of_patterns(args.patternscount)
+        module.seek(args.seek)
 
         if module is not None:
-            if args.render is not None:
-                module.render_to(args.render.name, args.channels)
+            if args.sink is not None:
+                if args.sink.lower() == "null":
+                    module.render_to(pymod.NullSink())
+                elif args.sink.lower() == "raw":
+                    if args.render is not None:
+                        with open(args.render.name, "wb") as raw_file:
+                            module.render_to(pymod.RawSink(raw_file))
+                    else:
+                        module.set_quiet(True)  # (anything printed would end up in the audio)
+                        module.render_to(pymod.RawSink(sys.stdout.buffer))
+                else:
+                    print(f"Error: Invalid sink: {args.sink}. Accepted sinks: null, raw")
+            elif args.render is not None:
+                module.render_to(args.render.name, args.channels, args.resume, args.stream)
             else:
                 module.play()
 
@@ -0,0 +1,170 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import math
+
+
+# -- Constants
+# the cutoff of the low-pass filter that's always on (a resistor and a capacitor, so it's one pole)
+fixed_filter_cutoffs = {
+    "a500": 1 / (2 * math.pi * 360 * 0.1e-6),  # about 4421 hz
+    "a1200": 1 / (2 * math.pi * 680 * 6800e-12)  # about 34419 hz, so it barely does anything
+}
+
+# the "led" filter (turned on and off by e0x) is a two pole butterworth-ish filter, the same on both
+led_filter_cutoff = 1 / (2 * math.pi * 10000 * math.sqrt(6800e-12 * 3900e-12))  # about 3091 hz
+led_filter_q = math.sqrt(10000 * 10000 * 6800e-12 * 3900e-12) / (3900e-12 * (10000 + 10000))  # about 0.66
+
+
+# -- Classes
+class _Section:
+    """One filter (a biquad, in transposed direct form II) with its own state for each output. The coefficients
+    are only worked out once, when the player starts."""
+
+    block_length = 32  # blocks are filtered this many frames at a time
+
+    def __init__(self, coefficients, outputs):
+        self.coefficients = coefficients  # b0, b1, b2, a1, a2
+        self.states = [[0.0, 0.0] for a in range(0, outputs)]
+        self._matrices = None
+
+    def process(self, values):
+        b0, b1, b2, a1, a2 = self.coefficients
+        filtered = []
+        for value, state in zip(values, self.states):
+            filtered_value = (b0 * value) + state[0]
+            state[0] = (b1 * value) - (a1 * filtered_value) + state[1]
+            state[1] = (b2 * value) - (a2 * filtered_value)
+            filtered.append(filtered_value)
+        return filtered
+
+    def process_block(self, values):
+        """Filters every output (a row of values) at once. The filter's written as a state space (the 2 values of its
+        state, and how they carry on from one frame to the next), so each block_length frames is just a matrix
+        multiply for what the frames do, plus what the state at the start does to them. Only the state at the start
+        of each of those has to be worked out one after the other."""
+
+        import numpy as np  # only needed for filtering whole blocks, so it isn't imported until then
+
+        impulse, state_output, state_end, state_step = self._get_matrices()
+        length = self.block_length
+        outputs, frames = values.shape
+        whole = frames // length
+        filtered = np.empty((outputs, frames))
+        states = np.array(self.states)
+
+        if whole > 0:
+            blocks = values[:, :whole * length].reshape(outputs, whole, length)
+            blocks_filtered = blocks @ impulse[length].T  # as if every block started with no state
+            blocks_state = blocks @ state_end[length].T  # what each block does to the state
+            starts = np.empty((outputs, whole, 2))
+            for block in range(0, whole):
+                starts[:, block] = states
+                states = (states @ state_step[length].T) + blocks_state[:, block]
+            blocks_filtered += starts @ state_output.T
+            filtered[:, :whole * length] = blocks_filtered.reshape(outputs, whole * length)
+
+        remainder = frames - (whole * length)
+        if remainder > 0:
+            block = values[:, whole * length:]
+            filtered[:, whole * length:] = (block @ impulse[remainder].T) + (states @ state_output[:remainder].T)
+            states = (states @ state_step[remainder].T) + (block @ state_end[remainder].T)
+
+        self.states = states.tolist()
+        return filtered
+
+    def _get_matrices(self):
+        # these only depend on the coefficients, so they're worked out once
+        if self._matrices is None:
+            import numpy as np
+
+            b0, b1, b2, a1, a2 = self.coefficients
+            length = self.block_length
+            step = np.array([[0 - a1, 1], [0 - a2, 0]])  # how the state carries on to the next frame...
+            value_state = np.array([b1 - (a1 * b0), b2 - (a2 * b0)])  # ...and what each value adds to it
+
+            powers = [np.identity(2)]
+            for a in range(0, length):
+                powers.append(powers[-1] @ step)
+            state_output = np.array([power[0] for power in powers[:length]])  # what the state does to each frame of a block
+            response = np.array([b0] + [(powers[a] @ value_state)[0] for a in range(0, length - 1)])  # the impulse response
+
+            impulse = []  # for every length up to block_length, what each value does to each frame...
+            state_end = []  # ...and to the state at the end
+            for block_length in range(0, length + 1):
+                matrix = np.zeros((block_length, block_length))
+                for a in range(0, block_length):
+                    matrix[a, :a + 1] = response[a::-1]
+                impulse.append(matrix)
+                state_end.append(np.array([powers[block_length - 1 - a] @ value_state for a in range(0, block_length)]).reshape(block_length, 2).T)
+            self._matrices = (impulse, state_output, state_end, powers)
+        return self._matrices
+
+
+class AmigaFilter:
+    """A model of the filters on an Amiga's audio output: a one pole low-pass filter that's always on, followed by the
+    two pole "led" filter, which E0x turns on and off. The led filter always keeps up with the sound (just like the
+    real thing), so turning it on and off doesn't click."""
+
+    def __init__(self, model, sample_rate, outputs):
+        self.model = model
+        self._fixed_filter = _Section(_get_one_pole(fixed_filter_cutoffs[model], sample_rate), outputs)
+        self._led_filter = _Section(_get_two_pole(led_filter_cutoff, led_filter_q, sample_rate), outputs)
+
+    def process(self, values, led):
+        """Filters one frame (a value for each output), returning the filtered values."""
+
+        values = self._fixed_filter.process(values)
+        values_led = self._led_filter.process(values)
+        if led:
+            values = values_led
+        return [round(value) for value in values]
+
+    def process_block(self, values, led):
+        """Filters a block of frames (a row for each output) using NumPy."""
+
+        import numpy as np
+
+        values = self._fixed_filter.process_block(values)
+        values_led = self._led_filter.process_block(values)
+        if led:
+            values = values_led
+        return np.rint(values).astype(np.int64)
+
+
+# -- Functions
+def filter_models():
+    """Every kind of filter that can be used: "simple" averages each byte with the last one (on each channel), and the
+    others are models of the filters in those Amigas."""
+
+    return ["simple"] + list(fixed_filter_cutoffs)
+
+
+def _get_one_pole(cutoff, sample_rate):
+    if cutoff >= sample_rate * 0.45:  # too close to (or above) the highest frequency there is, so it does nothing
+        return 1, 0, 0, 0, 0
+    k = math.tan(math.pi * cutoff / sample_rate)
+    return k / (1 + k), k / (1 + k), 0, (k - 1) / (k + 1), 0
+
+
+def _get_two_pole(cutoff, q, sample_rate):
+    if cutoff >= sample_rate * 0.45:
+        return 1, 0, 0, 0, 0
+    k = math.tan(math.pi * cutoff / sample_rate)
+    norm = 1 / (1 + (k / q) + (k * k))
+    b0 = k * k * norm
+    return b0, 2 * b0, b0, 2 * ((k * k) - 1) * norm, (1 - (k / q) + (k * k)) * norm
@@ -0,0 +1,377 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+try:
+    import numpy as np
+except ImportError:  # the numpy engine can't be used without it, but everything else still works
+    np = None
+
+from .interpolation import kernel_phases
+from .paula import paula_phase_one, paula_gain_bits, paula_step_rate
+
+
+# -- Classes
+class SampleBank:
+    """A module's sample data, ready for mixing: every byte's already converted to the unsigned value the player
+    uses ((byte + 128) & 255), and there's a guard byte after the last one (a copy of it) so the next byte can
+    always be read without checking where the data ends. Inverted samples are copied in from the overlay
+    whenever it changes."""
+
+    def __init__(self, sample_overlay):
+        self._sample_overlay = sample_overlay
+        data = np.frombuffer(sample_overlay.data, dtype=np.uint8)
+        self._original = np.empty(len(data) + 1, dtype=np.uint8)
+        self._original[:-1] = data + 128  # (it wraps around, just like & 255)
+        self._original[-1] = self._original[-2]
+        self.values = self._original
+        self.length = len(data)  # not counting the guard byte
+        self._changes = None
+        self.update()
+
+    def update(self):
+        if self._changes == self._sample_overlay.changes:
+            return
+        self._changes = self._sample_overlay.changes
+        copies = self._sample_overlay.copies()
+        if len(copies) == 0:
+            self.values = self._original
+            return
+        self.values = self._original.copy()
+        for start, copy in copies:
+            self.values[start:start + len(copy)] = np.frombuffer(copy, dtype=np.uint8) + 128
+        self.values[-1] = self.values[-2]
+
+
+class BlockMixer:
+    """Mixes the frames in between ticks for a player, a whole block at a time using NumPy. Nothing changes
+    between ticks apart from the sample positions, so every channel's block is worked out in one go. Anything
+    else (a sample looping or ending) stops the block early, and the player mixes that frame itself, so the
+    output is exactly the same as mixing one frame at a time."""
+
+    def __init__(self, player):
+        self._player = player
+        self._sample_bank = SampleBank(player.mod_sample_overlay)
+        self._kernel = player._kernel
+        if self._kernel is not None:
+            self._kernel_weights = np.array(self._kernel.weights)  # one row per phase, one column per tap
+
+    def mix(self, frames, tick, delay_counter, loop_checked=False):
+        """Mixes up to the given amount of frames (all in the same tick), and returns how many were mixed along
+        with the new delay counter. 0 frames means the next frame has to be mixed by the player. If loop_checked
+        is true, the player's already checked whether the samples have looped or ended on the first frame."""
+
+        player = self._player
+        mod_channels = player.mod_channels
+
+        positions = [None] * mod_channels  # (channels that aren't voices this tick aren't moving, and can't loop or end)
+        for channel in player.mod_voices:
+            positions[channel], channel_frames = self._positions(channel, frames, int(loop_checked))
+            frames = min(frames, channel_frames)
+            if frames == 0:
+                return 0, delay_counter
+
+        mod_sample_offset = player.mod_sample_offset
+        mod_sample_volume = player.mod_sample_volume
+        self._sample_bank.update()  # in case any samples have been inverted since the last block
+        channel_bytes = [None] * mod_channels  # (None is silent)
+        for channel in player.mod_voices:
+            if mod_sample_offset[channel] == 0:
+                mod_sample_volume[channel] = 0  # same as the player does every frame
+            if positions[channel] is not None:
+                if self._volume(channel, tick) > 0:
+                    channel_bytes[channel] = self._channel_bytes(channel, positions[channel][:frames], tick)
+                player.mod_sample_position[channel] = float(positions[channel][frames])
+
+        return frames, self._mixdown(channel_bytes, frames, delay_counter)
+
+    def _positions(self, channel, frames, start):
+        """Returns the position of a channel at the start of each frame (plus the one after the last frame), added up one step
+        at a time exactly like the player does, or None if it isn't moving. Also returns how many frames it can play before
+        its sample ends, or anything else the player has to deal with happens (checking from the start frame onwards)."""
+
+        player = self._player
+        sample_number = player.mod_sample_number[channel]
+        if sample_number > 0:
+            sample = player.mod_samples[sample_number - 1]
+
+        if not player.mod_sample_playing[channel]:  # not moving
+            position = player.mod_sample_position[channel]
+            if sample_number == 0 or (sample.loop_length <= 2 and not player.mod_sample_playing[channel]):  # (a sample that isn't looping can only be stopped again, which changes nothing)
+                return None, frames
+            if sample.loop_length <= 2:
+                event = position > sample.length - 1 or position < 0
+            elif player.mod_loop_play_full[channel]:
+                event = position > sample.length
+            else:
+                event = position > sample.loop_length + sample.loop_start
+            if event:
+                return None, min(start, frames)
+            return None, frames
+
+        sample_step_rate = self._step_rate(channel)
+        if player.mod_sample_reversed[channel]:
+            sample_step_rate = -sample_step_rate
+        positions = self._accumulate(player.mod_sample_position[channel], sample_step_rate, frames)
+        if sample_number == 0:
+            return positions, frames
+
+        if sample.loop_length <= 2:
+            return positions, self._first(((positions > sample.length - 1) | (positions < 0)), start, frames)
+        elif player.mod_loop_play_full[channel]:
+            return positions, self._first(positions > sample.length, start, frames)
+
+        loop_end = sample.loop_length + sample.loop_start
+        frame = self._first(positions > loop_end, start, frames)
+        if player.mod_sample_number[channel] != player.mod_sample_number_cued[channel]:
+            return positions, frame  # the cued sample takes over when the loop ends
+        while frame < frames:
+            # looping back, just like the player (which happens before the frame's mixed)
+            positions[frame:] = self._accumulate(positions[frame] - sample.loop_length, sample_step_rate, frames - frame)
+            frame = self._first(positions > loop_end, frame + 1, frames)
+        return positions, frames
+
+    def _step_rate(self, channel):
+        # how far a channel moves every frame
+        return self._player.mod_frequency[channel] / self._player._sample_rate
+
+    def _accumulate(self, position, sample_step_rate, frames):
+        # the position at the start of each frame, plus the one after the last frame (each one's added to the last, so
+        # the rounding's exactly the same as the player's)
+        steps = np.full(frames + 1, sample_step_rate)
+        steps[0] = position
+        return np.add.accumulate(steps)
+
+    def _first(self, condition, start, frames):
+        # the first frame from start where the condition's true (or frames if there isn't one)
+        condition_frames = np.flatnonzero(condition[start:frames])
+        if len(condition_frames) > 0:
+            return start + int(condition_frames[0])
+        return frames
+
+    def _read(self, index):
+        # unsigned sample bytes, with negative positions wrapping around like indexing the module data does
+        if index.min() < 0:
+            index = np.where(index < 0, index + self._sample_bank.length, index)
+        return self._sample_bank.values[index].astype(np.int64)
+
+    def _channel_bytes(self, channel, positions, tick):
+        player = self._player
+
+        sample_byte_position = (player.mod_sample_offset[channel] + positions).astype(np.int64)
+        np.minimum(sample_byte_position, self._sample_bank.length - 1, out=sample_byte_position)
+        if player.mod_interpolate_channel[channel] and self._kernel is not None:
+            return self._scale(channel, self._kernel_bytes(sample_byte_position, positions), tick)
+        sample_byte = self._read(sample_byte_position)
+        if player.mod_interpolate_channel[channel]:
+            sample_position_mod = np.mod(positions, 1)
+            sample_byte_next = self._read(sample_byte_position + 1)  # past the end, this is the guard byte (which is the same as the last byte)
+            sample_byte_step = ((sample_byte_next << 8) - (sample_byte << 8)) * sample_position_mod
+            sample_byte = ((sample_byte << 8) + sample_byte_step - 32768) / 32768
+        else:
+            sample_byte = (sample_byte - 128) / 128
+        return self._scale(channel, sample_byte, tick)
+
+    def _kernel_bytes(self, sample_byte_position, positions):
+        # every frame's weights are looked up by its phase, and the bytes around it are added up one tap at a time (in
+        # the same order as the player does it, so the result's exactly the same)
+        kernel = self._kernel
+        last_byte_position = self._sample_bank.length - 1
+        weights = self._kernel_weights[(np.mod(positions, 1) * kernel_phases).astype(np.int64)]
+        sample_byte = np.zeros(len(positions))
+        for tap in range(0, kernel.taps):
+            tap_position = np.clip(sample_byte_position + (kernel.start + tap), 0, last_byte_position)
+            sample_byte += ((self._sample_bank.values[tap_position].astype(np.int64) - 128) / 128) * weights[:, tap]
+        return sample_byte
+
+    def _volume(self, channel, tick):
+        # the channel's volume, from 0 to 64
+        player = self._player
+        if player._legacy and tick == 0:
+            volume = player.mod_sample_volume[channel]
+        else:
+            volume = player.mod_sample_volume[channel] + player.mod_tremolo_offset[channel]
+        if volume > 64:
+            volume = 64
+        if volume < 0:
+            volume = 0
+        return volume
+
+    def _scale(self, channel, sample_byte, tick):
+        # applies the channel's volume, and converts the bytes to 16-bit
+        player = self._player
+        volume = self._volume(channel, tick)
+        volume /= 64
+        volume *= player._amplify
+        sample_byte *= volume
+        sample_byte /= player.mod_channels
+        return (sample_byte * 32768).astype(np.int64)
+
+    def _mixdown(self, channel_bytes, frames, delay_counter):
+        player = self._player
+        stereo = player.stereo
+        mod_channels = player.mod_channels
+        mod_channel_byte = player.mod_channel_byte
+        mod_channel_byte_last = player.mod_channel_byte_last
+        mod_filter_order = player.mod_filter_order
+        mod_bass_history = player.mod_bass_history
+        mod_bass_sum = player.mod_bass_sum
+        mod_bass_position = player.mod_bass_position
+        bass_position = (mod_bass_position + frames) % mod_filter_order  # where the oldest byte will be after this block
+
+        # only the channels that could be heard are mixed (everything about the others is 0, and stays that way)
+        mixdown_channels = player.mod_mixdown_channels
+        silence = np.zeros(frames, dtype=np.int64)
+        mixed_bytes = np.zeros((mod_channels, frames), dtype=np.int64)
+        for channel in mixdown_channels:
+            if channel_bytes[channel] is None:
+                channel_bytes[channel] = silence
+            channel_byte = channel_bytes[channel]
+            previous_bytes = np.concatenate(([mod_channel_byte[channel]], channel_byte[:-1]))  # the byte before each frame, which is what the filters use
+            if player.mod_using_bass_channel:
+                # the bass history (oldest first) followed by every byte added to it during the block, added up so the
+                # sum at any frame is just the difference of two of them
+                history = np.concatenate((np.array(mod_bass_history[channel][mod_bass_position:] + mod_bass_history[channel][:mod_bass_position], dtype=np.int64), previous_bytes))
+                history_sum = np.concatenate(([0], np.cumsum(history)))
+                if player.mod_bass_channel[channel]:
+                    channel_byte = (history_sum[mod_filter_order + 1:mod_filter_order + 1 + frames] - history_sum[1:frames + 1]) // mod_filter_order
+                bass_history = history[frames:frames + mod_filter_order].tolist()
+                mod_bass_history[channel] = bass_history[mod_filter_order - bass_position:] + bass_history[:mod_filter_order - bass_position]
+                mod_bass_sum[channel] = int(history_sum[frames + mod_filter_order] - history_sum[frames])
+            if player.mod_filter and player._amiga_filter is None and not player.mod_bass_channel[channel]:
+                channel_byte = (channel_byte + previous_bytes) // 2
+
+            mod_channel_byte_last[channel] = int(previous_bytes[-1])
+            mod_channel_byte[channel] = int(channel_bytes[channel][-1])
+            mixed_bytes[channel] = channel_byte
+
+        if player.mod_using_bass_channel:
+            player.mod_bass_position = bass_position
+
+        # every channel's multiplied by its gain for each output (left and right, or just the one in mono) all in one go.
+        # each one's rounded before they're added up, just like the player does
+        gains = np.array(player.mod_channel_gain)[mixdown_channels]
+        channel_outputs = np.trunc(gains.T[:, :, np.newaxis] * mixed_bytes[mixdown_channels]).astype(np.int64)
+        if stereo:
+            channel_outputs *= 2
+        delayed_bytes = None
+        if not player._legacy and player.mod_using_delay_channel:
+            delayed_bytes, delay_counter = self._delay(mixed_bytes, frames, delay_counter)
+
+        if player._stems:
+            # every channel has its own outputs instead of them being added up (one after the other, in the same order
+            # they're written to each frame)
+            outputs = 2 if stereo else 1
+            stem_sums = np.zeros((mod_channels, outputs, frames), dtype=np.int64)
+            stem_sums[mixdown_channels] = channel_outputs.transpose(1, 0, 2)
+            if delayed_bytes is not None:
+                stem_sums[:, -1] += delayed_bytes  # delay only appears in the right channel in stereo
+            channel_sums = stem_sums.reshape(mod_channels * outputs, frames)
+        else:
+            channel_sums = channel_outputs.sum(axis=1)
+            if delayed_bytes is not None:
+                channel_sums[-1] += delayed_bytes.sum(axis=0)
+
+        if player._amiga_filter is not None:
+            channel_sums = player._amiga_filter.process_block(channel_sums, player.mod_filter)
+
+        output_frames = np.empty((frames, len(channel_sums)), dtype="<u2")
+        for counter, channel_sum in enumerate(channel_sums):
+            channel_sum = np.where(channel_sum > 32767, 32767, channel_sum)
+            channel_sum = np.where(channel_sum < -32768, 32768, channel_sum)  # this is what the player does, so it's done here too
+            output_frames[:, counter] = (channel_sum + 32768 + 32768) & 65535
+
+        output = player._output
+        if output is not None:  # (there isn't one when fast-forwarding)
+            output.frombytes(memoryview(output_frames.astype(np.uint16, copy=False)).cast("B"))  # (the output's kept as 16-bit values, in the machine's byte order)
+        return delay_counter
+
+    def _delay(self, mixed_bytes, frames, delay_counter):
+        """Works out the pseudo-reverb for a block, returning each channel's delayed bytes (a row for each channel, with a
+        column for each frame) and the new delay counter.
+        The counter goes up once for every channel on every frame, so each step of the counter is a channel and a place
+        in that channel's buffer. A place in the buffer isn't used again until the counter goes all the way round, so
+        every step up until then can be worked out at once, with exactly the same arithmetic the player uses."""
+
+        player = self._player
+        mod_channels = player.mod_channels
+        mod_delay_length = player.mod_delay_length
+        delay_cycle = mod_delay_length - 1  # the counter goes back to 0 when it gets to the last place (which is never written to)
+        if not isinstance(player.mod_channel_delay_buffer, np.ndarray):  # (the player reads and writes it just the same)
+            player.mod_channel_delay_buffer = np.array(player.mod_channel_delay_buffer, dtype=np.float64)
+        delay_buffer = player.mod_channel_delay_buffer
+        delay_on = np.array(player.mod_delay_channel)
+        delay_decay = np.where(player.mod_delay_channel_fast, 0.5, 0.8)
+
+        # where the counter is on every step, and whether it's writing to the buffer (it doesn't when it's just gone back to 0)
+        steps = np.arange(frames * mod_channels)
+        if delay_counter == 0:  # only at the very start
+            counters = np.where(steps == 0, 0, ((steps - 1) % delay_cycle) + 1)
+        else:
+            counters = ((delay_counter - 1 + steps) % delay_cycle) + 1
+        writes = counters != delay_cycle
+        positions = np.where(writes, counters, 0)
+        delay_counter = int(positions[-1]) + 1
+
+        # channels with the delay off whose buffers have completely died away would only be adding silence to silence
+        active = np.logical_not(player.mod_delay_silent)
+        delayed_bytes = np.zeros(frames * mod_channels, dtype=np.int64)
+        if not active.any():
+            return delayed_bytes.reshape(frames, mod_channels).T, delay_counter
+        channels = steps % mod_channels
+
+        for start in range(0, len(steps), delay_cycle):
+            chunk = steps[start:start + delay_cycle]
+            chunk = chunk[active[channels[chunk]]]
+            channel = channels[chunk]
+            position = positions[chunk]
+            write = writes[chunk]
+            old_bytes = delay_buffer[channel, position]
+            channel_bytes = np.where(delay_on[channel], mixed_bytes[channel, chunk // mod_channels], 0)
+            new_bytes = np.where(write, (old_bytes + channel_bytes) * delay_decay[channel], old_bytes)
+            previous_bytes = delay_buffer[channel, position - 1]  # (the last place, which is never written to, comes before 0)
+            same = (channel[1:] == channel[:-1]) & (position[1:] == position[:-1] + 1) & write[:-1]  # only with 1 channel
+            previous_bytes[1:] = np.where(same, new_bytes[:-1], previous_bytes[1:])
+            delay_buffer[channel[write], position[write]] = new_bytes[write]
+
+            # reduce clicking
+            delayed_byte = (new_bytes + previous_bytes) / 2
+            delayed_byte *= 1.2
+            if not player.mod_delay_channel_fast[mod_channels - 1]:  # the player uses the last channel's decay for every channel's volume
+                delayed_byte *= 0.6
+            delayed_bytes[chunk] = np.trunc(0 - delayed_byte).astype(np.int64)
+        return delayed_bytes.reshape(frames, mod_channels).T, delay_counter
+
+
+class PaulaMixer(BlockMixer):
+    """The paula engine's mixer. Instead of adding up floating point steps, the positions are 32.32 fixed point (whole
+    steps of 1 / 2**32 of a byte, worked out from the frequency the period plays at on the Amiga), so long notes never
+    drift, and the volume's applied with integers like the Amiga's volume registers (0 to 64). It doesn't sound exactly
+    the same as the other engines, but it's just as quick as the numpy engine."""
+
+    def _step_rate(self, channel):
+        return paula_step_rate(self._player.mod_frequency[channel], self._player._sample_rate) / paula_phase_one
+
+    def _accumulate(self, position, sample_step_rate, frames):
+        # every position's a whole number of steps, so this is exact (and the positions are exact as floats too, as
+        # they're well within 53 bits)
+        phase = int(position * paula_phase_one)
+        phase_step = int(sample_step_rate * paula_phase_one)
+        return (phase + (np.arange(frames + 1, dtype=np.int64) * phase_step)) / paula_phase_one
+
+    def _scale(self, channel, sample_byte, tick):
+        volume = int(self._volume(channel, tick))
+        return ((sample_byte * 32768).astype(np.int64) * (volume * self._player._paula_gain)) >> (6 + paula_gain_bits)
@@ -0,0 +1,78 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import math
+
+from typing import NamedTuple, Tuple
+
+
+# -- Classes
+class Kernel(NamedTuple):
+    """An interpolation kernel: the weight of each sample byte around the current position, worked out in advance for
+    every phase (the fractional part of the position, split into kernel_phases steps)."""
+
+    name: str
+    start: int  # where the first byte is, relative to the current byte (e.g. -1 means the byte before it)
+    taps: int  # how many bytes are used
+    weights: Tuple[Tuple[float, ...], ...]  # one tuple of weights per phase
+
+
+# -- Constants
+kernel_phases = 1024
+sinc_taps = 8
+
+_kernels = {}  # only built the first time they're needed
+
+
+# -- Functions
+def _cubic_weights(phase):
+    # catmull-rom spline through the bytes either side of the position (it goes through every byte, like linear interpolation does)
+    return (
+        ((0 - phase ** 3) + (2 * phase ** 2) - phase) / 2,
+        ((3 * phase ** 3) - (5 * phase ** 2) + 2) / 2,
+        ((0 - 3 * phase ** 3) + (4 * phase ** 2) + phase) / 2,
+        (phase ** 3 - phase ** 2) / 2
+    )
+
+
+def _sinc_weights(phase):
+    # a sinc function with a blackman window, normalized so a flat signal stays flat
+    weights = []
+    for tap in range(0, sinc_taps):
+        x = tap - (sinc_taps // 2 - 1) - phase  # distance from the position
+        if x == 0:
+            sinc = 1
+        else:
+            sinc = math.sin(math.pi * x) / (math.pi * x)
+        window_position = (x + sinc_taps / 2) / sinc_taps  # 0 to 1 across the window
+        window = 0.42 - (0.5 * math.cos(2 * math.pi * window_position)) + (0.08 * math.cos(4 * math.pi * window_position))
+        weights.append(sinc * window)
+    total = sum(weights)
+    return tuple(weight / total for weight in weights)
+
+
+def get_kernel(name):
+    """Returns the Kernel for "cubic" or "sinc" (linear interpolation doesn't use a kernel)."""
+
+    if name not in _kernels:
+        if name == "cubic":
+            _kernels[name] = Kernel(name, -1, 4, tuple(_cubic_weights(phase / kernel_phases) for phase in range(0, kernel_phases)))
+        elif name == "sinc":
+            _kernels[name] = Kernel(name, 0 - (sinc_taps // 2 - 1), sinc_taps, tuple(_sinc_weights(phase / kernel_phases) for phase in range(0, kernel_phases)))
+        else:
+            raise ValueError(f"no kernel for {name} interpolation")
+    return _kernels[name]
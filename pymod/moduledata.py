@@ -0,0 +1,263 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import mmap
+
+from array import array
+from typing import NamedTuple, Tuple
+
+
+# -- Classes
+class ModuleSample(NamedTuple):
+    """One of the 31 sample headers of a module (lengths and loop points are in bytes)."""
+
+    name: str
+    length: int
+    finetune: int
+    volume: int
+    loop_start: int
+    loop_length: int
+    offset: int  # where the sample data starts in the module file
+
+
+class ModuleData(NamedTuple):
+    """The parsed contents of a module file. It's immutable, so the same object can be used by any number of Module objects."""
+
+    data: memoryview  # the raw module file (read-only, so it can be shared)
+    type: str  # the 4 characters at offset 1080, e.g. "M.K."
+    type_string: str
+    channels: int  # 0 if the module isn't valid
+    name: str
+    samples: Tuple[ModuleSample, ...]  # 31 samples plus an empty one (used for loop swapping)
+    song_length: int
+    order: Tuple[int, ...]
+    pattern_amount: int
+    pattern_offsets: Tuple[int, ...]
+
+    # the pattern data, decoded into one entry per cell: the cell for a line and channel is at ((pattern * lines) + line) * channels + channel
+    periods: memoryview
+    sample_numbers: bytes  # 0 if there's no sample number (or it's beyond the last sample)
+    effects: bytes
+    params: bytes
+    empty_rows: bytes  # one entry per line of every pattern, 1 if every cell on the line is completely empty
+
+    # -- Class Variables
+    lines = 64  # lines per pattern
+    samples_amount = 31
+
+    # -- Class Methods
+    @classmethod
+    def from_file(cls, file_path):
+        """The file is memory-mapped rather than read, so its contents are only loaded as they're needed, and are shared by every process using the same file."""
+
+        with open(file_path, "rb") as file:
+            try:
+                mod_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files can't be mapped (this'll be reported as an invalid module)
+                mod_file = b""
+        return cls.from_bytes(mod_file)
+
+    @classmethod
+    def from_bytes(cls, mod_file):
+        """mod_file can be anything supporting the buffer protocol (bytes, bytearray, mmap...). It isn't copied, so it mustn't be changed afterwards!"""
+
+        mod_file = memoryview(mod_file).toreadonly()
+
+        if len(mod_file) < 1084:  # too short to even have a type (an empty or truncated file), so it's not a module
+            return cls(mod_file, "", "", 0, "", (), 0, (), 0, (), memoryview(array("H")).toreadonly(), b"", b"", b"", b"")
+
+        mod_channels = 0
+        mod_type = ""
+        mod_type_string = ""
+        for a in range(1080, 1084):
+            mod_type += chr(mod_file[a])
+        if mod_type == "M.K.":
+            mod_channels = 4
+            mod_type_string = "ProTracker / Generic module tracker"
+        elif mod_type == "M!K!":
+            mod_channels = 4
+            mod_type_string = "ProTracker / Generic module tracker (65 or more patterns)"
+        elif mod_type.endswith("CHN"):
+            try:
+                mod_channels = int(mod_type[:1])
+                mod_type_string = "Generic module tracker"
+            except Exception:  # not an integer...
+                pass  # ...mod_channels will remain 0, and the module won't be played
+        elif mod_type.endswith("CH"):
+            try:
+                mod_channels = int(mod_type[:2])
+                mod_type_string = "Generic module tracker"
+            except Exception:
+                pass
+        elif mod_type.startswith("TDZ"):
+            try:
+                mod_channels = int(mod_type[-1])
+                mod_type_string = "TakeTracker"
+            except Exception:
+                pass
+
+        if mod_channels == 0:  # no point parsing the rest, it's not a module we know about
+            return cls(mod_file, mod_type, mod_type_string, 0, "", (), 0, (), 0, (), memoryview(array("H")).toreadonly(), b"", b"", b"", b"")
+
+        mod_name = ""
+        for a in range(0, 20):
+            mod_name += chr(mod_file[a])
+
+        mod_pointer = 20
+        mod_samples = []
+        for a in range(0, cls.samples_amount):
+            sample_name = ""
+            for b in range(0, 22):
+                if mod_file[mod_pointer] != 0:
+                    sample_name += chr(mod_file[mod_pointer])
+                mod_pointer += 1
+
+            sample_length = (mod_file[mod_pointer + 1] | (mod_file[mod_pointer] << 8)) * 2
+            sample_finetune = mod_file[mod_pointer + 2]
+            sample_volume = mod_file[mod_pointer + 3]
+            sample_loop_start = (mod_file[mod_pointer + 5] | (mod_file[mod_pointer + 4] << 8)) * 2
+            sample_loop_length = (mod_file[mod_pointer + 7] | (mod_file[mod_pointer + 6] << 8)) * 2
+            mod_pointer += 8
+
+            mod_samples.append([sample_name, sample_length, sample_finetune, sample_volume, sample_loop_start, sample_loop_length])
+
+        mod_song_length = mod_file[mod_pointer]
+        mod_pointer += 2
+
+        mod_order = tuple(mod_file[mod_pointer:mod_pointer + 128])
+        mod_pointer += 128 + 4
+        mod_pattern_amount = max(mod_order) + 1
+
+        mod_pattern_offsets = []
+        for a in range(0, mod_pattern_amount):
+            mod_pattern_offsets.append(mod_pointer)
+            mod_pointer += mod_channels * 4 * cls.lines
+        pattern_data = cls._decode_patterns(bytes(mod_file[mod_pattern_offsets[0]:mod_pointer]), mod_channels, mod_pattern_amount)
+
+        samples = []
+        for sample in mod_samples:
+            samples.append(ModuleSample(*sample, mod_pointer))
+            mod_pointer += sample[1]
+        samples.append(ModuleSample("", 4, 0, 0, 0, 4, 0))  # an empty sample, used for loop swapping
+
+        return cls(mod_file, mod_type, mod_type_string, mod_channels, mod_name, tuple(samples), mod_song_length, mod_order, mod_pattern_amount, tuple(mod_pattern_offsets), *pattern_data)
+
+    @classmethod
+    def _decode_patterns(cls, pattern_bytes, channels, pattern_amount):
+        # each cell is 4 bytes: sssspppp pppppppp sssseeee xxxxxxxx (s = sample number, p = period, e = effect, x = effect parameter)
+        cells = pattern_amount * cls.lines * channels
+        if len(pattern_bytes) < cells * 4:  # the file's been cut short, so the missing cells are empty
+            pattern_bytes += bytes((cells * 4) - len(pattern_bytes))
+        byte_0 = pattern_bytes[0::4]
+        byte_1 = pattern_bytes[1::4]
+        byte_2 = pattern_bytes[2::4]
+
+        periods = array("H", [((a & 0xf) << 8) + b for a, b in zip(byte_0, byte_1)])
+        sample_numbers = bytearray((a & 0xf0) + (b >> 4) for a, b in zip(byte_0, byte_2))
+        for cell, sample_number in enumerate(sample_numbers):
+            if sample_number > cls.samples_amount:
+                sample_numbers[cell] = 0
+        effects = byte_2.translate(bytes(a & 0xf for a in range(0, 256)))
+        params = pattern_bytes[3::4]
+
+        row_size = channels * 4
+        empty_row = bytes(row_size)
+        empty_rows = bytes(pattern_bytes[a:a + row_size] == empty_row for a in range(0, cells * 4, row_size))
+
+        return memoryview(periods).toreadonly(), bytes(sample_numbers), effects, params, empty_rows
+
+    # -- Instance Methods
+    def unique_samples(self):
+        """Returns a list of (sample index, sample) pairs for every sample that actually contains data."""
+
+        return [(a, sample) for a, sample in enumerate(self.samples[:self.samples_amount]) if sample.length > 0]
+
+    def effect_params(self, effect):
+        """Returns a set of every parameter used with an effect, anywhere in the patterns (for the extended effects, Exy is 0xXY)."""
+
+        return {param for effect_number, param in zip(self.effects, self.params) if effect_number == effect}
+
+
+class SampleOverlay:
+    """Copy-on-write access to a module's sample data for a single playback. It's read just like the module data itself,
+    but the "invert loop" effect changes samples as they play, so any sample it touches is copied first, leaving the
+    (shared) module data untouched."""
+
+    def __init__(self, data):
+        self._data = data
+        self._copies = []  # [start, bytearray] for every region that's been copied
+        self.changes = 0  # goes up every time a byte's inverted (or the state's set), so anything keeping its own copy of the samples knows to update it
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def data(self):
+        """The module data underneath."""
+
+        return self._data
+
+    @property
+    def changed(self):
+        """True once any byte has been inverted."""
+
+        return len(self._copies) > 0
+
+    def get_state(self):
+        """Returns a copy of every change made so far, which can be given back to set_state() later."""
+
+        return [(start, bytes(copy)) for start, copy in self._copies]
+
+    def set_state(self, state):
+        self._copies = [[start, bytearray(copy)] for start, copy in state]
+        self.changes += 1
+
+    def copies(self):
+        """Returns (start, bytearray) for every region that's been copied. These are the actual copies, so they mustn't be changed!"""
+
+        return [(start, copy) for start, copy in self._copies]
+
+    def __getitem__(self, index):
+        if index < 0:  # same as indexing the module data directly
+            index += len(self._data)
+        for start, copy in self._copies:
+            if start <= index < start + len(copy):
+                return copy[index - start]
+        return self._data[index]
+
+    def invert(self, index, start, end):
+        """Inverts the byte at index (using ProTracker's method). If that byte hasn't been changed before, everything from start to end is copied first."""
+
+        if index < 0 or index >= len(self._data):
+            raise IndexError("sample overlay index out of range")
+
+        if not any(copy_start <= index < copy_start + len(copy) for copy_start, copy in self._copies):
+            start = max(0, min(start, index))
+            end = min(len(self._data), max(end, index + 1))
+            region = bytearray(self._data[start:end])
+            for copy_start, copy in self._copies:  # keep any changes already made to this region
+                for position in range(max(start, copy_start), min(end, copy_start + len(copy))):
+                    region[position - start] = copy[position - copy_start]
+            self._copies.append([start, region])
+
+        sample_unsigned = (self[index] + 128) & 255  # convert the sample byte to unsigned
+        sample_unsigned = ~sample_unsigned & 255  # find the bitwise not of the byte
+        sample_unsigned = (sample_unsigned + 128) & 255  # convert it back to signed
+        for copy_start, copy in self._copies:
+            if copy_start <= index < copy_start + len(copy):
+                copy[index - copy_start] = sample_unsigned
+        self.changes += 1
@@ -0,0 +1,34 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+# -- Constants
+paula_phase_bits = 32  # the paula engine's positions are 32.32 fixed point
+paula_phase_one = 1 << paula_phase_bits
+paula_gain_bits = 16
+
+
+# -- Functions
+def paula_step_rate(frequency, sample_rate):
+    """Returns how far a sample moves every frame in the paula engine, in steps of 1 / 2**32 of a byte."""
+
+    return round(frequency * paula_phase_one / sample_rate)
+
+
+def paula_gain(amplify, channels):
+    """Returns what the paula engine multiplies each channel by (along with the volume), as 16-bit fixed point."""
+
+    return round(amplify * (1 << paula_gain_bits) / channels)
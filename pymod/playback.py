@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import time
+import threading
+
+
+# -- Classes
+class RingBuffer:
+    """A circular buffer of bytes between one thread writing and one thread reading. Each side only ever moves its own
+    position along (both keep counting up, rather than going back round to 0, so a full buffer and an empty one
+    can't be mixed up), so there's no lock for the reader to wait on. The writer waits if the buffer's full."""
+
+    def __init__(self, size):
+        self._data = bytearray(size)
+        self._size = size
+        self._read_position = 0  # only changed by the reader...
+        self._write_position = 0  # ...and this only by the writer
+        self._space = threading.Event()  # set whenever anything's been read
+
+    def available(self):
+        """How many bytes are waiting to be read."""
+
+        return self._write_position - self._read_position
+
+    def write(self, data):
+        """Adds the data (anything supporting the buffer protocol) to the buffer, waiting for the reader to make room
+        if there isn't enough."""
+
+        data = memoryview(data).cast("B")
+        while len(data) > 0:
+            space = self._size - (self._write_position - self._read_position)
+            if space == 0:
+                self._space.clear()
+                if self._write_position - self._read_position == self._size:  # (the reader might've made room in the meantime)
+                    self._space.wait(0.1)
+                continue
+            length = min(space, len(data))
+            start = self._write_position % self._size
+            first_length = min(length, self._size - start)  # the part before the end of the buffer, then the rest goes at the start
+            self._data[start:start + first_length] = data[:first_length]
+            self._data[:length - first_length] = data[first_length:length]
+            self._write_position += length
+            data = data[length:]
+
+    def read(self, length):
+        """Takes up to length bytes out of the buffer (however many are there, without waiting for any more)."""
+
+        length = min(length, self._write_position - self._read_position)
+        start = self._read_position % self._size
+        first_length = min(length, self._size - start)
+        data = bytes(self._data[start:start + first_length]) + bytes(self._data[:length - first_length])
+        self._read_position += length
+        self._space.set()
+        return data
+
+
+class Playback:
+    """Plays audio in realtime using PyAudio's callback mode. Whatever's mixing the audio writes blocks of it to a
+    ring buffer, and PyAudio's own thread takes it out as it needs it, so the audio never has to wait for the mixing
+    (as long as it keeps ahead). Playback only starts once there's enough in the buffer (the pre-roll), and if the
+    mixing falls behind, silence is played until it catches up."""
+
+    def __init__(self, sample_rate, channels, buffer_size, preroll):
+        self._frame_size = channels * 2
+        preroll_frames = max(int(preroll * sample_rate), buffer_size)
+        self._preroll = preroll_frames * self._frame_size  # in bytes
+        self._ring_buffer = RingBuffer(preroll_frames * 2 * self._frame_size)  # enough for the pre-roll, with just as much again to keep it topped up
+        self._finished = False
+        self._started = False
+        self.underruns = 0  # how many times the mixing didn't keep up
+
+        import pyaudio  # only needed once something's actually played, so the ring buffer can be used without it
+
+        self._complete = pyaudio.paComplete  # (kept for the callback, which returns one of these every time)
+        self._continue = pyaudio.paContinue
+        self._pya = pyaudio.PyAudio()
+        self._stream = self._pya.open(format=pyaudio.paInt16, rate=sample_rate, output=True, channels=channels, frames_per_buffer=buffer_size, stream_callback=self._callback, start=False)
+
+    def write(self, data):
+        """Queues 16-bit frames (in the machine's byte order) to be played, waiting if the buffer's full."""
+
+        self._ring_buffer.write(data)
+        if not self._started and self._ring_buffer.available() >= self._preroll:
+            self._start()
+
+    def close(self):
+        """Waits for everything in the buffer to be played, then stops."""
+
+        self._finished = True
+        if not self._started:  # (the whole song was shorter than the pre-roll)
+            self._start()
+        while self._stream.is_active():
+            time.sleep(0.01)
+        self._stream.stop_stream()
+        self._stream.close()
+        self._pya.terminate()
+
+    def _start(self):
+        self._started = True
+        self._stream.start_stream()
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        # called by pyaudio's thread whenever it needs more audio
+        length = frame_count * self._frame_size
+        data = self._ring_buffer.read(length)
+        if len(data) < length:
+            if self._finished:  # that's the last of it
+                return data + bytes(length - len(data)), self._complete
+            self.underruns += 1
+            data += bytes(length - len(data))
+        return data, self._continue
@@ -17,11 +17,26 @@
 
 import wave
 import time
-import pyaudio
 import random
 import os
+import copy
+import pickle
+import zlib
+import math
+import sys
+import itertools
+import importlib.util
+
+from array import array
 
 from .__about__ import __version__
+from .moduledata import ModuleData, SampleOverlay
+from .timeline import Timeline, tick_start
+from .paula import paula_phase_one, paula_gain_bits, paula_step_rate, paula_gain
+from .interpolation import get_kernel, kernel_phases
+from .amigafilter import AmigaFilter, filter_models
+from .wavwriter import stream_block_size
+from .sinks import PyAudioSink, WavSink
 
 
 # -- Classes
@@ -32,224 +47,237 @@ class Module:
 
     # extended periods nabbed from a taketracker module :D
     # 2 extra octaves, one below the lowest note, and one above the highest note!
-    _mod_extended_periods = [
+    _mod_extended_periods = (
         # no finetune
-        [
+        (
             1712, 1616, 1524, 1440, 1356, 1280, 1208, 1140, 1076, 1016, 960, 906,
             856, 808, 762, 720, 678, 640, 604, 570, 538, 508, 480, 453,
             428, 404, 381, 360, 339, 320, 302, 285, 269, 254, 240, 226,
             214, 202, 190, 180, 170, 160, 151, 143, 135, 127, 120, 113,
             107, 101, 95, 90, 85, 80, 76, 72, 68, 64, 60, 56, 0
-        ],
-        [  # finetune +1
+        ),
+        (  # finetune +1
             1700, 1604, 1514, 1430, 1348, 1274, 1202, 1134, 1070, 1010, 954, 900,
             850, 802, 757, 715, 674, 637, 601, 567, 535, 505, 477, 450,
             425, 401, 379, 357, 337, 318, 300, 284, 268, 253, 239, 225,
             213, 201, 189, 179, 169, 159, 150, 142, 134, 126, 119, 113,
             106, 100, 94, 89, 84, 79, 75, 71, 67, 63, 59, 56, 0
-        ],
-        [  # +2
+        ),
+        (  # +2
             1688, 1592, 1504, 1418, 1340, 1264, 1194, 1126, 1064, 1004, 948, 894,
             844, 796, 752, 709, 670, 632, 597, 563, 532, 502, 474, 447,
             422, 398, 376, 355, 335, 316, 298, 282, 266, 251, 237, 224,
             211, 199, 188, 177, 167, 158, 149, 141, 133, 125, 118, 112,
             105, 99, 93, 88, 83, 78, 74, 70, 66, 62, 59, 56, 0
-        ],
-        [  # +3
+        ),
+        (  # +3
             1676, 1582, 1492, 1408, 1330, 1256, 1184, 1118, 1056, 996, 940, 888,
             838, 791, 746, 704, 665, 628, 592, 559, 528, 498, 470, 444,
             419, 395, 373, 352, 332, 314, 296, 280, 264, 249, 235, 222,
             209, 198, 187, 176, 166, 157, 148, 140, 132, 125, 118, 111,
             104, 99, 93, 88, 83, 78, 74, 70, 66, 62, 59, 56, 0
-        ],
-        [  # +4
+        ),
+        (  # +4
             1664, 1570, 1482, 1398, 1320, 1246, 1176, 1110, 1048, 990, 934, 882,
             832, 785, 741, 699, 660, 623, 588, 555, 524, 495, 467, 441,
             416, 392, 370, 350, 330, 312, 294, 278, 262, 247, 233, 220,
             208, 196, 185, 175, 165, 156, 147, 139, 131, 124, 117, 110,
             104, 98, 92, 87, 82, 77, 73, 69, 65, 62, 58, 56, 0
-        ],
-        [  # +5
+        ),
+        (  # +5
             1652, 1558, 1472, 1388, 1310, 1238, 1168, 1102, 1040, 982, 926, 874,
             826, 779, 736, 694, 655, 619, 584, 551, 520, 491, 463, 437,
             413, 390, 368, 347, 328, 309, 292, 276, 260, 245, 232, 219,
             206, 195, 184, 174, 164, 155, 146, 138, 130, 123, 116, 109,
             103, 97, 92, 87, 82, 77, 73, 69, 65, 61, 58, 56, 0
-        ],
-        [  # +6
+        ),
+        (  # +6
             1640, 1548, 1460, 1378, 1302, 1228, 1160, 1094, 1032, 974, 920, 868,
             820, 774, 730, 689, 651, 614, 580, 547, 516, 487, 460, 434,
             410, 387, 365, 345, 325, 307, 290, 274, 258, 244, 230, 217,
             205, 193, 183, 172, 163, 154, 145, 137, 129, 122, 115, 109,
             102, 96, 91, 86, 81, 77, 72, 68, 64, 61, 57, 56, 0
-        ],
-        [  # +7
+        ),
+        (  # +7
             1628, 1536, 1450, 1368, 1292, 1220, 1150, 1086, 1026, 968, 914, 862,
             814, 768, 725, 684, 646, 610, 575, 543, 513, 484, 457, 431,
             407, 384, 363, 342, 323, 305, 288, 272, 256, 242, 228, 216,
             204, 192, 181, 171, 161, 152, 144, 136, 128, 121, 114, 108,
             102, 96, 90, 85, 80, 76, 72, 68, 64, 60, 57, 56, 0
-        ],
-        [  # -8
+        ),
+        (  # -8
             1814, 1712, 1616, 1524, 1440, 1356, 1280, 1208, 1140, 1076, 1016, 960,
             907, 856, 808, 762, 720, 678, 640, 604, 570, 538, 508, 480,
             453, 428, 404, 381, 360, 339, 320, 302, 285, 269, 254, 240,
             226, 214, 202, 190, 180, 170, 160, 151, 143, 135, 127, 120,
             113, 107, 101, 95, 90, 85, 80, 75, 71, 67, 63, 60, 0
-        ],
-        [  # -7
+        ),
+        (  # -7
             1800, 1700, 1604, 1514, 1430, 1350, 1272, 1202, 1134, 1070, 1010, 954,
             900, 850, 802, 757, 715, 675, 636, 601, 567, 535, 505, 477,
             450, 425, 401, 379, 357, 337, 318, 300, 284, 268, 253, 238,
             225, 212, 200, 189, 179, 169, 159, 150, 142, 134, 126, 119,
             112, 106, 100, 94, 89, 84, 79, 75, 71, 67, 63, 59, 0
-        ],
-        [  # -6
+        ),
+        (  # -6
             1788, 1688, 1592, 1504, 1418, 1340, 1264, 1194, 1126, 1064, 1004, 948,
             894, 844, 796, 752, 709, 670, 632, 597, 563, 532, 502, 474,
             447, 422, 398, 376, 355, 335, 316, 298, 282, 266, 251, 237,
             223, 211, 199, 188, 177, 167, 158, 149, 141, 133, 125, 118,
             111, 105, 99, 94, 88, 83, 79, 74, 70, 66, 62, 59, 0
-        ],
-        [  # -5
+        ),
+        (  # -5
             1774, 1676, 1582, 1492, 1408, 1330, 1256, 1184, 1118, 1056, 996, 940,
             887, 838, 791, 746, 704, 665, 628, 592, 559, 528, 498, 470,
             444, 419, 395, 373, 352, 332, 314, 296, 280, 264, 249, 235,
             222, 209, 198, 187, 176, 166, 157, 148, 140, 132, 125, 118,
             111, 104, 99, 93, 88, 83, 78, 74, 70, 66, 62, 59, 0
-        ],
-        [  # -4
+        ),
+        (  # -4
             1762, 1664, 1570, 1482, 1398, 1320, 1246, 1176, 1110, 1048, 988, 934,
             881, 832, 785, 741, 699, 660, 623, 588, 555, 524, 494, 467,
             441, 416, 392, 370, 350, 330, 312, 294, 278, 262, 247, 233,
             220, 208, 196, 185, 175, 165, 156, 147, 139, 131, 123, 117,
             110, 104, 98, 92, 87, 82, 78, 73, 69, 65, 61, 58, 0
-        ],
-        [  # -3
+        ),
+        (  # -3
             1750, 1652, 1558, 1472, 1388, 1310, 1238, 1168, 1102, 1040, 982, 926,
             875, 826, 779, 736, 694, 655, 619, 584, 551, 520, 491, 463,
             437, 413, 390, 368, 347, 328, 309, 292, 276, 260, 245, 232,
             219, 206, 195, 184, 174, 164, 155, 146, 138, 130, 123, 116,
             109, 103, 97, 92, 86, 82, 77, 73, 69, 65, 61, 58, 0
-        ],
-        [  # -2
+        ),
+        (  # -2
             1736, 1640, 1548, 1460, 1378, 1302, 1228, 1160, 1094, 1032, 974, 920,
             868, 820, 774, 730, 689, 651, 614, 580, 547, 516, 487, 460,
             434, 410, 387, 365, 345, 325, 307, 290, 274, 258, 244, 230,
             217, 205, 193, 183, 172, 163, 154, 145, 137, 129, 122, 115,
             108, 102, 96, 91, 86, 81, 77, 72, 68, 64, 61, 57, 0
-        ],
-        [  # -1
+        ),
+        (  # -1
             1724, 1628, 1536, 1450, 1368, 1292, 1220, 1150, 1086, 1026, 968, 914,
             862, 814, 768, 725, 684, 646, 610, 575, 543, 513, 484, 457,
             431, 407, 384, 363, 342, 323, 305, 288, 272, 256, 242, 228,
             216, 203, 192, 181, 171, 161, 152, 144, 136, 128, 121, 114,
             108, 101, 96, 90, 85, 80, 76, 72, 68, 64, 60, 58, 0
-        ]
-    ]
+        )
+    )
 
-    _mod_legacy_periods = [
-        [  # no finetune
+    _mod_legacy_periods = (
+        (  # no finetune
             856, 808, 762, 720, 678, 640, 604, 570, 538, 508, 480, 453,
             428, 404, 381, 360, 339, 320, 302, 285, 269, 254, 240, 226,
             214, 202, 190, 180, 170, 160, 151, 143, 135, 127, 120, 113
-        ],
-        [  # finetune +1
+        ),
+        (  # finetune +1
             850, 802, 757, 715, 674, 637, 601, 567, 535, 505, 477, 450,
             425, 401, 379, 357, 337, 318, 300, 284, 268, 253, 239, 225,
             213, 201, 189, 179, 169, 159, 150, 142, 134, 126, 119, 113
-        ],
-        [  # +2
+        ),
+        (  # +2
             844, 796, 752, 709, 670, 632, 597, 563, 532, 502, 474, 447,
             422, 398, 376, 355, 335, 316, 298, 282, 266, 251, 237, 224,
             211, 199, 188, 177, 167, 158, 149, 141, 133, 125, 118, 112
-        ],
-        [  # +3
+        ),
+        (  # +3
             838, 791, 746, 704, 665, 628, 592, 559, 528, 498, 470, 444,
             419, 395, 373, 352, 332, 314, 296, 280, 264, 249, 235, 222,
             209, 198, 187, 176, 166, 157, 148, 140, 132, 125, 118, 111
-        ],
-        [  # +4
+        ),
+        (  # +4
             832, 785, 741, 699, 660, 623, 588, 555, 524, 495, 467, 441,
             416, 392, 370, 350, 330, 312, 294, 278, 262, 247, 233, 220,
             208, 196, 185, 175, 165, 156, 147, 139, 131, 124, 117, 110
-        ],
-        [  # +5
+        ),
+        (  # +5
             826, 779, 736, 694, 655, 619, 584, 551, 520, 491, 463, 437,
             413, 390, 368, 347, 328, 309, 292, 276, 260, 245, 232, 219,
             206, 195, 184, 174, 164, 155, 146, 138, 130, 123, 116, 109
-        ],
-        [  # +6
+        ),
+        (  # +6
             820, 774, 730, 689, 651, 614, 580, 547, 516, 487, 460, 434,
             410, 387, 365, 345, 325, 307, 290, 274, 258, 244, 230, 217,
             205, 193, 183, 172, 163, 154, 145, 137, 129, 122, 115, 109
-        ],
-        [  # +7
+        ),
+        (  # +7
             814, 768, 725, 684, 646, 610, 575, 543, 513, 484, 457, 431,
             407, 384, 363, 342, 323, 305, 288, 272, 256, 242, 228, 216,
             204, 192, 181, 171, 161, 152, 144, 136, 128, 121, 114, 108
-        ],
-        [  # finetune -8
+        ),
+        (  # finetune -8
             907, 856, 808, 762, 720, 678, 640, 604, 570, 538, 508, 480,
             453, 428, 404, 381, 360, 339, 320, 302, 285, 269, 254, 240,
             226, 214, 202, 190, 180, 170, 160, 151, 143, 135, 127, 120
-        ],
-        [  # -7
+        ),
+        (  # -7
             900, 850, 802, 757, 715, 675, 636, 601, 567, 535, 505, 477,
             450, 425, 401, 379, 357, 337, 318, 300, 284, 268, 253, 238,
             225, 212, 200, 189, 179, 169, 159, 150, 142, 134, 126, 119
-        ],
-        [  # -6
+        ),
+        (  # -6
             894, 844, 796, 752, 709, 670, 632, 597, 563, 532, 502, 474,
             447, 422, 398, 376, 355, 335, 316, 298, 282, 266, 251, 237,
             223, 211, 199, 188, 177, 167, 158, 149, 141, 133, 125, 118
-        ],
-        [  # -5
+        ),
+        (  # -5
             887, 838, 791, 746, 704, 665, 628, 592, 559, 528, 498, 470,
             444, 419, 395, 373, 352, 332, 314, 296, 280, 264, 249, 235,
             222, 209, 198, 187, 176, 166, 157, 148, 140, 132, 125, 118
-        ],
-        [  # -4
+        ),
+        (  # -4
             881, 832, 785, 741, 699, 660, 623, 588, 555, 524, 494, 467,
             441, 416, 392, 370, 350, 330, 312, 294, 278, 262, 247, 233,
             220, 208, 196, 185, 175, 165, 156, 147, 139, 131, 123, 117
-        ],
-        [  # -3
+        ),
+        (  # -3
             875, 826, 779, 736, 694, 655, 619, 584, 551, 520, 491, 463,
             437, 413, 390, 368, 347, 328, 309, 292, 276, 260, 245, 232,
             219, 206, 195, 184, 174, 164, 155, 146, 138, 130, 123, 116
-        ],
-        [  # -2
+        ),
+        (  # -2
             868, 820, 774, 730, 689, 651, 614, 580, 547, 516, 487, 460,
             434, 410, 387, 365, 345, 325, 307, 290, 274, 258, 244, 230,
             217, 205, 193, 183, 172, 163, 154, 145, 137, 129, 122, 115
-        ],
-        [  # -1
+        ),
+        (  # -1
             862, 814, 768, 725, 684, 646, 610, 575, 543, 513, 484, 457,
             431, 407, 384, 363, 342, 323, 305, 288, 272, 256, 242, 228,
             216, 203, 192, 181, 171, 161, 152, 144, 136, 128, 121, 114
-        ]
-    ]
+        )
+    )
 
     _mod_arp_period_cap = _mod_legacy_periods[0][-1]  # the highest note (lowest period) of the default finetune
     _mod_legacy_period_lowest = _mod_legacy_periods[0][-1]  # these aren't TECHNICALLY the highest and lowest... but according to protracker, they are
     _mod_legacy_period_highest = _mod_legacy_periods[0][0]
 
-    _mod_sine_table = [
+    _mod_sine_table = (
         0, 24, 49, 74, 97, 120, 141, 161,
         180, 197, 212, 224, 235, 244, 250, 253,
         255, 253, 250, 244, 235, 224, 212, 197,
         180, 161, 141, 120, 97, 74, 49, 24
-    ]
+    )
 
     # the protracker sine table is only half a wave, so we're completing it here
-    for a in range(0, len(_mod_sine_table)):
-        _mod_sine_table.append(0 - _mod_sine_table[a])
+    _mod_sine_table += tuple(0 - value for value in _mod_sine_table)
+
+    # note names for the verbose display
+    _mod_note_letters = ("C-", "C#", "D-", "D#", "E-", "F-", "F#", "G-", "G#", "A-", "A#", "B-")
+    _mod_legacy_note_names = tuple(letter + str(octave) for octave, letter in itertools.product(range(4, 7), _mod_note_letters))[:len(_mod_legacy_periods[0])]
+    _mod_extended_note_names = tuple(letter + str(octave) for octave, letter in itertools.product(range(3, 9), _mod_note_letters))[:len(_mod_extended_periods[0])]
 
-    _mod_funk_table = [  # this sounds like something i made up, but it's actually called the funk table :D
+    _mod_funk_table = (  # this sounds like something i made up, but it's actually called the funk table :D
         0, 5, 6, 7, 8, 10, 11, 13, 16,
         19, 22, 26, 32, 43, 64, 128
-    ]
+    )
+
+    # every sample byte (as it's stored in the module) converted to a value between -1 and 1, so it isn't worked out for every frame
+    _mod_sample_values = tuple((((a + 128) & 255) - 128) / 128 for a in range(0, 256))
+
+    # lookup tables covering every period a pattern can contain (0-4095), so finding notes doesn't mean searching through the period tables every time
+    # they're only built the first time they're needed
+    _mod_period_range = 4096
+    _mod_period_notes = {}  # legacy flag -> the note number of each period (or -1 if it isn't a note)
+    _mod_closest_periods = {}  # (legacy flag, finetune) -> the closest period of each period for that finetune
 
     # -- Class Methods
     @classmethod
@@ -313,6 +341,38 @@ class Module:
 
     @classmethod
     def _mod_get_period_note(cls, period, legacy):  # returns the note value
+        if legacy:
+            if period < Module._mod_legacy_period_lowest:
+                period = Module._mod_legacy_period_lowest
+            elif period > Module._mod_legacy_period_highest:
+                period = Module._mod_legacy_period_highest
+        if 0 <= period < Module._mod_period_range:
+            period_notes = Module._mod_period_notes.get(legacy)
+            if period_notes is None:
+                period_notes = Module._mod_build_period_notes(legacy)
+            return period_notes[period]
+        return Module._mod_find_period_note(period, legacy)
+
+    @classmethod
+    def _mod_build_period_notes(cls, legacy):
+        period_notes = array("b", [-1] * Module._mod_period_range)
+        if legacy:
+            period_sets = Module._mod_legacy_periods
+            period_differences = [0]
+        else:
+            period_sets = Module._mod_extended_periods
+            period_differences = [-1, 1, 0]  # an exact match is checked first, then period + 1, then period - 1 (so they're overwritten in the opposite order)
+        for period_set in reversed(period_sets):  # the first period set containing the period wins, so that one's written last
+            for period_difference in period_differences:
+                for note in range(len(period_set) - 1, -1, -1):  # the first note with the period wins, same as index()
+                    period = period_set[note] - period_difference
+                    if 0 <= period < Module._mod_period_range:
+                        period_notes[period] = note
+        Module._mod_period_notes[legacy] = period_notes
+        return period_notes
+
+    @classmethod
+    def _mod_find_period_note(cls, period, legacy):  # the slow way of finding the note value, only used for periods outside the lookup tables
         note = -1
         found = False
         if legacy:
@@ -349,6 +409,40 @@ class Module:
 
     @classmethod
     def _mod_get_closest_period(cls, period, finetune, legacy):
+        if 0 <= period < Module._mod_period_range:
+            closest_periods = Module._mod_closest_periods.get((legacy, finetune))
+            if closest_periods is None:
+                closest_periods = Module._mod_build_closest_periods(finetune, legacy)
+            return closest_periods[period]
+        return Module._mod_find_closest_period(period, finetune, legacy)
+
+    @classmethod
+    def _mod_build_closest_periods(cls, finetune, legacy):
+        if legacy:
+            period_set = Module._mod_legacy_periods[finetune]
+        else:
+            period_set = Module._mod_extended_periods[finetune]
+        first_notes = {}  # if two periods are equally close, the one that comes first in the table wins
+        for note, period in enumerate(period_set):
+            first_notes.setdefault(period, note)
+        periods = sorted(first_notes)
+
+        closest_periods = array("H", bytes(Module._mod_period_range * 2))
+        below = 0  # index of the highest period that isn't above the current one
+        for period in range(0, Module._mod_period_range):
+            while below + 1 < len(periods) and periods[below + 1] <= period:
+                below += 1
+            closest = periods[below]
+            if closest < period and below + 1 < len(periods):  # is the next period up any closer?
+                above = periods[below + 1]
+                if above - period < period - closest or (above - period == period - closest and first_notes[above] < first_notes[closest]):
+                    closest = above
+            closest_periods[period] = closest
+        Module._mod_closest_periods[(legacy, finetune)] = closest_periods
+        return closest_periods
+
+    @classmethod
+    def _mod_find_closest_period(cls, period, finetune, legacy):  # the slow way, for periods outside the lookup tables
         differences = []
         if legacy:
             for period_2 in Module._mod_legacy_periods[finetune]:
@@ -360,8 +454,11 @@ class Module:
             return Module._mod_extended_periods[finetune][differences.index(min(differences))]
 
     @classmethod
-    def _get_panned_bytes(cls, byte, pan):  # expects (and returns) a signed byte between -32768 and 32767. pan value is between -1 and 1 (left and right)
-        return int(byte * ((pan / 2) - 0.5)), 0 - int((byte * ((pan / 2) + 0.5)))
+    def _get_pan_gains(cls, pan, stereo):  # returns what a channel's bytes are multiplied by for each output (left and right, or just the one in mono). pan value is between -1 and 1 (left and right)
+        if stereo:
+            return (pan / 2) - 0.5, 0 - ((pan / 2) + 0.5)
+        else:
+            return (1,)
 
     @classmethod
     def play_modes(cls):
@@ -374,10 +471,30 @@ class Module:
 
         return play_modes
 
+    @classmethod
+    def engines(cls):
+        return ["python", "numpy", "paula"]
+
+    @classmethod
+    def interpolations(cls):
+        return ["linear", "cubic", "sinc"]
+
+    @classmethod
+    def filter_models(cls):
+        return filter_models()
+
+    @classmethod
+    def sample_formats(cls):
+        return ["int16", "float32"]
+
     @classmethod
     def buffer_size_default(cls):
         return 1024
 
+    @classmethod
+    def preroll_default(cls):
+        return 0.2
+
     @classmethod
     def render_test_sample_rate(cls):
         return 8000
@@ -390,16 +507,29 @@ class Module:
     def sample_rate_default(cls):
         return 44100
 
+    @classmethod
+    def checkpoint_interval_default(cls):
+        return 16
+
+    @classmethod
+    def resume_interval_default(cls):
+        return 10
+
     # -- Instance Methods
     def __init__(self, input_file_path, sample_rate=0, play_mode="mono", verbose=False, quiet=False, legacy=False, amplify=1, interpolate=False, start_pos=0, nb_of_patterns=-1):
-        """Constructor based on command line arguments."""
+        """Constructor based on command line arguments. input_file_path can also be a ModuleData object, so an already parsed module can be shared between Module objects without touching the disk again."""
 
         # these are set based on the keyword arguments, when initializing a Module object
         if sample_rate == 0:  # there's got to be a better way
             self._sample_rate = Module.sample_rate_default()
         else:
             self._sample_rate = sample_rate
-        self._input_file = input_file_path
+        if isinstance(input_file_path, ModuleData):
+            self._input_file = None
+            self._data = input_file_path
+        else:
+            self._input_file = input_file_path
+            self._data = None  # parsed the first time the module is played/rendered
         self._play_mode = play_mode
         self._verbose = verbose
         self._quiet = quiet  # this only affects the program's "introduction", playback and rendering - showing module info will still work
@@ -411,157 +541,55 @@ class Module:
 
         # these are just defaults
         self._render_file = None
+        self._render_sink = None  # if rendering to a sink (see sinks.py) instead of a file
+        self._play_sink = None  # if playing to a sink, instead of pyaudio
         self._loops = 1
         self._render_channels = False
         self._buffer_size = Module.buffer_size_default()
+        self._preroll = Module.preroll_default()  # how much is mixed (in seconds) before playback starts
         self._mod_tempo = 125
         self._mod_ticks = 6
-
-    # https://modarchive.org/forums/index.php?topic=2709.0
-    def _mod_get_tempo_length(self, mod_tempo):
-        return (2500 / mod_tempo) * (self._sample_rate / 1000)
-
-    def _run(self):
+        self._seek_time = 0
+        self._checkpoint_interval = Module.checkpoint_interval_default()
+        self._checkpoints = {}  # snapshots of the player every few lines, so seeking doesn't have to start from the beginning (only for the settings used last, as they'd be no use with any others)
+        self._resume = False
+        self._stream = False  # if true, renders are written to the file as they go, instead of all at once at the end
+        self._engine = "python"
+        self._resume_interval = Module.resume_interval_default()
+        self._interpolation = "linear"  # the kind of interpolation used when it's turned on (with --interpolate or e09)
+        self._filter_model = "simple"
+
+    def _run(self, start=0, end=None):  # start and end are in seconds
         if not self._quiet:
             print(f"Pymod v{__version__}")
             print("by Presley Peters, 2023-present")
             print()
 
-        with open(self._input_file, "rb") as file:
-            mod_file = bytearray(file.read())  # we're converting to a bytearray so the "invert loop" effect works (byte objects are immutable)
+        if self._data is None:
+            self._data = ModuleData.from_file(self._input_file)  # only parsed once, every render after this uses the same data
+        mod_data = self._data
+        mod_sample_overlay = SampleOverlay(mod_data.data)  # samples are read straight from the module data until the "invert loop" effect changes one, then they're read through this instead (the module data itself is never changed)
 
-        sample_rate_minimum = 1000
-        sample_rate_temp = self._sample_rate
-        self._sample_rate = sample_rate_minimum  # using an extremely low sample rate for the estimation since it's WAY quicker, and gives basically the same result when you times it up (it's accurate enough for percentages and time estimates, so there's that!)
-
-        mod_channels = 0
-        mod_type = ""
-        for a in range(1080, 1084):
-            mod_type += chr(mod_file[a])
-        if mod_type == "M.K.":
-            mod_channels = 4
-            mod_type_string = "ProTracker / Generic module tracker"
-        elif mod_type == "M!K!":
-            mod_channels = 4
-            mod_type_string = "ProTracker / Generic module tracker (65 or more patterns)"
-        elif mod_type.endswith("CHN"):
-            try:
-                mod_channels = int(mod_type[:1])
-                mod_type_string = "Generic module tracker"
-            except Exception:  # not an integer...
-                pass  # ...mod_channels will remain 0, and the appropriate error will be returned
-        elif mod_type.endswith("CH"):
-            try:
-                mod_channels = int(mod_type[:2])
-                mod_type_string = "Generic module tracker"
-            except Exception:
-                pass
-        elif mod_type.startswith("TDZ"):
-            try:
-                mod_channels = int(mod_type[-1])
-                mod_type_string = "TakeTracker"
-            except Exception:
-                pass
-
-        if mod_channels == 0:
-            print("Error: Invalid module!")
-            if self._render_file is not None:
-                os.remove(self._render_file)
-        elif sample_rate_temp < sample_rate_minimum or sample_rate_temp > 380000:
-            print(f"Error: Sample rate must be between {sample_rate_minimum} and 380000!")
-            if self._render_file is not None:
-                os.remove(self._render_file)
-        elif self._play_mode not in Module.play_modes():
-            play_modes_string = ", ".join(Module.play_modes())
-            print(f"Error: Invalid play mode: {self._play_mode}. Accepted modes: {play_modes_string}")
-            if self._render_file is not None:
-                os.remove(self._render_file)
-        elif self._buffer_size < 0 or self._buffer_size > 8192:
-            print("Error: Buffer size must be between 0 and 8192!")
-            if self._render_file is not None:
-                os.remove(self._render_file)
-        elif self._render_file is not None and self._render_channels and not self._render_file.endswith("_1.wav"):
-            print("Error: File name is suffixed incorrectly for channel rendering!")
-            os.remove(self._render_file)
-        elif self._render_file is not None and os.path.splitext(self._render_file)[-1].lower() != ".wav":
-            print("Error: Output must be a .wav file!")
-            if self._render_file is not None:
-                os.remove(self._render_file)
-        elif self._render_file is None and self._render_channels:
-            print("Error: The --channels/-c option can only be used alongside the --render/-r option!")
-        elif self._legacy and (mod_type != "M.K." and mod_type != "M!K!"):
-            print("Error: Only 4 channel modules can be used in legacy mode!")
+        mod_channels = mod_data.channels
+        mod_type_string = mod_data.type_string
+
+        error = self._mod_get_error(mod_data)
+        if error is None:
+            error = self._mod_get_render_error()
+        if error is not None:
+            print(f"Error: {error}")
             if self._render_file is not None:
                 os.remove(self._render_file)
         else:
             stereo = self._play_mode.startswith("stereo")
-            mod_lines = 64
-
-            mod_name = ""
-            for a in range(0, 20):
-                mod_name += chr(mod_file[a])
-
-            mod_pointer = 20
-            mod_samples_amount = 31
-            mod_unique_samples = []
-            mod_samples = []
-            for a in range(0, mod_samples_amount):
-                sample = {}
-                sample_name = ""
-                for b in range(0, 22):
-                    if mod_file[mod_pointer] != 0:
-                        sample_name += chr(mod_file[mod_pointer])
-                    mod_pointer += 1
-
-                sample_length = (mod_file[mod_pointer + 1] | (mod_file[mod_pointer] << 8)) * 2
-                mod_pointer += 2
-
-                sample_finetune = mod_file[mod_pointer]
-                mod_pointer += 1
-
-                sample_volume = mod_file[mod_pointer]
-                mod_pointer += 1
-
-                sample_loop_start = (mod_file[mod_pointer + 1] | (mod_file[mod_pointer] << 8)) * 2
-                mod_pointer += 2
-                sample_loop_length = (mod_file[mod_pointer + 1] | (mod_file[mod_pointer] << 8)) * 2
-                mod_pointer += 2
-
-                sample.update({"name": sample_name})
-                sample.update({"length": sample_length})
-                sample.update({"finetune": sample_finetune})
-                sample.update({"volume": sample_volume})
-                sample.update({"loop_start": sample_loop_start})
-                sample.update({"loop_length": sample_loop_length})
-                mod_samples.append(sample)
-                if sample_length > 0:
-                    mod_unique_samples.append([a, sample])
-
-            sample = {"name": "", "length": 4, "finetune": 0, "volume": 0, "loop_start": 0, "loop_length": 4, "offset": 0}  # an empty sample, used for loop swapping
-            mod_samples.append(sample)
-
-            mod_song_length = mod_file[mod_pointer]
-            mod_pointer += 2
-
-            mod_pattern_amount = 0
-            mod_order = []
-            for a in range(0, 128):
-                order = mod_file[mod_pointer]
-                mod_order.append(order)
-                if order > mod_pattern_amount:
-                    mod_pattern_amount = order
-                mod_pointer += 1
-            mod_pointer += 4
-            mod_pattern_amount += 1
-
-            mod_pattern_offsets = []
-            for a in range(0, mod_pattern_amount):
-                mod_pattern_offsets.append(mod_pointer)
-                mod_pointer += mod_channels * 4 * mod_lines
-
-            for a in range(0, mod_samples_amount):
-                mod_samples[a].update({"offset": mod_pointer})
-                mod_pointer += mod_samples[a]["length"]
+
+            mod_name = mod_data.name
+            mod_samples_amount = ModuleData.samples_amount
+            mod_samples = mod_data.samples
+            mod_unique_samples = mod_data.unique_samples()
+            mod_song_length = mod_data.song_length
+            mod_order = mod_data.order
+            mod_pattern_amount = mod_data.pattern_amount
 
             self._channels = mod_channels
             self._pattern_amount = mod_pattern_amount  # setting these also, just in case they're needed later...
@@ -572,1154 +600,183 @@ class Module:
                 print("Module text:")
                 print()
                 for sample in range(0, mod_samples_amount):
-                    print(mod_samples[sample]["name"])
+                    print(mod_samples[sample].name)
             else:
-                estimate = True
-                mod_note_names = []
-                mod_note_letters = ["C-", "C#", "D-", "D#", "E-", "F-", "F#", "G-", "G#", "A-", "A#", "B-"]
-                if self._legacy:
-                    for a in range(0, len(Module._mod_legacy_periods[0])):
-                        mod_note_names.append(mod_note_letters[a % len(mod_note_letters)] + str((a // 12) + 4))
-                else:
-                    for a in range(0, len(Module._mod_extended_periods[0])):
-                        mod_note_names.append(mod_note_letters[a % len(mod_note_letters)] + str((a // 12) + 3))
-
-                file_finished = []
-
-                if self._render_file is None and self._play_mode != "info":
-                    pya = pyaudio.PyAudio()
-                    channels = 1
-                    if stereo:
-                        channels += 1
-                    stream = pya.open(format=pyaudio.paInt16, rate=sample_rate_temp, output=True, channels=channels, frames_per_buffer=self._buffer_size)
-
-                if self._render_file is None and not self._verbose and not self._quiet and not self._play_mode == "info" and not estimate:
-                    print("Playing...")
-
-                channel_sum = 0
-                channel_sum_left = 0
-                channel_sum_right = 0
-                channel_current = 0  # used when rendering individual channels
-                while_condition = True
-                mod_using_bass_channel = False  # optimize playback by skipping the dsp for effects that aren't used in the module
-                mod_using_delay_channel = False
-                mod_overall_length = 0  # for some reason this is VERY slightly off (even when all the conditions are true... no clue why), but it's Close Enough(tm)
-                mod_bytes_rendered = 0
-                if estimate:
-                    estimating_length = True
-                    if not self._quiet:
-                        print("Estimating length...", end="\r")
-                else:
-                    estimating_length = False
-                    estimate = False
-                    start_time = time.perf_counter()
-                estimated_length = 0
-                estimated_length_minutes = 0
-                estimated_length_seconds = 0
-
                 total_nb_of_loops = self._loops
-
                 if self._play_mode == "info":
-                    if not estimate:
-                        while_condition = False
                     total_nb_of_loops = 1
-                while while_condition:
-                    mod_jumps = [[0, 0]]
-                    mod_orders_visited = []
-                    mod_lines_visited = []
-
-                    # these are here, because when rendering channels, they need to be reset every time
-                    mod_filter = self._play_mode.endswith("filter")  # a <crude> "simulation" of the amiga hardware filter (it's a simple one pole low-pass filter - literally just finding the difference between the current and last byte)
-                    mod_filter_flag = mod_filter  # unlike mod_filter, this can't be changed
-                    if self._legacy:
-                        mod_period_amount = len(Module._mod_legacy_periods[0])
-                    else:
-                        mod_period_amount = len(Module._mod_extended_periods[0])
-
-                    mod_channel_byte = [0] * mod_channels  # the current byte in each channel, summed together later on
-                    mod_filter_order_base = 64  # the desired order at 44100hz (trying to keep the value somewhat low so it renders/plays faster. for the standard filter, only the first byte of mod_channel_byte_last is used)
-                    mod_filter_order = int((mod_filter_order_base / 44100) * self._sample_rate)
-                    mod_delay_length_base = 2000  # the desired delay length at 44100hz
-                    mod_delay_length = int((mod_delay_length_base / 44100) * self._sample_rate)
-                    mod_delay_counter = 0
-                    mod_channel_delay_buffer = []
-                    mod_channel_byte_last_temp = []
-                    mod_channel_delay_buffer_temp = []
-                    for a in range(0, mod_filter_order):
-                        mod_channel_byte_last_temp.append(0)
-                    for a in range(0, mod_delay_length):
-                        mod_channel_delay_buffer_temp.append(0)
-                    mod_channel_byte_last = []
-                    mod_channel_pan = [0] * mod_channels  # -1 = left, 0 = centre, 1 = right
-                    for a in range(0, mod_channels):
-                        mod_channel_byte_last.append(mod_channel_byte_last_temp.copy())
-                        mod_channel_delay_buffer.append(mod_channel_delay_buffer_temp.copy())
-                        if self._play_mode.startswith("stereo_soft"):
-                            if a % 4 == 1 or a % 4 == 2:
-                                mod_channel_pan[a] = 0.5
-                            else:
-                                mod_channel_pan[a] = -0.5
-                        else:
-                            if a % 4 == 1 or a % 4 == 2:
-                                mod_channel_pan[a] = 1
-                            else:
-                                mod_channel_pan[a] = -1
-                    mod_sample_offset = [0] * mod_channels
-                    mod_sample_position = [0] * mod_channels
-                    mod_sample_number = [0] * mod_channels  # actually contains the number of the currently playing sample, even if none is specified!
-                    mod_sample_playing = [False] * mod_channels
-                    mod_sample_volume = [0] * mod_channels
-
-                    mod_period = [0] * mod_channels
-                    mod_next_period = [0] * mod_channels  # used for protracker's note delay behaviour with looped samples (this will contain the actual current period, but it won't play it until the note delay is reached)
-                    mod_raw_period = [0] * mod_channels
-                    mod_raw_period_inc_delay = [0] * mod_channels  # raw period + pattern delay (so when a pattern is being delayed, there's still a period number in this variable... mod_raw_period would contain 0 in this case)
-                    mod_frequency = [0] * mod_channels
-                    mod_effect_number = [0] * mod_channels
-                    mod_effect_param = [0] * mod_channels
-                    mod_volslide_amount = [0] * mod_channels
-                    mod_volslide_fine = [False] * mod_channels  # if true, the volume is slid on the first tick ONLY
-                    mod_port_fine = [False] * mod_channels  # same but for fine pitch slides
-                    mod_note_cut_ticks = [-1] * mod_channels  # counts down, when it reaches 0, the note is cut. -1 means no cut, -2 means the note is ignored
-                    mod_note_delay_ticks = [-1] * mod_channels  # counts down, when it reaches 0, the note is played. -1 means no delay
-                    mod_port_amount = [0] * mod_channels
-                    mod_tone_period = [0] * mod_channels  # the period we're sliding from
-                    mod_tone_sliding = [False] * mod_channels
-                    mod_arp_counter = [0] * mod_channels
-                    mod_arp_periods = []
-                    for a in range(0, mod_channels):
-                        mod_arp_periods.append([0, 0, 0].copy())
-                    mod_arp_period = [0] * mod_channels
-                    mod_vibrato = [False] * mod_channels
-                    mod_vibrato_counter = [0] * mod_channels
-                    mod_vibrato_offset = [0] * mod_channels  # offsets the period value without actually changing it
-                    mod_vibrato_wave = [0] * mod_channels
-                    mod_vibrato_retrigger = [True] * mod_channels  # if true, the vibrato counter is reset as usual
-                    mod_tremolo = [False] * mod_channels
-                    mod_tremolo_counter = [0] * mod_channels
-                    mod_tremolo_offset = [0] * mod_channels
-                    mod_tremolo_wave = [0] * mod_channels
-                    mod_tremolo_retrigger = [True] * mod_channels
-                    mod_retrig_speed = [0] * mod_channels
-                    mod_invert_loop_counter = [0] * mod_channels  # 0  =  no inversion
-                    mod_invert_loop_position = [0] * mod_channels
-                    mod_invert_loop_speed = [0] * mod_channels
-                    mod_finetune_temp = [0] * mod_channels  # for the "set finetune" effect, which doesn't directly affect the sample. if there's no effect, this'll contain the default finetune, otherwise, it'll be overridden. this is used when finding the frequency based on the period values, so it's actually very important!
-                    mod_glissando = [False] * mod_channels
-                    mod_bass_channel = [False] * mod_channels  # pymod exclusive feature: use the effect e02 on a channel with bass sounds on it (e.g. bass drums or sub basses) to remove the ringing :D (e03 turns the bass filter off)
-                    mod_delay_channel = [False] * mod_channels  # pymod exclusive feature: use the effect e04 or e05 on a channel to add a crude reverb simulation! (e06 turns it off)
-                    mod_sample_reversed = [False] * mod_channels  # pymod exclusive feature: use the effect e07 to play a sample in reverse (or e08 to play it forwards again)
-                    mod_sample_reversed_flag = [False] * mod_channels
-                    mod_delay_channel_fast = [False] * mod_channels
-                    if self._interpolate:
-                        mod_interpolate_channel = [True] * mod_channels
-                    else:
-                        mod_interpolate_channel = [False] * mod_channels  # pymod exclusive feature: use the effect e09 to turn on interpolation for a channel, and e0a to turn it off
-
-                    mod_loop_play_full = [False] * mod_channels  # if this is false, the sample's loop will play as expected. if the sample is looping but the loop starts at 0, this will be true, meaning the whole sample will have to play through before looping
-                    mod_sample_number_cued = [0] * mod_channels  # the next sample to be played once a loop's finished, if another sample number is specified (if a sample is just being played normally from the start, this should match mod_sample_number!)
-                    mod_offset_flag = [False] * mod_channels
-                    mod_offset_delay_flag = [False] * mod_channels
-
-                    mod_tone_memory = [0] * mod_channels
-                    mod_offset_memory = [0] * mod_channels
-                    mod_vibrato_memory = [0] * mod_channels
-                    mod_tremolo_memory = [0] * mod_channels
-
-                    mod_pattern_loop_start = [-1] * mod_channels  # -1 if there's no loop right now
-                    mod_pattern_loop_end = [-1] * mod_channels
-                    mod_pattern_loop_counter = [0] * mod_channels  # counts down on every loop
-                    mod_pattern_delay = 0  # if 0, there's no delay. if above 0, it counts down. the pattern only plays if this is 0 and mod_pattern_delay_finished is true
-                    mod_pattern_delay_finished = True  # if this is false, it waits until the next line to stop advancing the mod pointer (without this flag, it would hang on whatever channel the effect was encountered on)
-                    mod_pattern_delay_encountered = False  # is there a pattern delay effect on the current line?
-
-                    mod_next_position = 0
-                    mod_next_line = 0
-                    mod_next_line_offset = False  # in protracker, using a pattern delay alongside a line break adds 1 to the line... for some reason
-                    mod_position_break = False
-                    mod_line_break = False
-
-                    mod_order_position = self._mod_position_start
-                    if mod_order_position < mod_song_length:
-                        mod_pointer = mod_pattern_offsets[mod_order[mod_order_position]]
-                    else:
-                        # start position is past the last position so we just set the position to 0, it will not be played anyway
-                        mod_pointer = mod_pattern_offsets[mod_order[0]]
 
-                    mod_patterns_left_to_play = self._nb_of_patterns_to_play
+                # the length is found by going through the song without mixing anything, which is quick (and exact!)
+                timeline = self._mod_get_timeline(mod_data, total_nb_of_loops)
+                estimated_length = timeline.length_ms() / 1000
+                estimated_length_minutes = estimated_length // 60
+                estimated_length_seconds = estimated_length % 60
+
+                # the part of the song to play, in frames (usually all of it)
+                frame_start = min(max(timeline.ms_to_frame(start * 1000), 0), timeline.length)
+                frame_end = timeline.length
+                if end is not None:
+                    frame_end = min(max(timeline.ms_to_frame(end * 1000), frame_start), timeline.length)
+                mod_overall_length = frame_end - frame_start
+                frame_size = 2  # bytes per frame
+                if stereo:
+                    frame_size *= 2
+                if self._render_channels:
+                    frame_size *= mod_channels  # every channel's frame goes one after the other, then they're split up into their own files
+
+                file_finished = array("H")  # every 16-bit value rendered so far (2 bytes each, rather than a python int for every byte)
+
+                rendering = self._render_file is not None or self._render_sink is not None
+                sink = None  # where the audio goes as it's mixed (when rendering to a file without streaming, it's all written at the end instead)
+                if not rendering and self._play_mode != "info":
+                    # each line's mixed into file_finished, then handed over to the sink (which is usually pyaudio's thread, to play)
+                    sink = self._play_sink
+                    if sink is None:
+                        sink = PyAudioSink(self._buffer_size, self._preroll)
+                    sink.open(frame_size // 2, self._sample_rate)
+
+                start_time = time.perf_counter()
+
+                resume_state = None
+                if self._resume and self._render_file is not None:
+                    resume_settings = self._mod_get_settings(total_nb_of_loops) + (frame_start, frame_end, self._render_channels, zlib.crc32(mod_data.data))
+                    resume_state = self._mod_load_resume(resume_settings)
+                    if resume_state is None:
+                        self._mod_remove_resume()  # nothing to carry on from (or it's from a different render)
+                    elif not self._quiet:
+                        print("Resuming the previous render...")
+
+                if self._play_mode != "info":
+                    output = file_finished
+                    if self._render_sink is not None:
+                        sink = self._render_sink
+                    elif self._render_file is not None:
+                        sink = None
+                        if self._render_channels:
+                            # every channel's rendered in the same pass, each one going straight to its own file
+                            sink = _StemSink([WavSink(file_name) for file_name in self._mod_get_stem_file_names(mod_channels)])
+                        elif self._stream:
+                            sink = WavSink(self._render_file)
+                    if rendering and sink is not None:
+                        sink.open(frame_size // 2, self._sample_rate)
+                    player = _Player(self, mod_data, mod_sample_overlay, output, total_nb_of_loops, self._render_channels)
+                    skip_frames = 0
+                    part_length = 0  # how many bytes of the render have been saved to the .part file
+                    streamed_length = 0  # how many bytes of the render have been handed to the sink (and taken out of file_finished)
+                    if resume_state is not None:
+                        player.restore(resume_state["player"])
+                        skip_frames = resume_state["skip_frames"]
+                        file_finished.frombytes(resume_state["part"])
+                        if sink is not None:
+                            streamed_length = self._mod_stream_render(sink, file_finished, len(resume_state["part"]))
+                        part_length = len(resume_state["part"])
+                        resume_state = None
+                    elif frame_start > 0:
+                        skip_frames = self._mod_seek(player, timeline, frame_start)
+                    if skip_frames > 0:
+                        player.set_output(_SkipFrames(output, skip_frames * frame_size))  # the first line starts before the frame we're after
+                    if self._resume and self._render_file is not None:
+                        part_length = self._mod_save_resume(resume_settings, player, skip_frames, file_finished, part_length, streamed_length)
+                        resume_saved_time = time.perf_counter()
+
+                    while player.frames < frame_end and player.next_line():
+                        mod_order_position = player.mod_order_position
+                        mod_line = player.mod_line
+                        mod_current_loop = player.mod_current_loop
+                        if not self._quiet:
+                            percent_rendered = ((player.frames - frame_start) / mod_overall_length) if mod_overall_length > 0 else 0
+                            percent_rendered = int(percent_rendered * 100)
+                            percentage_string = f" ({percent_rendered}%)"
+                            current_time = time.perf_counter()
+                            time_elapsed = current_time - start_time
+                            time_elapsed_minutes = int(time_elapsed / 60)
+                            time_elapsed_seconds = int(time_elapsed % 60)
+                            time_elapsed_string = f"{time_elapsed_minutes}m {time_elapsed_seconds}s".ljust(6, " ")
+                            time_remaining = int(mod_overall_length / self._sample_rate) - int(time_elapsed)
+                            if time_remaining < 0:  # only if playback's running behind
+                                time_remaining = 0
+                            time_remaining_minutes = time_remaining // 60
+                            time_remaining_seconds = time_remaining % 60
+                            time_elapsed_string += "(-" + f"{time_remaining_minutes}m {time_remaining_seconds}s".rjust(6, " ") + ")"
+
+                        loop_string = ""
+                        if total_nb_of_loops > 1:
+                            loop_string = f" (loop {mod_current_loop + 1}/{total_nb_of_loops}"
+                        if self._verbose:
+                            loop_string += ", "
+                            bytes_per_second = (player.frames - frame_start) / time_elapsed
+                            kilobytes_per_second = bytes_per_second / 1000
+                            loop_string += f"{kilobytes_per_second:.2f} kbps"
+                        if total_nb_of_loops > 1:
+                            loop_string += ")"
+                        if rendering and not self._quiet:
+                            if self._verbose:
+                                rendering_string = f"Rendering{percentage_string}: Order {mod_order_position}/{mod_song_length - 1}, Pattern {mod_order[mod_order_position]}, Line {mod_line + 1}{loop_string}   "
+                            else:
+                                rendering_string = f"Rendering order {mod_order_position}/{mod_song_length - 1}{loop_string}{percentage_string}...   "
+                            print(rendering_string, end="\r")
 
-                    mod_line = 0
-                    mod_current_loop = 0  # different to the "loops" variable, this increases until it reaches "loops"
-                    mod_bpm = 0  # calculated from the tempo and ticks/line (only used for a visual indicator)
-                    mod_tempo = self._mod_tempo
-                    mod_ms_per_tick = self._mod_get_tempo_length(self._mod_tempo)
-                    mod_ticks = self._mod_ticks
+                        player.parse_line()
 
-                    sample_byte = 0
-
-                    if estimating_length:
-                        while_condition = True
-                    else:
-                        if self._render_channels:
-                            while_condition = channel_current < mod_channels - 1
-                        else:
-                            while_condition = False
-                    while mod_order_position < mod_song_length and mod_patterns_left_to_play != 0:
-                        if mod_patterns_left_to_play > 0:
-                            mod_patterns_left_to_play -= 1
-
-                        while mod_line < mod_lines:
-                            if not self._quiet:
-                                if estimate and not estimating_length:
-                                    percent_rendered = (mod_bytes_rendered / (mod_overall_length * (self._sample_rate / sample_rate_minimum)))
-                                    if self._render_channels:
-                                        percent_rendered /= mod_channels
-                                    percent_rendered = int(percent_rendered * 100)
-                                    percentage_string = f" ({percent_rendered}%)"
-                                else:
-                                    percentage_string = ""
-                                if not estimating_length:
-                                    current_time = time.perf_counter()
-                                    time_elapsed = current_time - start_time
-                                    time_elapsed_minutes = int(time_elapsed / 60)
-                                    time_elapsed_seconds = int(time_elapsed % 60)
-                                    time_elapsed_string = f"{time_elapsed_minutes}m {time_elapsed_seconds}s".ljust(6, " ")
-                                    if estimate:
-                                        time_remaining = int(estimated_length) - int(time_elapsed)
-                                        if time_remaining < 0:  # man, that accuracy
-                                            time_remaining = 0
-                                        time_remaining_minutes = time_remaining // 60
-                                        time_remaining_seconds = time_remaining % 60
-                                        time_elapsed_string += "(-" + f"{time_remaining_minutes}m {time_remaining_seconds}s".rjust(6, " ") + ")"
-
-                            if not estimating_length:
-                                line_string = ""
-                                loop_string = ""
-                                if total_nb_of_loops > 1 or self._render_channels:
-                                    loop_string = " ("
+                        if not rendering:
+                            mod_order_position = player.mod_order_position  # a line break can change this while the line's parsed
+                            if self._verbose:
+                                line_string = player.line_string
                                 if total_nb_of_loops > 1:
-                                    loop_string += f"loop {mod_current_loop + 1}/{total_nb_of_loops}"
-                                    if self._render_channels:
-                                        loop_string += ", "
-                                if self._render_channels:
-                                    loop_string += f"channel {channel_current + 1}"
-                                if self._verbose:
-                                    loop_string += ", "
-                                    bytes_per_second = mod_bytes_rendered / time_elapsed
-                                    kilobytes_per_second = bytes_per_second / 1000
-                                    loop_string += f"{kilobytes_per_second:.2f} kbps"
-                                if total_nb_of_loops > 1 or self._render_channels:
-                                    loop_string += ")"
-                                if self._render_file is not None and not self._quiet:
-                                    if self._verbose:
-                                        rendering_string = f"Rendering{percentage_string}: Order {mod_order_position}/{mod_song_length - 1}, Pattern {mod_order[mod_order_position]}, Line {mod_line + 1}{loop_string}   "
-                                    else:
-                                        rendering_string = f"Rendering order {mod_order_position}/{mod_song_length - 1}{loop_string}{percentage_string}...   "
-                                    print(rendering_string, end="\r")
-
-                            mod_pattern_delay_encountered = False
-                            for channel in range(0, mod_channels):
-                                if mod_pattern_delay_finished:
-                                    effect_number = mod_file[mod_pointer + 2] & 0xf  # ssssh copypasta
-                                    effect_param = mod_file[mod_pointer + 3]
-                                    if effect_number == 0xf:  # set tempo/ticks (checked for all channels for the note delay - fixes the weird behaviour in ode2ptk - hey, that rhymes)
-                                        if effect_param < 32:
-                                            mod_ticks = effect_param
-                                        else:
-                                            mod_tempo = effect_param
-                                            mod_ms_per_tick = self._mod_get_tempo_length(mod_tempo)
-                                    if effect_number == 0xe and effect_param >> 4 == 0xe and self._legacy:  # pattern delay and line breaks (should this be part of legacy mode?)
-                                        mod_next_line_offset = True
-                                        mod_pattern_delay_encountered = True
-                                mod_pointer += 4
-                            mod_pointer -= 4 * mod_channels
-
-                            for channel in range(0, mod_channels):
-                                # difference between mod_period and mod_raw_period:
-                                # mod_period is only changed if the period is non-zero
-                                # mod_raw_period is the raw period value - for example, it's used when checking if there's a sample number and no period... (this usually doesn't need to be touched)
-
-                                mod_effect_number[channel] = mod_file[mod_pointer + 2] & 0xf
-                                mod_effect_param[channel] = mod_file[mod_pointer + 3]
-
-                                if mod_pattern_delay_finished:
-                                    period = ((mod_file[mod_pointer] & 0xf) << 8) + mod_file[mod_pointer + 1]  # the period can be changed, even if there's no sample number
-                                    mod_raw_period[channel] = period
-                                    mod_raw_period_inc_delay[channel] = period
-                                    sample_number = (mod_file[mod_pointer] & 0xf0) + (mod_file[mod_pointer + 2] >> 4)
-                                    if sample_number > mod_samples_amount:
-                                        sample_number = 0
-                                    mod_port_amount[channel] = 0
-                                    mod_volslide_amount[channel] = 0
-                                else:
-                                    sample_number = 0
-                                    mod_raw_period[channel] = 0
-                                    mod_effect_number[channel] = 0
-                                    mod_effect_param[channel] = 0
-
-                                if not estimating_length:
-                                    # portamento effects MUST be handled here!
-                                    # otherwise the periods won't be correct (the periods are updated in the code after this)
-                                    # that's because with the tone portamento, it uses the LAST period as the period to slide from, and then the current period is grabbed after that
-                                    if mod_effect_number[channel] == 0x1:  # slide up
-                                        mod_port_amount[channel] = mod_effect_param[channel]
-                                        mod_port_fine[channel] = False
-                                    if mod_effect_number[channel] == 0x2:  # slide down
-                                        mod_port_amount[channel] = 0 - mod_effect_param[channel]
-                                        mod_port_fine[channel] = False
-                                    mod_tone_sliding[channel] = False
-                                    if (mod_effect_number[channel] == 0x3 or mod_effect_number[channel] == 0x5) and mod_tone_period[channel] > 0:
-                                        mod_tone_sliding[channel] = True
-                                    if mod_effect_number[channel] == 0x3:
-                                        if period > 0:
-                                            if mod_tone_period[channel] > 0:
-                                                mod_tone_sliding[channel] = True
-                                            mod_tone_period[channel] = Module._mod_get_finetune_period(period, mod_finetune_temp[channel], self._legacy)
-                                        if mod_effect_param[channel] > 0:
-                                            mod_tone_memory[channel] = mod_effect_param[channel]
-
-                                    if mod_pattern_delay_finished:
-                                        mod_retrig_speed[channel] = 0
-
-                                    if sample_number > 0:  # finetune check...
-                                        mod_finetune_temp[channel] = mod_samples[sample_number - 1]["finetune"]
-
-                                if sample_number > 0:
-                                    mod_ticks_per_beat = mod_ticks * 4  # formula taken from the openmpt source code! (sndfile.cpp)
-                                    mod_samples_per_beat = mod_ms_per_tick * mod_ticks_per_beat
-                                    mod_bpm = (self._sample_rate / mod_samples_per_beat) * 60
-
-                                # extended effects are here because the note delay is checked before the sample plays
-                                if mod_effect_number[channel] == 0xe:  # extended effects
-                                    effect = mod_effect_param[channel] >> 4
-                                    param = mod_effect_param[channel] & 0xf
-                                    if not estimating_length:  # skipping as many irrelevant effects as possible when estimating the length!!
-                                        if effect == 0xc:  # note cut
-                                            if param == 0:  # ec0 is equivalent to c00
-                                                mod_sample_volume[channel] = 0
-                                            else:
-                                                if param >= mod_ticks:  # if the cut amount is the same as the ticks per line, the note plays normally
-                                                    mod_note_cut_ticks[channel] = -1
-                                                else:
-                                                    mod_note_cut_ticks[channel] = param
-                                        mod_note_delay_ticks[channel] = -1  # no note delay effect, reset it
-                                        if effect == 0xd:  # note delay
-                                            if param >= mod_ticks:  # if the delay amount is the same as the ticks per line, the note is ignored
-                                                mod_note_delay_ticks[channel] = -2  # pro coder skillz
-                                            else:
-                                                mod_note_delay_ticks[channel] = param
-                                        if effect == 0xa:  # fine volume slide up
-                                            mod_volslide_amount[channel] = param
-                                            mod_volslide_fine[channel] = True
-                                        if effect == 0xb:  # fine volume slide down
-                                            mod_volslide_amount[channel] = 0 - param
-                                            mod_volslide_fine[channel] = True
-                                        if effect == 0x1:  # fine portamento up
-                                            mod_port_amount[channel] = param
-                                            mod_port_fine[channel] = True
-                                        if effect == 0x2:  # fine portamento down
-                                            mod_port_amount[channel] = 0 - param
-                                            mod_port_fine[channel] = True
-                                        if effect == 0x9:  # note retrigger
-                                            if param > 0:
-                                                mod_retrig_speed[channel] = param
-                                                mod_sample_playing[channel] = True
-                                                mod_sample_position[channel] = 0
-                                        if effect == 0x5:  # set finetune
-                                            mod_finetune_temp[channel] = param
-                                        if effect == 0xf:  # invert loop
-                                            if param == 0:
-                                                mod_invert_loop_speed[channel] = 0
-                                            else:
-                                                mod_invert_loop_counter[channel] = 0
-                                                mod_invert_loop_speed[channel] = Module._mod_funk_table[param]
-                                        wave_type = param % 4
-                                        wave_retrigger = param % 8 < 4
-                                        if effect == 0x4:  # vibrato wave type
-                                            mod_vibrato_wave[channel] = wave_type
-                                            mod_vibrato_retrigger[channel] = wave_retrigger
-                                        if effect == 0x7:  # tremolo wave type
-                                            mod_tremolo_wave[channel] = wave_type
-                                            mod_tremolo_retrigger[channel] = wave_retrigger
-                                        if effect == 0x3:  # glissando control
-                                            mod_glissando[channel] = param > 0
-                                        if effect == 0x0:  # filter on/off
-                                            if not mod_filter_flag:
-                                                if self._legacy or (not self._legacy and param < 2):
-                                                    mod_filter = param % 2 == 0
-                                        if effect == 0x8:  # set panning
-                                            if not self._legacy:  # this effect isn't supported in protracker 2.3!
-                                                if param == 15:
-                                                    mod_channel_pan[channel] = 1
-                                                else:
-                                                    mod_channel_pan[channel] = ((param - 8) / 8)
-
-                                    if effect == 0x6:  # pattern loop
-                                        if param == 0:  # set loop start
-                                            mod_pattern_loop_start[channel] = mod_line
-                                        else:  # loop x amount of times
-                                            mod_pattern_loop_end[channel] = mod_line
-                                            if mod_pattern_loop_counter[channel] == 0:
-                                                mod_pattern_loop_counter[channel] = param + 1
-                                    if effect == 0xe:  # pattern delay:
-                                        mod_pattern_delay = param
-
-                                    mod_sample_reversed_flag[channel] = False
-                                    if effect == 0x0 and not self._legacy:  # pymod exclusive effects
-                                        if param == 0x2:  # bass channel filter on
-                                            mod_bass_channel[channel] = True
-                                            mod_using_bass_channel = True
-                                        elif param == 0x3:  # bass channel filter off
-                                            mod_bass_channel[channel] = False
-                                        elif param == 0x4:  # channel delay on (fast decay)
-                                            mod_delay_channel[channel] = True
-                                            mod_delay_channel_fast[channel] = True
-                                            mod_using_delay_channel = True
-                                        elif param == 0x5:  # channel delay on (slow decay)
-                                            mod_delay_channel[channel] = True
-                                            mod_delay_channel_fast[channel] = False
-                                            mod_using_delay_channel = True
-                                        elif param == 0x6:  # channel delay off
-                                            mod_delay_channel[channel] = False
-                                        elif param == 0x7:  # sample reverse
-                                            mod_sample_reversed[channel] = True
-                                            mod_sample_reversed_flag[channel] = period > 0
-                                        elif param == 0x8:  # sample forwards
-                                            mod_sample_reversed[channel] = False
-                                        elif param == 0x9:  # channel interpolation on
-                                            mod_interpolate_channel[channel] = True
-                                        elif param == 0xa:  # channel interpolation off
-                                            mod_interpolate_channel[channel] = False
-
-                                if not estimating_length:
-                                    if sample_number > 0:  # is a sample playing?
-                                        mod_invert_loop_counter[channel] = 0
-                                        if mod_samples[sample_number - 1]["length"] == 0 and mod_pattern_delay_finished:  # is the current sample empty?
-                                            sample_number = 32  # play an empty "sample"
-                                        mod_sample_number_cued[channel] = sample_number  # "cue up" the next sample
-                                        if mod_samples[sample_number - 1]["loop_start"] == 0 and mod_samples[sample_number - 1]["loop_length"] > 2:  # is this sample looping and does the loop start at 0?
-                                            if not mod_sample_playing[channel]:  # is there no sample currently playing?
-                                                mod_loop_play_full[channel] = True  # the full sample must be played first
-                                        else:  # not looping
-                                            if not mod_sample_playing[channel]:
-                                                mod_loop_play_full[channel] = False  # idk if this is correct, half of the loop code is guess work and playing it by ear
-                                        if mod_sample_position[channel] == 0:  # sample hasn't played yet?
-                                            mod_sample_number[channel] = sample_number  # ...play it
-                                        # if the sample is empty, none of that code will be executed, so nothing will be played
-                                        sample_number -= 1
-                                        if mod_sample_number[channel] > 0 and mod_raw_period[channel] == 0:  # sample number, no period?
-                                            if mod_note_delay_ticks[channel] == -1 and sample_number != 31:  # if there's a note delay, the volume will be set once the counter reaches 0
-                                                mod_sample_volume[channel] = mod_samples[sample_number]["volume"]
-                                        elif mod_sample_number[channel] > 0 and mod_raw_period[channel] > 0:  # sample number and period...
-                                            mod_sample_offset[channel] = mod_samples[sample_number]["offset"]
-                                            if not mod_tone_sliding[channel]:  # don't reset the sample position or volume if sliding notes
-                                                if mod_note_delay_ticks[channel] == -1 or (mod_note_delay_ticks[channel] > 0 and mod_samples[sample_number]["loop_length"] > 2 and self._legacy):  # this'll always be -1 unless there's a note delay effect
-                                                    mod_sample_playing[channel] = True
-                                                    if mod_sample_reversed_flag[channel]:  # has a "reverse" effect been encountered?
-                                                        mod_sample_position[channel] = mod_samples[mod_sample_number[channel] - 1]["length"] - 1
-                                                    else:  # no reverse effect, play sample normally
-                                                        mod_sample_position[channel] = 0
-                                                        mod_sample_reversed[channel] = False
-                                            if mod_note_delay_ticks[channel] == -1 or (mod_note_delay_ticks[channel] > 0 and mod_samples[sample_number]["loop_length"] > 2 and self._legacy):
-                                                mod_sample_volume[channel] = mod_samples[sample_number]["volume"]
-                                        sample_number += 1
-                                    elif sample_number == 0:  # no sample number...
-                                        if mod_raw_period[channel] > 0:  # period, no sample?
-                                            if mod_note_delay_ticks[channel] == -1 and not mod_tone_sliding[channel]:
-                                                mod_sample_playing[channel] = True
-                                                if mod_sample_reversed_flag[channel]:  # has a "reverse" effect been encountered?
-                                                    mod_sample_position[channel] = mod_samples[mod_sample_number[channel] - 1]["length"] - 1
-                                                else:  # no reverse effect, play sample normally
-                                                    mod_sample_position[channel] = 0
-                                                    mod_sample_reversed[channel] = False
-                                    if mod_raw_period[channel] > 0:  # period, regardless of sample number?
-                                        if mod_samples[mod_sample_number_cued[channel] - 1]["loop_start"] == 0:  # i seriously have no clue if this is correct
-                                            mod_loop_play_full[channel] = True  # a period will reset this flag
-                                        if mod_sample_number[channel] != mod_sample_number_cued[channel]:
-                                            mod_sample_offset[channel] = mod_samples[mod_sample_number_cued[channel] - 1]["offset"]
-                                            if mod_sample_reversed_flag[channel]:  # has a "reverse" effect been encountered?
-                                                mod_sample_position[channel] = mod_samples[mod_sample_number_cued[channel] - 1]["length"] - 1
-                                            else:  # no reverse effect, play sample normally
-                                                mod_sample_position[channel] = 0
-                                                mod_sample_reversed[channel] = False
-                                        mod_sample_number[channel] = mod_sample_number_cued[channel]
-
-                                    if mod_effect_number[channel] != 0x3 and period > 0:  # if there's a slide before a period, this changes it before the slide so it slides to the correct period (slideperiodslideslideperiod)
-                                        # that comment continues to crack me up
-                                        mod_tone_period[channel] = Module._mod_get_finetune_period(period, mod_finetune_temp[channel], self._legacy)
-                                    if mod_tone_period[channel] == 0 and period > 0:  # nothing to slide from, use the current period
-                                        mod_tone_period[channel] = period
-                                    if period > 0 and not mod_tone_sliding[channel] and mod_pattern_delay_finished:  # the period>0 fixes a bug related to pattern delays, if there's a period on the last channel, the period value will contain that, so without the check all channels will have the same period!
-                                        mod_period_temp = Module._mod_get_finetune_period(period, mod_finetune_temp[channel], self._legacy)
-                                        if mod_note_delay_ticks[channel] == -1:
-                                            mod_period[channel] = mod_period_temp
-                                        else:
-                                            mod_next_period[channel] = mod_period_temp
-                                        mod_arp_period[channel] = period  # are you kidding me, that's all i had to do the entire time, i was faffing around and turns out i was trying to find the finetuned period of a finetuned period, SSCCHHHHEEEEE
-                                    if mod_sample_volume[channel] > 64:
-                                        mod_sample_volume[channel] = 64
-
-                                    if mod_effect_number[channel] == 0x0:  # arpeggio
-                                        if mod_effect_param[channel] > 0:  # 0 means ignore
-                                            mod_arp_counter[channel] = 0  # reset the counter every time the effect is encountered
-                                            period_note = Module._mod_get_period_note(mod_arp_period[channel], self._legacy)
-                                            sample_finetune = mod_finetune_temp[channel]
-                                            sample_finetune_temp = sample_finetune
-                                            sample_finetune_temp_changed = False  # so the finetune isn't repeatedly increased
-
-                                            if mod_effect_param[channel] >> 4 == 0:
-                                                if self._legacy:
-                                                    mod_arp_periods[channel][1] = Module._mod_legacy_periods[sample_finetune][period_note]
-                                                else:
-                                                    mod_arp_periods[channel][1] = Module._mod_extended_periods[sample_finetune][period_note]
-                                            else:
-                                                period_1 = period_note + (mod_effect_param[channel] >> 4)  # this actually contains the note number, not the period... ;) (the reason it's the period amount+1 is because there's like this extra "period" containing no note when arpeggiating, causing a "cutting" effect)
-                                                if period_1 == mod_period_amount:
-                                                    mod_arp_periods[channel][1] = 0  # don't play the note at all
-                                                else:
-                                                    if period_1 > mod_period_amount:
-                                                        sample_finetune_temp += 1  # when a wraparound occurs, the finetune is increased by one, because on the amiga, the period table is stored as one long list, so it reaches the lowest note of the finetune next to the one used with the current sample!
-                                                        if self._legacy:
-                                                            sample_finetune_temp %= len(Module._mod_legacy_periods)
-                                                        else:
-                                                            sample_finetune_temp %= len(Module._mod_extended_periods)
-                                                        sample_finetune_temp_changed = True
-                                                        period_1 -= mod_period_amount
-                                                    if self._legacy:
-                                                        mod_arp_periods[channel][1] = Module._mod_legacy_periods[sample_finetune_temp][period_1]
-                                                    else:
-                                                        mod_arp_periods[channel][1] = Module._mod_extended_periods[sample_finetune_temp][period_1]
-
-                                            if mod_effect_param[channel] & 0xf == 0:
-                                                if self._legacy:
-                                                    mod_arp_periods[channel][2] = Module._mod_legacy_periods[sample_finetune][period_note]  # still using the regular finetune for this, since the wraparound hasn't occured
-                                                else:
-                                                    mod_arp_periods[channel][2] = Module._mod_extended_periods[sample_finetune][period_note]
-                                            else:
-                                                period_2 = period_note + (mod_effect_param[channel] & 0xf)
-                                                if period_2 == mod_period_amount:
-                                                    mod_arp_periods[channel][2] = 0
-                                                else:
-                                                    if period_2 > mod_period_amount:
-                                                        if not sample_finetune_temp_changed:  # no need to set the flag here since it's the last of the 2 periods!
-                                                            sample_finetune_temp += 1
-                                                            if self._legacy:
-                                                                sample_finetune_temp %= len(Module._mod_legacy_periods)
-                                                            else:
-                                                                sample_finetune_temp %= len(Module._mod_extended_periods)
-                                                        period_2 -= mod_period_amount
-                                                    if self._legacy:
-                                                        mod_arp_periods[channel][2] = Module._mod_legacy_periods[sample_finetune_temp][period_2]
-                                                    else:
-                                                        mod_arp_periods[channel][2] = Module._mod_extended_periods[sample_finetune_temp][period_2]
-                                            if self._legacy:
-                                                mod_arp_periods[channel][0] = Module._mod_legacy_periods[sample_finetune][period_note]
-                                            else:
-                                                mod_arp_periods[channel][0] = Module._mod_extended_periods[sample_finetune][period_note]
-                                        else:
-                                            mod_arp_periods[channel][0] = 0
-                                            mod_arp_periods[channel][1] = 0
-                                            mod_arp_periods[channel][2] = 0
-                                            mod_arp_counter[channel] = 0
-                                    else:
-                                        mod_arp_periods[channel][0] = 0
-                                        mod_arp_periods[channel][1] = 0
-                                        mod_arp_periods[channel][2] = 0
-                                        mod_arp_counter[channel] = 0
-
-                                if mod_effect_number[channel] == 0xb:  # position break
-                                    mod_next_position = mod_effect_param[channel]
-                                    mod_position_break = True
-                                if mod_effect_number[channel] == 0xd:  # line break
-                                    mod_next_line = (((mod_effect_param[channel] >> 4) * 10) + (mod_effect_param[channel] & 0xf))
-                                    if mod_next_line_offset and mod_pattern_delay_encountered:  # this ensures the line addition only happens if the line break is ALONGSIDE a pattern delay
-                                        mod_next_line_offset = False
-                                        mod_next_line += 1
-                                        if mod_next_line > 63:
-                                            mod_next_line = 0
-                                            mod_order_position += 1
-                                        mod_orders_visited.append(mod_order_position)
-                                    mod_line_break = True
-
-                                if not estimating_length:
-                                    if mod_effect_number[channel] == 0x8:  # set panning
-                                        if not self._legacy:  # this effect isn't supported in protracker 2.3!
-                                            if mod_effect_param[channel] == 255:
-                                                mod_channel_pan[channel] = 1
-                                            else:
-                                                mod_channel_pan[channel] = (mod_effect_param[channel] - 128) / 128
-
-                                    if (mod_effect_number[channel] == 0xa or mod_effect_number[channel] == 0x5 or mod_effect_number[channel] == 0x6) and mod_pattern_delay_finished:  # volume slide/ + tone portamento/ + vibrato (volume slide doesn't have any memory)
-                                        mod_volslide_fine[channel] = False
-                                        if mod_effect_param[channel] >= 0x10:  # slide up
-                                            mod_volslide_amount[channel] = mod_effect_param[channel] >> 4
-                                        else:  # slide down
-                                            mod_volslide_amount[channel] = 0 - mod_effect_param[channel]
-
-                                    if mod_effect_number[channel] == 0xc:  # set volume
-                                        if mod_sample_number[channel] == 32:
-                                            mod_sample_volume[channel] = 0
-                                        else:
-                                            mod_sample_volume[channel] = mod_effect_param[channel]
-                                            if mod_sample_volume[channel] > 64:
-                                                mod_sample_volume[channel] = 64
-
-                                    # the offset effect has a very specific behaviour in protracker:
-                                    # * only change the offset if the effect is either on its own or alongside a sample number/period
-                                    # * only play a sample with the offset if either:
-                                    #     * it's a period on its own
-                                    #     * it's a period and a sample number alongside an offset effect
-                                    #     * there's no tone portamento currently happening
-
-                                    mod_offset_delay_flag[channel] = False
-                                    if mod_effect_number[channel] == 0x9:  # set offset
-                                        if mod_effect_param[channel] > 0:
-                                            mod_offset_memory[channel] = mod_effect_param[channel] * 256  # it's * 256 NOT 255!!!
-                                            if mod_offset_memory[channel] > mod_samples[mod_sample_number[channel] - 1]["length"]:
-                                                mod_offset_memory[channel] = mod_samples[mod_sample_number[channel] - 1]["length"]
-
-                                    if mod_raw_period[channel] > 0 and sample_number > 0 and mod_effect_number[channel] != 0x9:
-                                        mod_offset_flag[channel] = False
-                                    elif (mod_raw_period[channel] == 0 and sample_number > 0 and mod_effect_number[channel] == 0x9) or (mod_raw_period[channel] > 0 and sample_number > 0 and mod_effect_number[channel] == 0x9):
-                                        mod_offset_flag[channel] = True
-                                    if ((mod_raw_period[channel] > 0 and sample_number == 0 and mod_effect_number[channel] != 0x9) or (mod_raw_period[channel] > 0 and sample_number > 0 and mod_effect_number[channel] == 0x9) or (mod_raw_period[channel] > 0 and mod_effect_number[channel] == 0x9)) and not mod_tone_sliding[channel]:
-                                        if mod_offset_flag[channel]:
-                                            if mod_note_delay_ticks[channel] == -1:
-                                                mod_sample_position[channel] = mod_offset_memory[channel]
-                                            else:
-                                                mod_offset_delay_flag[channel] = True
-
-                                    # vibrato/tremolo
-
-                                    mod_vibrato[channel] = False
-                                    mod_tremolo[channel] = False
-                                    if mod_effect_number[channel] == 0x4:  # vibrato
-                                        memory = mod_vibrato_memory[channel]
-                                    elif mod_effect_number[channel] == 0x7:  # tremolo
-                                        memory = mod_tremolo_memory[channel]
-
-                                    if mod_raw_period[channel] > 0:  # if there's a period...
-                                        if not mod_vibrato[channel]:  # ...and there's no vibrato...
-                                            if mod_vibrato_retrigger[channel]:
-                                                mod_vibrato_counter[channel] = 0  # ...reset the counter, otherwise the note will play slightly out of tune
-                                                mod_vibrato_offset[channel] = 0
-                                        if not mod_tremolo[channel]:
-                                            if mod_tremolo_retrigger[channel]:
-                                                mod_tremolo_counter[channel] = 0
-                                                mod_tremolo_offset[channel] = 0
-
-                                    if mod_effect_number[channel] == 0x4 or mod_effect_number[channel] == 0x7:  # vibrato/tremolo
-                                        if mod_effect_param[channel] > 0:
-                                            if mod_effect_param[channel] >> 4 == 0:  # speed continue (4xY)
-                                                memory = (memory & 0xf0) | (mod_effect_param[channel] & 0xf)
-                                            elif mod_effect_param[channel] & 0xf == 0:  # depth continue (4Xy)
-                                                memory = (mod_effect_param[channel] & 0xf0) | (memory & 0xf)
-                                            else:  # speed and depth (4XY)
-                                                memory = mod_effect_param[channel]
-
-                                    if mod_effect_number[channel] == 0x4:  # vibrato
-                                        mod_vibrato_memory[channel] = memory
-                                    elif mod_effect_number[channel] == 0x7:  # tremolo
-                                        mod_tremolo_memory[channel] = memory
-                                        mod_tremolo[channel] = True
-
-                                    if mod_effect_number[channel] == 0x4 or mod_effect_number[channel] == 0x6:  # vibrato/volslide + vibrato
-                                        mod_vibrato[channel] = True
-                                        if mod_raw_period[channel] > 0:
-                                            if mod_vibrato_retrigger[channel]:
-                                                mod_vibrato_counter[channel] = 0
-
-                                    if mod_effect_number[channel] == 0x3 and mod_raw_period[channel] > 0 and mod_samples[mod_sample_number[channel] - 1]["length"] > 0:
-                                        mod_sample_playing[channel] = True
-
-                                    # i was finding the finetuned version of a finetuned period... again
-                                    # ...words can't describe the way i exhaled when i realized this
-
-                                    if self._render_file is None:
-                                        if self._verbose:
-                                            note_name = "---"
-                                            note_number = Module._mod_get_period_note(mod_raw_period[channel], self._legacy)
-                                            if self._legacy:
-                                                if note_number >= 0 and note_number < mod_period_amount - 1:
-                                                    note_name = mod_note_names[note_number]
-                                            else:
-                                                if note_number < mod_period_amount - 1:
-                                                    note_name = mod_note_names[note_number]
-                                            sample_number_string = str(sample_number).zfill(2)
-                                            effect_string = hex(mod_effect_number[channel])[2:].upper() + " " + hex(mod_effect_param[channel])[2:].upper().zfill(2)
-                                            line_string += f"{note_name} {sample_number_string} {effect_string}|"
-                                if mod_pattern_delay_finished:
-                                    mod_pointer += 4  # next channel
-
-                            # channels finished
-
-                            if self._render_file is None and not estimating_length:
-                                if self._verbose:
+                                    line_string += f" ({mod_current_loop+1}/{total_nb_of_loops})"
+                                order_position_string = str(mod_order_position).zfill(3) + "/" + str(mod_song_length - 1).zfill(3)
+                                pattern_string = str(mod_order[mod_order_position]).zfill(3)
+                                line_number_string = str(mod_line).zfill(2)
+                                if not self._quiet:
+                                    print(f"O{order_position_string}, P{pattern_string}, L{line_number_string}:|{line_string} {time_elapsed_string}")
+                            else:
+                                if not self._quiet:
                                     if total_nb_of_loops > 1:
-                                        line_string += f" ({mod_current_loop+1}/{total_nb_of_loops})"
-                                    order_position_string = str(mod_order_position).zfill(3) + "/" + str(mod_song_length - 1).zfill(3)
-                                    pattern_string = str(mod_order[mod_order_position]).zfill(3)
-                                    line_number_string = str(mod_line).zfill(2)
-                                    if not self._quiet:
-                                        print(f"O{order_position_string}, P{pattern_string}, L{line_number_string}:|{line_string} {time_elapsed_string}")
-                                else:
-                                    if not self._quiet:
-                                        if total_nb_of_loops > 1:
-                                            loops_string = f", Loop: {mod_current_loop + 1}/{total_nb_of_loops}"
-                                        else:
-                                            loops_string = ""
-                                        print(f"Time elapsed: {time_elapsed_string}, Tempo: {mod_tempo}, Ticks/Line: {mod_ticks}, BPM: {'%g' % mod_bpm}, Order {mod_order_position}/{mod_song_length - 1}, Pattern {mod_order[mod_order_position]}, Line {(mod_line + 1)}{loops_string}        ", end="\r")
-
-                            mod_ticks_counter = 0
-                            mod_ticks_counter_actual = 0  # the actual tick counter (e.g. by default this'll be from 0-5)
-                            mod_ticks_counter_actual_previous = 0
-
-                            while mod_ticks_counter < mod_ms_per_tick * mod_ticks:
-                                mod_ticks_counter_actual_previous = mod_ticks_counter_actual
-                                mod_ticks_counter_actual = int((mod_ticks_counter / (mod_ms_per_tick * mod_ticks)) * mod_ticks)
-                                if not estimating_length:
-                                    for channel in range(0, mod_channels):
-                                        if mod_using_bass_channel:
-                                            mod_channel_byte_last[channel].insert(0, mod_channel_byte[channel])  # stores a "byte history" of sorts, inserting the last byte at the beginning, shifting the others over to the right
-                                            mod_channel_byte_last[channel].pop()  # remove the last element after insertion, keeping the list the same size
-                                        else:  # only the last byte is required for the filter "simulation"
-                                            mod_channel_byte_last[channel] = [mod_channel_byte[channel]]
-
-                                        if mod_ticks_counter_actual_previous != mod_ticks_counter_actual or mod_ticks_counter == 0:  # on every tick (including the first)
-                                            if mod_retrig_speed[channel] > 0:
-                                                if mod_ticks_counter_actual % mod_retrig_speed[channel] == 0:
-                                                    if mod_raw_period_inc_delay[channel] > 0 and self._legacy:  # note alongside the retrigger?
-                                                        if mod_ticks_counter_actual > 0:  # miss the second occurence of the first tick
-                                                            mod_sample_playing[channel] = True
-                                                            mod_sample_position[channel] = 0
-                                                    else:  # retrigger by itself?
-                                                        mod_sample_playing[channel] = True  # retrigger on all ticks
-                                                        mod_sample_position[channel] = 0
-                                            fine_condition = mod_ticks_counter_actual > 0
-                                            if mod_volslide_fine[channel]:
-                                                fine_condition = mod_ticks_counter_actual == 0  # only fineslide on the first tick
-                                            if fine_condition:
-                                                if mod_volslide_amount[channel] >= 0:
-                                                    mod_sample_volume[channel] += mod_volslide_amount[channel]
-                                                    if mod_sample_volume[channel] > 65:
-                                                        mod_sample_volume[channel] = 65
-                                                else:
-                                                    mod_sample_volume[channel] += mod_volslide_amount[channel]
-                                                    if mod_sample_volume[channel] < 0:
-                                                        mod_sample_volume[channel] = 0
-
-                                            fine_condition = mod_ticks_counter_actual > 0
-                                            if mod_port_fine[channel]:
-                                                fine_condition = mod_ticks_counter == 0  # only fineslide on the first tick
-                                            if mod_port_amount[channel] != 0 and fine_condition:  # portamento happening?
-                                                mod_period[channel] -= mod_port_amount[channel]
-                                            if mod_tone_sliding[channel] and mod_ticks_counter_actual > 0:  # don't slide on the first tick
-                                                if mod_period[channel] < mod_tone_period[channel] - mod_tone_memory[channel]:  # first note higher than second note?
-                                                    mod_period[channel] += mod_tone_memory[channel]
-                                                elif mod_period[channel] > mod_tone_period[channel] + mod_tone_memory[channel]:  # second note higher than first note?
-                                                    mod_period[channel] -= mod_tone_memory[channel]
-                                                else:
-                                                    mod_period[channel] = mod_tone_period[channel]
-
-                                            if self._legacy:
-                                                if mod_period[channel] < Module._mod_legacy_period_lowest:
-                                                    mod_period[channel] = Module._mod_legacy_period_lowest
-                                                if mod_period[channel] > Module._mod_legacy_period_highest:
-                                                    mod_period[channel] = Module._mod_legacy_period_highest
-                                            if mod_period[channel] > 0:
-                                                if mod_glissando[channel]:
-                                                    mod_frequency[channel] = Module._mod_get_frequency(Module._mod_get_closest_period(mod_period[channel], mod_samples[sample_number]["finetune"], self._legacy))
-                                                else:
-                                                    if mod_arp_periods[channel] == [0, 0, 0]:  # no arpeggio?
-                                                        if self._legacy and mod_ticks_counter_actual == 0:  # reset to base note on the first tick
-                                                            mod_frequency[channel] = Module._mod_get_frequency(mod_period[channel])
-                                                        else:
-                                                            mod_frequency[channel] = Module._mod_get_frequency(mod_period[channel] + mod_vibrato_offset[channel])
-                                                    else:
-                                                        if mod_arp_periods[channel][mod_arp_counter[channel]] > 0:
-                                                            mod_frequency[channel] = Module._mod_get_frequency(mod_arp_periods[channel][mod_arp_counter[channel]])
-                                                        else:
-                                                            mod_frequency[channel] = 0
-                                            if mod_arp_periods[channel] != [0, 0, 0]:
-                                                mod_arp_counter[channel] += 1
-                                                if mod_arp_counter[channel] > 2:
-                                                    mod_arp_counter[channel] = 0
-
-                                        sample_number = mod_sample_number[channel]
-                                        if sample_number > 0:
-                                            sample_number -= 1
-                                            if mod_samples[sample_number]["loop_length"] <= 2:  # sample isn't looping
-                                                if mod_sample_position[channel] > mod_samples[sample_number]["length"] - 1 or mod_sample_position[channel] < 0:  # reached end of sample?
-                                                    mod_sample_playing[channel] = False  # not looping, end sample
-                                            else:  # sample is looping
-                                                if mod_loop_play_full[channel]:  # the current sample's loop begins at 0, play the whole thing first
-                                                    if mod_sample_position[channel] > mod_samples[sample_number]["length"]:  # reached end?
-                                                        mod_loop_play_full[channel] = False  # sample has played in full
-                                                        if mod_samples[mod_sample_number_cued[channel] - 1]["loop_length"] <= 2:  # is the cued sample looping?
-                                                            mod_sample_playing[channel] = False  # if not, stop playback
-                                                        mod_sample_number[channel] = mod_sample_number_cued[channel]  # idk if this is technically correct
-                                                        mod_sample_offset[channel] = mod_samples[mod_sample_number_cued[channel] - 1]["offset"]
-                                                        mod_sample_position[channel] = mod_samples[mod_sample_number_cued[channel] - 1]["loop_start"]
-                                                else:  # sample has either played in full, or the loop begins after 0
-                                                    if mod_sample_position[channel] > mod_samples[sample_number]["loop_length"] + mod_samples[sample_number]["loop_start"]:  # reached loop point?
-                                                        mod_sample_position[channel] -= mod_samples[sample_number]["loop_length"]  # loop back
-                                                        # it's not possible to simply set the position to the loop start, because the sample stepping accuracy will be lost, especially with higher notes
-                                                        if mod_sample_number[channel] != mod_sample_number_cued[channel]:  # reached the loop end... is the currently looping sample number different to the cued one?
-                                                            if mod_samples[mod_sample_number_cued[channel] - 1]["loop_length"] > 2:  # is the cued sample looping?
-                                                                if mod_sample_number_cued[channel] == 32:
-                                                                    mod_sample_number[channel] = mod_sample_number_cued[channel]
-                                                                    mod_sample_volume[channel] = 0
-                                                                else:
-                                                                    mod_sample_number[channel] = mod_sample_number_cued[channel]
-                                                                    mod_sample_offset[channel] = mod_samples[mod_sample_number_cued[channel] - 1]["offset"]
-                                                                    mod_sample_position[channel] = mod_samples[mod_sample_number_cued[channel] - 1]["loop_start"]
-                                                            else:  # cued sample isn't looping, so stop playback altogether
-                                                                mod_sample_playing[channel] = False
-                                                                mod_sample_number[channel] = mod_sample_number_cued[channel]
-
-                                        if mod_ticks_counter_actual_previous != mod_ticks_counter_actual:  # a tick has occured
-                                            # because of the condition above, the first tick will be missed entirely, which is the correct behaviour
-                                            if mod_invert_loop_speed[channel] > 0:
-                                                mod_invert_loop_counter[channel] += mod_invert_loop_speed[channel]
-                                                if mod_invert_loop_counter[channel] > 127:
-                                                    mod_invert_loop_counter[channel] = 0
-                                                    mod_invert_loop_position[channel] += 1
-                                                    if mod_invert_loop_position[channel] > mod_samples[sample_number]["loop_length"] + mod_samples[sample_number]["loop_start"] - 1:
-                                                        mod_invert_loop_position[channel] = 0
-                                                    sample_unsigned = (mod_file[mod_samples[sample_number]["offset"] + mod_invert_loop_position[channel]] + 128) & 255  # convert the sample byte to unsigned
-                                                    sample_unsigned = ~sample_unsigned & 255  # find the bitwise not of the byte
-                                                    sample_unsigned = (sample_unsigned + 128) & 255  # convert it back to signed
-                                                    mod_file[mod_samples[sample_number]["offset"] + mod_invert_loop_position[channel]] = sample_unsigned
-
-                                            if mod_vibrato[channel] or mod_tremolo[channel]:
-                                                if mod_vibrato[channel]:
-                                                    counter = mod_vibrato_counter[channel]
-                                                    memory = mod_vibrato_memory[channel]
-                                                    wave_type = mod_vibrato_wave[channel]
-                                                else:
-                                                    counter = mod_tremolo_counter[channel]
-                                                    memory = mod_tremolo_memory[channel]
-                                                    wave_type = mod_tremolo_wave[channel]
-                                                depth = memory & 0xf
-                                                if wave_type == 0:  # sine
-                                                    offset = (Module._mod_sine_table[counter] * depth) / 128
-                                                if wave_type == 1:  # ramp down
-                                                    offset = ((counter - 32) * 8 * depth) / 128
-                                                # the random waveform isn't implemented in protracker 2.3, square is used instead
-                                                if wave_type == 2 or (wave_type == 3 and self._legacy):  # square
-                                                    offset = depth * 255
-                                                    if counter > 31:
-                                                        offset = 0 - offset
-                                                    offset /= 128
-                                                if wave_type == 3 and not self._legacy:  # random
-                                                    offset = random.randint(0 - depth, depth)
-
-                                                if mod_vibrato[channel]:
-                                                    mod_vibrato_offset[channel] = offset
-                                                    mod_vibrato_counter[channel] += memory >> 4
-                                                    mod_vibrato_counter[channel] = mod_vibrato_counter[channel] % len(Module._mod_sine_table)
-                                                else:
-                                                    mod_tremolo_offset[channel] = offset
-                                                    mod_tremolo_counter[channel] += memory >> 4
-                                                    mod_tremolo_counter[channel] = mod_tremolo_counter[channel] % len(Module._mod_sine_table)
-
-                                            if mod_note_cut_ticks[channel] >= 0:  # note actually cutting?
-                                                mod_note_cut_ticks[channel] -= 1
-                                                if mod_note_cut_ticks[channel] == 0:
-                                                    mod_note_cut_ticks[channel] = -1
-                                                    mod_sample_volume[channel] = 0
-                                            # despite the name, the note cut doesn't actually cut at all, it just changes the volume to 0
-                                            # if you put a sample number on the same line as a note cut, the volume will open up before being cut by the effect
-                                            if mod_note_delay_ticks[channel] >= 0:  # note delayed?
-                                                mod_note_delay_ticks[channel] -= 1
-                                                if mod_note_delay_ticks[channel] == 0:  # note delay finished?
-                                                    mod_note_delay_ticks[channel] = -1
-                                                    mod_period[channel] = mod_next_period[channel]  # just change the period without restarting the sample
-                                                    mod_frequency[channel] = Module._mod_get_frequency(mod_period[channel])
-                                                    if mod_samples[sample_number]["loop_length"] <= 2:  # sample NOT looping?
-                                                        if mod_offset_delay_flag[channel]:
-                                                            mod_sample_position[channel] = mod_offset_memory[channel]
-                                                        else:
-                                                            mod_sample_position[channel] = 0  # sample isn't looping, so start it from the beginning
-                                                    mod_sample_playing[channel] = True  # spent over an hour trying to figure out why this didn't work... turns out THIS LINE was in the wrong place... SSSSSSCCCCCCHHHHSSSSHHHHH
-                                                    mod_sample_volume[channel] = mod_samples[sample_number]["volume"]
-                                            elif mod_note_delay_ticks[channel] == -2:  # previously specified delay command greater than the ticks per line?
-                                                mod_note_delay_ticks[channel] = -1  # the note didn't play, so reset tick counter
-                                                # this works because there are explicit checks to only play the note if the tick counter has reached -1!!
-
-                                        if mod_sample_offset[channel] == 0:
-                                            mod_sample_volume[channel] = 0  # slightly janky way of not playing samples if no offset is specified!
-
-                                        sample_step_rate = mod_frequency[channel] / self._sample_rate
-
-                                        if mod_sample_playing[channel] and (self._render_file is None or not self._render_channels or channel == channel_current):
-                                            sample_byte_position = int(mod_sample_offset[channel] + mod_sample_position[channel])
-                                            if sample_byte_position > len(mod_file) - 1:
-                                                sample_byte_position = len(mod_file) - 1
-                                            sample_byte = (mod_file[sample_byte_position] + 128) & 255  # sample byte converted to an unsigned value
-                                            if mod_interpolate_channel[channel]:
-                                                # source: none, i stayed up until half 2 coding this "algorithm" in bed ;)
-                                                sample_position_mod = mod_sample_position[channel] % 1  # current position between 0.0 and 0.9 recurring
-                                                if sample_byte_position + 1 > len(mod_file) - 1:
-                                                    sample_byte_next = sample_byte
-                                                else:
-                                                    sample_byte_next = (mod_file[sample_byte_position + 1] + 128) & 255
-                                                sample_byte <<= 8  # convert to 16-bit to remove noise!
-                                                sample_byte_next <<= 8
-                                                sample_byte_difference = sample_byte_next - sample_byte  # the difference between the current and next bytes
-                                                sample_byte_step = sample_byte_difference * sample_position_mod  # how much to add/subtract depending on the current position
-                                                sample_byte_16 = ((mod_file[sample_byte_position] + 128) & 255) << 8  # the CURRENT sample byte, converted to an unsigned 16 bit value...
-                                                sample_byte_interpolated = sample_byte_16 + sample_byte_step  # apply the step difference
-                                                sample_byte = (sample_byte_interpolated - 32768) / 32768  # convert to a value between -1 and 1
-                                            else:
-                                                sample_byte = (sample_byte - 128) / 128  # convert to a value between -1 and 1
-                                            if self._legacy and mod_ticks_counter_actual == 0:  # reset to base volume on the first tick
-                                                volume = mod_sample_volume[channel]
-                                            else:
-                                                volume = mod_sample_volume[channel] + mod_tremolo_offset[channel]
-                                            if volume > 64:
-                                                volume = 64
-                                            if volume < 0:
-                                                volume = 0
-                                            volume /= 64
-                                            volume *= self._amplify
-                                            sample_byte *= volume
-                                            sample_byte /= mod_channels  # it makes way more sense to reduce the volume per-channel instead of overall
-                                            sample_byte = int(sample_byte * 32768)
-                                            if mod_sample_reversed[channel]:
-                                                mod_sample_position[channel] -= sample_step_rate
-                                            else:
-                                                mod_sample_position[channel] += sample_step_rate
-                                        else:
-                                            sample_byte = 0
-
-                                        mod_channel_byte[channel] = sample_byte
-
-                                    channel_sum = 0
-                                    channel_sum_left = 0
-                                    channel_sum_right = 0
-                                    for counter, channel_byte in enumerate(mod_channel_byte):
-                                        if mod_bass_channel[counter]:
-                                            # https://dobrian.github.io/cmp/topics/filters/lowpassfilter.html
-                                            channel_byte_filtered = 0
-                                            for byte in mod_channel_byte_last[counter]:  # find the sum of x amount of previous bytes
-                                                channel_byte_filtered += byte
-                                            channel_byte = channel_byte_filtered // mod_filter_order
-                                        elif mod_filter:
-                                            channel_byte = (channel_byte + mod_channel_byte_last[counter][0]) // 2
-                                        if stereo:
-                                            channel_byte_panned = Module._get_panned_bytes(channel_byte, mod_channel_pan[counter])
-                                            channel_sum_left += channel_byte_panned[0] * 2
-                                            channel_sum_right += channel_byte_panned[1] * 2
-                                        else:
-                                            channel_sum += channel_byte
-
-                                        if not self._legacy:
-                                            if mod_using_delay_channel:
-                                                if mod_delay_counter == mod_delay_length - 1:  # i programmed this delay myself, no references!!
-                                                    mod_delay_counter = 0
-                                                else:
-                                                    if mod_delay_channel[counter]:
-                                                        mod_channel_delay_buffer[counter][mod_delay_counter] += channel_byte
-                                                    if mod_delay_channel_fast[counter]:
-                                                        delay_decay = 0.5
-                                                    else:
-                                                        delay_decay = 0.8
-                                                    mod_channel_delay_buffer[counter][mod_delay_counter] *= delay_decay
-                                                # reduce clicking
-                                                delayed_byte = 0
-                                                delay_filter_passes = 2
-                                                for delay_filter in range(0, delay_filter_passes):
-                                                    delayed_byte += mod_channel_delay_buffer[counter][mod_delay_counter - delay_filter]
-                                                delayed_byte /= delay_filter_passes
-                                                delayed_byte *= 1.2  # make the delay a smidge louder
-                                                if not mod_delay_channel_fast[channel]:
-                                                    delayed_byte *= 0.6  # reduce volume slightly for longer decays
-                                                delayed_byte = int(0 - delayed_byte)
-                                                if stereo:
-                                                    channel_sum_right += delayed_byte  # delay only appears in the right channel - this is the intended behaviour! (it's a crude way of simulating stereo depth)
-                                                else:
-                                                    channel_sum += delayed_byte
-                                                mod_delay_counter += 1
-
-                                    if stereo:
-                                        if channel_sum_left > 32767:
-                                            channel_sum_left = 32767
-                                        if channel_sum_left < -32768:
-                                            channel_sum_left = 32768
-                                        if channel_sum_right > 32767:
-                                            channel_sum_right = 32767
-                                        if channel_sum_right < -32768:
-                                            channel_sum_right = -32768
+                                        loops_string = f", Loop: {mod_current_loop + 1}/{total_nb_of_loops}"
                                     else:
-                                        if channel_sum > 32767:
-                                            channel_sum = 32767
-                                        if channel_sum < -32768:
-                                            channel_sum = 32768
-
-                                    if stereo:
-                                        channel_sum_left += 32768
-                                        channel_sum_right += 32768
-                                        channel_sum_left = (channel_sum_left + 32768) & 65535
-                                        channel_sum_right = (channel_sum_right + 32768) & 65535
-                                        channel_sum_stereo = channel_sum_left | (channel_sum_right << 16)
-                                    else:
-                                        channel_sum += 32768
-                                        channel_sum = (channel_sum + 32768) & 65535
-
-                                    if self._render_file is not None:  # if rendering a file, append sample bytes to the finished file
-                                        if stereo:
-                                            file_finished.append(channel_sum_left & 255)
-                                            file_finished.append(channel_sum_left >> 8)
-                                            file_finished.append(channel_sum_right & 255)
-                                            file_finished.append(channel_sum_right >> 8)
-                                        else:
-                                            file_finished.append(channel_sum & 255)
-                                            file_finished.append(channel_sum >> 8)
-                                    else:  # if not rendering, write to stream
-                                        if stereo:
-                                            stream.write(channel_sum_stereo.to_bytes(length=4, byteorder="little"))
-                                        else:
-                                            stream.write(channel_sum.to_bytes(length=2, byteorder="little"))
-
-                                mod_ticks_counter += 1
-                                if estimating_length:
-                                    mod_overall_length += 1
-                                else:
-                                    mod_bytes_rendered += 1
-
-                            if not mod_position_break and not mod_line_break and mod_pattern_delay_finished:
-                                mod_lines_visited.append([mod_order_position, mod_line])
-
-                            mod_looped = False  # it only makes sense to add one loop at a time... this also fixes some duplicate loop errors
-                            if mod_pattern_delay == 0:
-                                if mod_position_break:
-                                    if not mod_line_break:  # position break on its own?
-                                        mod_next_line = 0  # if so, reset to beginning of pattern
-                                        if mod_next_position == mod_order_position:  # if a position breaks to itself without a line break, that counts as a loop
-                                            mod_current_loop += 1
-                                            mod_looped = True
-                                    mod_pointer = mod_pattern_offsets[mod_order[mod_next_position]] + (mod_next_line * 4 * mod_channels)
-                                    mod_order_position = mod_next_position  # change current order
-                                    mod_line = 0  # reset line COUNTER
-                                else:
-                                    mod_line += 1
-
-                                # there's one pattern loop per channel!!
-                                any_pattern_loops = False
-                                for channel in range(0, mod_channels):
-                                    if mod_pattern_loop_start[channel] >= 0:
-                                        if mod_pattern_loop_counter[channel] > 0 and mod_line - 1 == mod_pattern_loop_end[channel]:
-                                            mod_line = mod_pattern_loop_start[channel]
-                                            mod_pointer = mod_pattern_offsets[mod_order[mod_order_position]] + (mod_line * 4 * mod_channels)
-                                            mod_pattern_loop_counter[channel] -= 1
-                                            if mod_pattern_loop_counter[channel] == 0:
-                                                mod_pattern_loop_start[channel] = -1
-                                                mod_line = mod_pattern_loop_end[channel] + 1
-                                                mod_pattern_loop_end[channel] = -1
-                                                mod_pointer = mod_pattern_offsets[mod_order[mod_order_position]] + (mod_line * 4 * mod_channels)
-                                    if mod_pattern_loop_counter[channel] > 0:
-                                        any_pattern_loops = True
-
-                                if mod_line_break:
-                                    if not mod_position_break:
-                                        if mod_song_length > 1:  # if the song is only one order long and there's a line break, stay on the same order
-                                            mod_order_position += 1
-                                            if mod_order_position > mod_song_length - 1:
-                                                mod_order_position = 0
-                                                if not mod_looped:
-                                                    mod_looped = True
-                                                    mod_current_loop += 1
-                                        if [mod_order_position, mod_next_line] in mod_lines_visited:
-                                            if not mod_looped:
-                                                mod_looped = True
-                                                mod_current_loop += 1
-                                    mod_line = mod_next_line
-                                    mod_pointer = mod_pattern_offsets[mod_order[mod_order_position]] + (mod_next_line * 4 * mod_channels)
-
-                                if (mod_position_break or mod_line_break) and not any_pattern_loops:
-                                    if [mod_order_position, mod_line] in mod_jumps:  # has this specific line and order been visited before?
-                                        if not mod_looped:
-                                            mod_looped = True
-                                            mod_current_loop += 1
-                                        mod_jumps = [[mod_order_position, mod_line]]  # fixes "delayskip.mod" - probably not correct, but it works
-                                        mod_orders_visited.clear()
-                                    else:
-                                        if mod_order_position in mod_orders_visited:  # has this order been visited before? (used for position jumps determining the loop point)
-                                            if not mod_looped:
-                                                mod_looped = True
-                                                mod_current_loop += 1
-                                            mod_orders_visited.clear()
-                                        mod_jumps.append([mod_order_position, mod_line])
-
-                                mod_position_break = False
-                                mod_line_break = False
-
-                                if mod_current_loop > total_nb_of_loops - 1:
-                                    mod_order_position = mod_song_length  # end
-                                    mod_line = mod_lines
-
-                            if mod_pattern_delay > 0:
-                                mod_pattern_delay_finished = False
-                                mod_pattern_delay -= 1
-                            else:
-                                mod_pattern_delay_finished = True
-
-                        mod_orders_visited.append(mod_order_position)  # this is only executed if the END of a pattern is reached with no breaks!!
-                        if not mod_line_break:  # position breaks reset the line anyway
-                            mod_line = 0
-                        if mod_song_length > 1:
-                            mod_order_position += 1
-                            if mod_order_position == mod_song_length:  # reached the very last order?
-                                mod_order_position = 0
-                                mod_pointer = mod_pattern_offsets[mod_order[0]]
-                                mod_line = 0
-                                if not mod_looped:
-                                    mod_looped = True
-                                    mod_current_loop += 1
-                                    mod_jumps.clear()
-                                    mod_orders_visited.clear()
-                        else:
-                            if not mod_looped:
-                                mod_looped = True
-                                mod_current_loop += 1
-                        if mod_current_loop > total_nb_of_loops - 1:  # copypasta SSSSHHHHH (but this is for when the pattern ends, not per line... so if you're line breaking/position breaking this won't be reached)
-                            mod_order_position = mod_song_length  # end
-                            mod_line = mod_lines
-                        mod_pointer = mod_pattern_offsets[mod_order[mod_order_position]]
-
-                    if (self._render_file is not None and not while_condition) or (self._render_file is not None and self._render_channels) and not estimating_length:
-                        if self._render_channels:
-                            dir_name = os.path.dirname(self._render_file)
-                            if dir_name != "":
-                                dir_name += "/"
-                            base_name = os.path.splitext(os.path.basename(self._render_file))[0][:-2]  # file name, minus the _1
-                            file_name = f"{dir_name}{base_name}_{channel_current + 1}.wav"
-                        else:
-                            file_name = self._render_file
-                        with wave.open(file_name, "wb") as wave_file:
+                                        loops_string = ""
+                                    print(f"Time elapsed: {time_elapsed_string}, Tempo: {player.mod_tempo}, Ticks/Line: {player.mod_ticks}, BPM: {'%g' % player.mod_bpm}, Order {mod_order_position}/{mod_song_length - 1}, Pattern {mod_order[mod_order_position]}, Line {(mod_line + 1)}{loops_string}        ", end="\r")
+
+                        player.mix_line()
+                        if skip_frames > 0:
+                            player.set_output(output)
+                            skip_frames = 0
+                        if not rendering:
+                            self._mod_stream_render(sink, file_finished, len(file_finished) * file_finished.itemsize)  # (pyaudio's sink waits if it's far enough ahead already)
+                        player.advance_line()
+                        if self._resume and self._render_file is not None and time.perf_counter() - resume_saved_time >= self._resume_interval:
+                            part_length = self._mod_save_resume(resume_settings, player, skip_frames, file_finished, part_length, streamed_length)
+                            resume_saved_time = time.perf_counter()
+                        if rendering and sink is not None and len(file_finished) * file_finished.itemsize >= stream_block_size:
+                            # everything up to the end of the song can go (but if the render's resumable, only what's been saved to the .part file)
+                            stream_length = min(len(file_finished) * file_finished.itemsize, (mod_overall_length * frame_size) - streamed_length)
+                            if self._resume:
+                                stream_length = min(stream_length, part_length - streamed_length)
+                            streamed_length += self._mod_stream_render(sink, file_finished, stream_length)
+
+                    if rendering:
+                        del file_finished[((mod_overall_length * frame_size) - streamed_length) // file_finished.itemsize:]  # the last line can go past the end
+
+                    if rendering and sink is not None:
+                        self._mod_stream_render(sink, file_finished, len(file_finished) * file_finished.itemsize)
+                        sink.close()
+                        if self._resume:
+                            self._mod_remove_resume()
+                    elif rendering:
+                        with wave.open(self._render_file, "wb") as wave_file:
                             if stereo:
                                 wave_file.setnchannels(2)
                             else:
                                 wave_file.setnchannels(1)
                             wave_file.setsampwidth(2)
                             wave_file.setframerate(self._sample_rate)
-                            wave_file.writeframesraw(bytearray(file_finished))
-                        file_finished.clear()
-                        channel_current += 1
-
-                    if estimating_length:
-                        estimating_length = False
-                        start_time = time.perf_counter()
-                        estimated_length = mod_overall_length / self._sample_rate
-                        estimated_length_minutes = estimated_length // 60
-                        estimated_length_seconds = estimated_length % 60
-                        if self._play_mode == "info":
-                            while_condition = False
-                        self._sample_rate = sample_rate_temp
-                        mod_ms_per_tick = self._mod_get_tempo_length(mod_tempo)
-
-                if self._render_file is not None:
+                            if sys.byteorder == "big":  # wav files are always little endian
+                                file_finished.byteswap()
+                            wave_file.writeframesraw(file_finished)  # (it's written straight from the array, without copying it)
+                        if self._resume:
+                            self._mod_remove_resume()
+
+                if rendering:
                     end_time = time.perf_counter() - start_time
                     minutes = int(end_time / 60)
                     seconds = end_time % 60
@@ -1738,12 +795,10 @@ class Module:
                         print(stringy)
                 else:
                     if self._play_mode != "info":
+                        sink.close()  # (once everything's been played)
                         if not self._quiet:
                             print()
                             print("Done!")
-                        stream.stop_stream()
-                        stream.close()
-                        pya.terminate()
 
             if self._play_mode == "info":
                 print("Module:             ")
@@ -1754,20 +809,158 @@ class Module:
                     order_string += "s"
                 print(f"\tLength: {order_string}")
                 print(f"\tChannels: {mod_channels} - {mod_type_string}")
-                print(f"\tEstimated length: {int(estimated_length_minutes)}m {int(estimated_length_seconds)}s")
+                print(f"\tDuration: {int(estimated_length_minutes)}m {estimated_length_seconds:.3f}s ({timeline.length_ms():.0f} ms)")
                 print("Samples:")
                 for sample in mod_unique_samples:
                     looping_string = ""
-                    if sample[1]["loop_length"] == 2 and sample[1]["loop_start"] == 0:
+                    if sample[1].loop_length == 2 and sample[1].loop_start == 0:
                         looping_string = "no loop"
                     else:
-                        looping_string = f"Loop start: {sample[1]['loop_start']}, Loop length: {sample[1]['loop_length']}"
-                    finetune = sample[1]["finetune"]
+                        looping_string = f"Loop start: {sample[1].loop_start}, Loop length: {sample[1].loop_length}"
+                    finetune = sample[1].finetune
                     if finetune > 7:
                         finetune = finetune - 16
                     sample_number = str(sample[0] + 1).rjust(2, " ")
-                    print(f"\t{sample_number}. {sample[1]['name']}")
-                    print(f"\t\tLength: {sample[1]['length']}, {looping_string}, Finetune: {finetune}, Volume: {sample[1]['volume']}")
+                    print(f"\t{sample_number}. {sample[1].name}")
+                    print(f"\t\tLength: {sample[1].length}, {looping_string}, Finetune: {finetune}, Volume: {sample[1].volume}")
+
+    def _mod_get_error(self, mod_data):
+        """Returns what's wrong with the module or the settings (as a message), or None if it can be played."""
+
+        sample_rate_minimum = 1000
+
+        if mod_data.channels == 0:
+            return "Invalid module!"
+        elif self._sample_rate < sample_rate_minimum or self._sample_rate > 380000:
+            return f"Sample rate must be between {sample_rate_minimum} and 380000!"
+        elif self._play_mode not in Module.play_modes():
+            return f"Invalid play mode: {self._play_mode}. Accepted modes: {', '.join(Module.play_modes())}"
+        elif self._buffer_size < 0 or self._buffer_size > 8192:
+            return "Buffer size must be between 0 and 8192!"
+        elif self._engine not in Module.engines():
+            return f"Invalid engine: {self._engine}. Accepted engines: {', '.join(Module.engines())}"
+        elif self._engine in ("numpy", "paula") and importlib.util.find_spec("numpy") is None:  # (without importing it, which takes a while)
+            return f"The {self._engine} engine needs NumPy to be installed!"
+        elif self._interpolation not in Module.interpolations():
+            return f"Invalid interpolation: {self._interpolation}. Accepted interpolations: {', '.join(Module.interpolations())}"
+        elif self._filter_model not in Module.filter_models():
+            return f"Invalid filter model: {self._filter_model}. Accepted models: {', '.join(Module.filter_models())}"
+        elif self._legacy and (mod_data.type != "M.K." and mod_data.type != "M!K!"):
+            return "Only 4 channel modules can be used in legacy mode!"
+        return None
+
+    def _mod_get_render_error(self):
+        # what's wrong with where the render's going, if anything
+        if self._render_file is not None and self._render_channels and not self._render_file.endswith("_1.wav"):
+            return "File name is suffixed incorrectly for channel rendering!"
+        elif self._render_file is not None and os.path.splitext(self._render_file)[-1].lower() != ".wav":
+            return "Output must be a .wav file!"
+        elif self._render_sink is not None and (self._render_channels or self._resume):
+            return "Only renders to .wav files can have their channels rendered separately, or be resumed!"
+        elif self._render_file is None and self._render_channels:
+            return "The --channels/-c option can only be used alongside the --render/-r option!"
+        return None
+
+    def _mod_get_stem_file_names(self, channels):
+        # file_1.wav, file_2.wav and so on, one for each channel
+        dir_name = os.path.dirname(self._render_file)
+        if dir_name != "":
+            dir_name += "/"
+        base_name = os.path.splitext(os.path.basename(self._render_file))[0][:-2]  # file name, minus the _1
+        return [f"{dir_name}{base_name}_{channel + 1}.wav" for channel in range(0, channels)]
+
+    def _mod_get_settings(self, loops):
+        # everything that changes what a playthrough sounds like
+        return (self._sample_rate, self._play_mode, self._legacy, self._amplify, self._interpolate, self._interpolation, self._engine == "paula", self._filter_model, self._mod_position_start, self._nb_of_patterns_to_play, self._mod_tempo, self._mod_ticks, loops)
+
+    def _mod_save_resume(self, settings, player, skip_frames, file_finished, part_length, streamed_length):
+        """Saves everything needed to carry on rendering: the audio rendered so far is added to the .part file, then the
+        state of the player goes in the .resume file. Returns the new length of the .part file. When streaming, the
+        first streamed_length bytes have already been taken out of file_finished (but they're always in the .part
+        file already)."""
+
+        file_bytes = memoryview(file_finished).cast("B")
+        with open(self._render_file + ".part", "ab") as part_file:
+            part_file.write(file_bytes[part_length - streamed_length:])
+        resume_state = {
+            "settings": settings,
+            "player": player.snapshot(),
+            "skip_frames": skip_frames,
+            "part_length": streamed_length + len(file_bytes)
+        }
+        with open(self._render_file + ".resume.tmp", "wb") as resume_file:
+            pickle.dump(resume_state, resume_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(self._render_file + ".resume.tmp", self._render_file + ".resume")  # so an interruption while saving leaves the last one intact
+        return streamed_length + len(file_bytes)
+
+    def _mod_stream_render(self, sink, file_finished, length):
+        """Hands the first length bytes of file_finished over to the sink, taking them out of file_finished. Returns how
+        many bytes were handed over."""
+
+        values = length // file_finished.itemsize
+        if values > 0:
+            sink.write(file_finished[:values])  # (a copy, so the sink can keep it)
+            del file_finished[:values]
+        return values * file_finished.itemsize
+
+    def _mod_load_resume(self, settings):
+        """Returns the state saved by _mod_save_resume() (with the audio as "part"), or None if there isn't one for these settings."""
+
+        try:
+            with open(self._render_file + ".resume", "rb") as resume_file:
+                resume_state = pickle.load(resume_file)
+            with open(self._render_file + ".part", "rb") as part_file:
+                part = part_file.read()
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if resume_state["settings"] != settings or len(part) < resume_state["part_length"]:
+            return None
+        resume_state["part"] = part[:resume_state["part_length"]]
+        with open(self._render_file + ".part", "r+b") as part_file:
+            part_file.truncate(resume_state["part_length"])  # anything after that was rendered after the last save, and will be rendered again
+        return resume_state
+
+    def _mod_remove_resume(self):
+        for extension in (".resume", ".part"):
+            if os.path.exists(self._render_file + extension):
+                os.remove(self._render_file + extension)
+
+    def _mod_seek(self, player, timeline, frame):
+        """Gets a new player to the line playing at the given frame, by restoring the closest checkpoint before it and
+        fast-forwarding from there (taking more checkpoints on the way). Returns how far into the line the frame is."""
+
+        line = timeline.find_line(frame)
+        settings = self._mod_get_settings(player.total_nb_of_loops) + (player._stems,)
+        if settings not in self._checkpoints:
+            self._checkpoints = {settings: {}}  # the settings have changed, so the old ones go (otherwise they'd pile up for as long as the module's kept)
+        checkpoints = self._checkpoints[settings]
+        if 0 not in checkpoints:
+            checkpoints[0] = player.snapshot()  # the very beginning, so the random waveforms come out the same wherever playback starts
+        player.restore(checkpoints[max(a for a in checkpoints if a <= line)])
+
+        output = player._output
+        player.set_output(None)
+        while player.lines_played < line:
+            player.next_line()
+            player.parse_line()
+            player.mix_line()
+            player.advance_line()
+            if player.lines_played % self._checkpoint_interval == 0 and player.lines_played not in checkpoints:
+                checkpoints[player.lines_played] = player.snapshot()
+        player.set_output(output)
+        return frame - timeline.frames[line]
+
+    def _mod_get_timeline(self, mod_data, loops):
+        player = _Player(self, mod_data, SampleOverlay(mod_data.data), loops=loops, sequence_only=True)
+        timeline = Timeline(self._sample_rate)
+        while player.next_line():
+            mod_order_position = player.mod_order_position  # where the line is, before parsing it moves anything
+            mod_line = player.mod_line
+            mod_current_loop = player.mod_current_loop
+            player.parse_line()
+            timeline.add_line(mod_order_position, player.mod_order[mod_order_position], mod_line, mod_current_loop, player.mod_tempo, player.mod_ticks, player.mod_ms_per_tick)
+            player.advance_line()
+        return timeline
 
     def set_sample_rate(self, rate):
         self._sample_rate = rate
@@ -1784,6 +977,12 @@ class Module:
     def set_buffer_size(self, size):
         self._buffer_size = size
 
+    def set_preroll(self, seconds):
+        """Sets how much is mixed before realtime playback starts. The mixing can fall behind by up to this much (on a
+        busy part of a module) without the audio stuttering."""
+
+        self._preroll = seconds
+
     def set_quiet(self, flag):
         self._quiet = flag
 
@@ -1796,16 +995,1735 @@ class Module:
     def set_interpolate(self, flag):
         self._interpolate = flag
 
+    def set_interpolation(self, kind):
+        """Sets the kind of interpolation used when it's turned on: "linear" (the default), "cubic" or "sinc". Cubic and
+        sinc use more of the bytes around each position, so they sound cleaner at lower sample rates."""
+
+        self._interpolation = kind
+
+    def set_filter_model(self, model):
+        """Sets how the filter's simulated (the *_filter play modes, and E0x): "simple" (the default) averages each
+        channel's bytes with the last ones, and "a500" and "a1200" are models of the filters in those Amigas, with
+        the "led" filter turned on and off by E0x."""
+
+        self._filter_model = model
+
     def set_start_pos(self, position):
         self._mod_position_start = position
 
     def set_nb_of_patterns(self, nb_of_patterns):
         self._nb_of_patterns_to_play = nb_of_patterns
 
-    def play(self):
-        self._run()
+    def set_engine(self, engine):
+        """Sets what mixes the audio: "python" mixes one frame at a time, "numpy" mixes everything in between ticks in
+        blocks using NumPy (which is a lot quicker, and sounds exactly the same)."""
+
+        self._engine = engine
+
+    def set_checkpoint_interval(self, lines):
+        self._checkpoint_interval = lines
+
+    def seek(self, seconds):
+        """Sets the time that playback and rendering start from, in seconds (counting from the start position)."""
 
-    def render_to(self, filepath, separate_channels=False):
-        self._render_file = filepath
+        self._seek_time = seconds
+
+    def play(self, sink=None):
+        """Plays the module in realtime, through pyaudio unless there's another sink to play it to (see sinks.py)."""
+
+        self._play_sink = sink
+        try:
+            self._run(self._seek_time)
+        finally:  # (even if playback's interrupted, so the next one doesn't use the same sink)
+            self._play_sink = None
+
+    def set_resume_interval(self, seconds):
+        self._resume_interval = seconds
+
+    def render_to(self, filepath, separate_channels=False, resume=False, stream=False):
+        """If resume is true, the render is saved every so often (as filepath.resume and filepath.part), and if it's
+        interrupted, rendering the same file again with resume picks up where it left off. If stream is true, the
+        file's written a block at a time while rendering (by another thread), so only a few seconds of audio are ever
+        kept in memory, however long the song is. Instead of a file path, this can also be a sink (see sinks.py), which
+        gets the audio as it's rendered."""
+
+        self._set_render_target(filepath)
+        self._render_channels = separate_channels
+        self._resume = resume
+        self._stream = stream
+        try:
+            self._run(self._seek_time)
+        finally:  # (even if the render's interrupted, so the next one doesn't carry on resuming or streaming)
+            self._resume = False
+            self._stream = False
+            self._render_sink = None
+
+    def render_range(self, filepath, start, end, separate_channels=False):
+        """Renders the part of the song between start and end (in seconds), to a file path or a sink."""
+
+        self._set_render_target(filepath)
         self._render_channels = separate_channels
-        self._run()
+        try:
+            self._run(start, end)
+        finally:
+            self._render_sink = None
+
+    def iter_blocks(self, block_frames=None, sample_format="int16", planar=False):
+        """Renders the module a block at a time as it's iterated over, for programs that want to ask for the audio
+        themselves (like a game, or something that sends it somewhere), instead of it being played or written to a
+        file. Each block is block_frames frames long (the buffer size, by default), apart from the last one, which is
+        whatever's left at the end of the song. Nothing's mixed until the next block's asked for, and only about a
+        line's worth of audio is kept at any time.
+
+        sample_format is "int16" (an array("h")) or "float32" (an array("f") between -1 and 1). The frames are
+        interleaved (left, right, left, right... in the stereo modes), or if planar is true, each block is a tuple with
+        an array for each output instead. It starts from wherever seek() has been set to. If any of the settings aren't
+        valid, the error's printed and nothing's yielded."""
+
+        if self._data is None:
+            self._data = ModuleData.from_file(self._input_file)
+        mod_data = self._data
+        if block_frames is None:
+            block_frames = self._buffer_size
+
+        error = self._mod_get_error(mod_data)
+        if error is None:
+            if self._play_mode in ("info", "text"):
+                error = f"The {self._play_mode} play mode doesn't have any audio to iterate over!"
+            elif block_frames < 1:
+                error = "Blocks must be at least 1 frame long!"
+            elif sample_format not in Module.sample_formats():
+                error = f"Invalid sample format: {sample_format}. Accepted formats: {', '.join(Module.sample_formats())}"
+        if error is not None:
+            print(f"Error: {error}")
+            return
+
+        outputs = 1
+        if self._play_mode.startswith("stereo"):
+            outputs = 2
+        timeline = self._mod_get_timeline(mod_data, self._loops)
+        frame_start = min(max(timeline.ms_to_frame(self._seek_time * 1000), 0), timeline.length)
+        values_left = (timeline.length - frame_start) * outputs  # the last line can go past the end of the song, so that part's left out
+        block_values = block_frames * outputs
+
+        rendered = array("H")  # only what's been mixed but not yielded yet
+        player = _Player(self, mod_data, SampleOverlay(mod_data.data), rendered, self._loops)
+        skip_frames = 0
+        if frame_start > 0:
+            skip_frames = self._mod_seek(player, timeline, frame_start)
+        if skip_frames > 0:
+            player.set_output(_SkipFrames(rendered, skip_frames * outputs * 2))
+
+        while values_left > 0 and player.next_line():
+            player.parse_line()
+            player.mix_line()
+            if skip_frames > 0:
+                player.set_output(rendered)
+                skip_frames = 0
+            player.advance_line()
+
+            # every whole block there is goes out, and the rest waits for the next line
+            position = 0
+            while position + block_values <= min(len(rendered), values_left):
+                yield Module._mod_convert_block(rendered, position, position + block_values, sample_format, planar, outputs)
+                position += block_values
+            del rendered[:position]
+            values_left -= position
+
+        if values_left > 0 and len(rendered) > 0:
+            yield Module._mod_convert_block(rendered, 0, min(len(rendered), values_left), sample_format, planar, outputs)
+
+    async def aiter_blocks(self, block_frames=None, sample_format="int16", planar=False, executor=None):
+        """The same as iter_blocks(), but for asyncio (async for block in module.aiter_blocks(...)). Each block's mixed
+        in an executor (the event loop's default one, unless there's another one to use), so the event loop carries on
+        while it's being mixed, and the next block isn't mixed until it's asked for, so a slow consumer never has a
+        pile of blocks waiting for it. Lots of these can share one event loop, as they only take up a worker while
+        they're mixing a block. If the task's cancelled, the block being mixed is thrown away once it's finished."""
+
+        import asyncio  # only imported when it's needed, as it takes a while
+
+        loop = asyncio.get_running_loop()
+        blocks = self.iter_blocks(block_frames, sample_format, planar)
+        block_future = None
+        try:
+            while True:
+                block_future = loop.run_in_executor(executor, next, blocks, None)
+                block = await asyncio.shield(block_future)  # (if this is cancelled, the mixing still has to finish before the generator can be closed)
+                if block is None:
+                    break
+                yield block
+        finally:
+            if block_future is not None and not block_future.done():
+                block_future.add_done_callback(lambda future: blocks.close())
+            else:
+                blocks.close()
+
+    @classmethod
+    def _mod_convert_block(cls, rendered, start, end, sample_format, planar, outputs):
+        # the player's output is unsigned, but it's the same bits as the signed values, so they're copied straight across
+        block = array("h")
+        with memoryview(rendered) as view:
+            block.frombytes(view.cast("B")[start * 2:end * 2])
+        if sample_format == "float32":
+            block = array("f", [value / 32768 for value in block])
+        if planar:
+            return tuple(block[output::outputs] for output in range(0, outputs))
+        return block
+
+    def _set_render_target(self, filepath):
+        if hasattr(filepath, "write"):  # a sink
+            self._render_file = None
+            self._render_sink = filepath
+        else:
+            self._render_file = filepath
+            self._render_sink = None
+
+    def get_timeline(self):
+        """Returns the Timeline of the song (at the current sample rate, and for the current number of loops) without playing or rendering anything, or None if the module isn't valid."""
+
+        if self._data is None:
+            self._data = ModuleData.from_file(self._input_file)
+        if self._data.channels == 0:
+            print("Error: Invalid module!")
+            return None
+        return self._mod_get_timeline(self._data, self._loops)
+
+
+class _SkipFrames:
+    """Passes a player's output on, apart from the first few bytes."""
+
+    def __init__(self, output, skip):
+        self._output = output
+        self._skip = skip
+
+    def append(self, value):  # one 16-bit value at a time
+        if self._skip > 0:
+            self._skip -= 2
+        else:
+            self._output.append(value)
+
+    def frombytes(self, data):  # a block at a time with the numpy engine
+        if self._skip < len(data):
+            self._output.frombytes(data[self._skip:])
+        self._skip = max(self._skip - len(data), 0)
+
+
+class _StemSink:
+    """Splits up a render with every channel in it (each frame being every channel's frame, one after the other) and
+    passes each channel on to its own sink."""
+
+    def __init__(self, sinks):
+        self._sinks = sinks
+        self._format = "H"
+
+    def open(self, channels, sample_rate):
+        outputs = channels // len(self._sinks)
+        self._format = "I" if outputs == 2 else "H"  # a whole frame at a time, so stereo frames stay together
+        for sink in self._sinks:
+            sink.open(outputs, sample_rate)
+
+    def write(self, data):
+        frames = memoryview(data).cast("B").cast(self._format)
+        for channel, sink in enumerate(self._sinks):
+            stem = array("H")
+            stem.frombytes(frames[channel::len(self._sinks)].tobytes())
+            sink.write(stem)
+
+    def close(self):
+        for sink in self._sinks:
+            sink.close()
+
+
+class _Player:
+    """A single playthrough of a module, one line at a time. Everything that changes while a module plays (the position
+    in the song, and the state of every channel) lives here, so it can be stepped through without mixing any audio."""
+
+    # these never change during a playthrough (or can't be copied), so they're left out of snapshots. The settings taken
+    # from the module are too, so a snapshot taken while rendering (say) can be picked up by a player that's playing
+    _shared_attributes = ("_sample_rate", "_play_mode", "_verbose", "_legacy", "_amplify", "_interpolate", "_interpolation", "_rendering", "_mod_position_start", "_nb_of_patterns_to_play", "_mod_tempo", "_mod_ticks", "_engine", "_stems", "_sequence_only", "_output", "mod_sample_overlay", "mod_file", "mod_samples", "mod_order", "mod_periods", "mod_sample_numbers", "mod_effects", "mod_params", "mod_empty_rows", "mod_note_names", "_block_mixer", "_kernel")
+
+    def __init__(self, module, data, sample_overlay, output=None, loops=1, stems=False, sequence_only=False):
+        # settings taken from the module, so changing them halfway through doesn't affect this playthrough
+        self._sample_rate = module._sample_rate
+        self._play_mode = module._play_mode
+        self._verbose = module._verbose
+        self._legacy = module._legacy
+        self._amplify = module._amplify
+        self._interpolate = module._interpolate
+        self._interpolation = module._interpolation
+        self._rendering = module._render_file is not None or module._render_sink is not None
+        self._mod_position_start = module._mod_position_start
+        self._nb_of_patterns_to_play = module._nb_of_patterns_to_play
+        self._mod_tempo = module._mod_tempo
+        self._mod_ticks = module._mod_ticks
+        self._engine = module._engine
+
+        self._output = output  # an array of 16-bit values (rendered, or played a line at a time)
+        self._stems = stems  # if true, every channel's written to the output separately (one after the other in each frame) instead of being mixed together
+        self._sequence_only = sequence_only  # if true, only what's needed to follow the song is processed, and no audio is mixed
+
+        self.stereo = self._play_mode.startswith("stereo")
+        self.total_nb_of_loops = loops
+        self._random = random.Random()  # for the random waveforms: it starts off the same as the random module (so random.seed() makes them repeatable), but never changes it
+        self._random.setstate(random.getstate())
+        self.mod_lines = ModuleData.lines
+        self.mod_channels = data.channels
+        self.mod_samples = data.samples
+        self.mod_song_length = data.song_length
+        self.mod_order = data.order
+        self.mod_periods = data.periods
+        self.mod_sample_numbers = data.sample_numbers
+        self.mod_effects = data.effects
+        self.mod_params = data.params
+        self.mod_empty_rows = data.empty_rows
+        self.mod_sample_overlay = sample_overlay
+        if sample_overlay.changed:  # samples have been inverted by an earlier playthrough (e.g. the previous channel)
+            self.mod_file = sample_overlay
+        else:
+            self.mod_file = sample_overlay.data
+        if self._legacy:
+            self.mod_note_names = Module._mod_legacy_note_names
+        else:
+            self.mod_note_names = Module._mod_extended_note_names
+        self._kernel = None  # linear interpolation is done without one
+        if self._interpolation != "linear":
+            self._kernel = get_kernel(self._interpolation)
+        self._paula = self._engine == "paula"  # fixed point positions and integer volumes, like the amiga
+        self._paula_gain = paula_gain(self._amplify, self.mod_channels)
+        self._block_mixer = None
+        if self._engine == "numpy" and not sequence_only:
+            from .blockmixer import BlockMixer  # numpy's only imported when one of its engines is used, so starting up stays quick
+
+            self._block_mixer = BlockMixer(self)  # mixes everything in between ticks
+        elif self._paula and not sequence_only:
+            from .blockmixer import PaulaMixer
+
+            self._block_mixer = PaulaMixer(self)
+
+        mod_channels = self.mod_channels
+        mod_lines = self.mod_lines
+        mod_song_length = self.mod_song_length
+        mod_order = self.mod_order
+
+        self.mod_filter = self._play_mode.endswith("filter")  # a <crude> "simulation" of the amiga hardware filter (it's a simple one pole low-pass filter - literally just finding the difference between the current and last byte)
+        self.mod_filter_flag = self.mod_filter  # unlike mod_filter, this can't be changed
+        self._amiga_filter = None  # used instead of the simple filter, if there's a model of the amiga's filters to use
+        if module._filter_model != "simple":
+            self._amiga_filter = AmigaFilter(module._filter_model, self._sample_rate, (2 if self.stereo else 1) * (mod_channels if stems else 1))  # (every channel's filtered separately when they're all written separately)
+        if self._legacy:
+            self.mod_period_amount = len(Module._mod_legacy_periods[0])
+        else:
+            self.mod_period_amount = len(Module._mod_extended_periods[0])
+
+        self.mod_channel_byte = [0] * mod_channels  # the current byte in each channel, summed together later on
+        self.mod_filter_order_base = 64  # the desired order at 44100hz (trying to keep the value somewhat low so it renders/plays faster)
+        self.mod_filter_order = int((self.mod_filter_order_base / 44100) * self._sample_rate)
+        self.mod_delay_length_base = 2000  # the desired delay length at 44100hz
+        self.mod_delay_length = int((self.mod_delay_length_base / 44100) * self._sample_rate)
+        self.mod_delay_counter = 0
+        self.mod_channel_delay_buffer = []
+        mod_bass_history_temp = []
+        mod_channel_delay_buffer_temp = []
+        for a in range(0, self.mod_filter_order):
+            mod_bass_history_temp.append(0)
+        for a in range(0, self.mod_delay_length):
+            mod_channel_delay_buffer_temp.append(0)
+        self.mod_channel_byte_last = [0] * mod_channels  # the byte before the current one, for the filter
+        self.mod_bass_history = []  # the last few bytes of each channel for the bass filter, going round in a circle (the oldest byte is at mod_bass_position, and gets replaced by the next one)
+        self.mod_bass_sum = [0] * mod_channels  # the sum of each channel's bass history, kept up to date as bytes come and go so it never has to be added up
+        self.mod_bass_position = 0
+        self.mod_channel_pan = [0] * mod_channels  # -1 = left, 0 = centre, 1 = right
+        for a in range(0, mod_channels):
+            self.mod_bass_history.append(mod_bass_history_temp.copy())
+            self.mod_channel_delay_buffer.append(mod_channel_delay_buffer_temp.copy())
+            if self._play_mode.startswith("stereo_soft"):
+                if a % 4 == 1 or a % 4 == 2:
+                    self.mod_channel_pan[a] = 0.5
+                else:
+                    self.mod_channel_pan[a] = -0.5
+            else:
+                if a % 4 == 1 or a % 4 == 2:
+                    self.mod_channel_pan[a] = 1
+                else:
+                    self.mod_channel_pan[a] = -1
+        self.mod_channel_gain = [Module._get_pan_gains(pan, self.stereo) for pan in self.mod_channel_pan]  # only worked out again when the panning changes
+        self.mod_voices = list(range(0, mod_channels))  # the channels the mixer has to go through this tick (worked out again every tick by _schedule_voices())
+        self.mod_mixdown_channels = list(range(0, mod_channels))  # the channels that could be heard this tick
+        self.mod_delay_silent = [False] * mod_channels  # channels with the delay off whose buffers have completely died away
+        self.mod_sample_offset = [0] * mod_channels
+        self.mod_sample_position = [0] * mod_channels
+        self.mod_sample_number = [0] * mod_channels  # actually contains the number of the currently playing sample, even if none is specified!
+        self.mod_sample_playing = [False] * mod_channels
+        self.mod_sample_volume = [0] * mod_channels
+
+        self.mod_period = [0] * mod_channels
+        self.mod_next_period = [0] * mod_channels  # used for protracker's note delay behaviour with looped samples (this will contain the actual current period, but it won't play it until the note delay is reached)
+        self.mod_raw_period = [0] * mod_channels
+        self.mod_raw_period_inc_delay = [0] * mod_channels  # raw period + pattern delay (so when a pattern is being delayed, there's still a period number in this variable... mod_raw_period would contain 0 in this case)
+        self.mod_frequency = [0] * mod_channels
+        self.mod_effect_number = [0] * mod_channels
+        self.mod_effect_param = [0] * mod_channels
+        self.mod_volslide_amount = [0] * mod_channels
+        self.mod_volslide_fine = [False] * mod_channels  # if true, the volume is slid on the first tick ONLY
+        self.mod_port_fine = [False] * mod_channels  # same but for fine pitch slides
+        self.mod_note_cut_ticks = [-1] * mod_channels  # counts down, when it reaches 0, the note is cut. -1 means no cut, -2 means the note is ignored
+        self.mod_note_delay_ticks = [-1] * mod_channels  # counts down, when it reaches 0, the note is played. -1 means no delay
+        self.mod_port_amount = [0] * mod_channels
+        self.mod_tone_period = [0] * mod_channels  # the period we're sliding from
+        self.mod_tone_sliding = [False] * mod_channels
+        self.mod_arp_counter = [0] * mod_channels
+        self.mod_arp_periods = []
+        for a in range(0, mod_channels):
+            self.mod_arp_periods.append([0, 0, 0].copy())
+        self.mod_arp_period = [0] * mod_channels
+        self.mod_vibrato = [False] * mod_channels
+        self.mod_vibrato_counter = [0] * mod_channels
+        self.mod_vibrato_offset = [0] * mod_channels  # offsets the period value without actually changing it
+        self.mod_vibrato_wave = [0] * mod_channels
+        self.mod_vibrato_retrigger = [True] * mod_channels  # if true, the vibrato counter is reset as usual
+        self.mod_tremolo = [False] * mod_channels
+        self.mod_tremolo_counter = [0] * mod_channels
+        self.mod_tremolo_offset = [0] * mod_channels
+        self.mod_tremolo_wave = [0] * mod_channels
+        self.mod_tremolo_retrigger = [True] * mod_channels
+        self.mod_retrig_speed = [0] * mod_channels
+        self.mod_invert_loop_counter = [0] * mod_channels  # 0  =  no inversion
+        self.mod_invert_loop_position = [0] * mod_channels
+        self.mod_invert_loop_speed = [0] * mod_channels
+        self.mod_finetune_temp = [0] * mod_channels  # for the "set finetune" effect, which doesn't directly affect the sample. if there's no effect, this'll contain the default finetune, otherwise, it'll be overridden. this is used when finding the frequency based on the period values, so it's actually very important!
+        self.mod_glissando = [False] * mod_channels
+        self.mod_bass_channel = [False] * mod_channels  # pymod exclusive feature: use the effect e02 on a channel with bass sounds on it (e.g. bass drums or sub basses) to remove the ringing :D (e03 turns the bass filter off)
+        self.mod_delay_channel = [False] * mod_channels  # pymod exclusive feature: use the effect e04 or e05 on a channel to add a crude reverb simulation! (e06 turns it off)
+        self.mod_sample_reversed = [False] * mod_channels  # pymod exclusive feature: use the effect e07 to play a sample in reverse (or e08 to play it forwards again)
+        self.mod_sample_reversed_flag = [False] * mod_channels
+        self.mod_delay_channel_fast = [False] * mod_channels
+        if self._interpolate:
+            self.mod_interpolate_channel = [True] * mod_channels
+        else:
+            self.mod_interpolate_channel = [False] * mod_channels  # pymod exclusive feature: use the effect e09 to turn on interpolation for a channel, and e0a to turn it off
+
+        self.mod_loop_play_full = [False] * mod_channels  # if this is false, the sample's loop will play as expected. if the sample is looping but the loop starts at 0, this will be true, meaning the whole sample will have to play through before looping
+        self.mod_sample_number_cued = [0] * mod_channels  # the next sample to be played once a loop's finished, if another sample number is specified (if a sample is just being played normally from the start, this should match mod_sample_number!)
+        self.mod_offset_flag = [False] * mod_channels
+        self.mod_offset_delay_flag = [False] * mod_channels
+
+        self.mod_tone_memory = [0] * mod_channels
+        self.mod_offset_memory = [0] * mod_channels
+        self.mod_vibrato_memory = [0] * mod_channels
+        self.mod_tremolo_memory = [0] * mod_channels
+
+        self.mod_pattern_loop_start = [-1] * mod_channels  # -1 if there's no loop right now
+        self.mod_pattern_loop_end = [-1] * mod_channels
+        self.mod_pattern_loop_counter = [0] * mod_channels  # counts down on every loop
+        self.mod_pattern_delay = 0  # if 0, there's no delay. if above 0, it counts down. the pattern only plays if this is 0 and mod_pattern_delay_finished is true
+        self.mod_pattern_delay_finished = True  # if this is false, it waits until the next line to stop advancing the mod pointer (without this flag, it would hang on whatever channel the effect was encountered on)
+        self.mod_pattern_delay_encountered = False  # is there a pattern delay effect on the current line?
+
+        self.mod_next_position = 0
+        self.mod_next_line = 0
+        self.mod_next_line_offset = False  # in protracker, using a pattern delay alongside a line break adds 1 to the line... for some reason
+        self.mod_position_break = False
+        self.mod_line_break = False
+
+        self.mod_order_position = self._mod_position_start
+        if self.mod_order_position < mod_song_length:
+            self.mod_row = mod_order[self.mod_order_position] * mod_lines  # the current line, counting from the first line of the first pattern
+        else:
+            # start position is past the last position so we just set the position to 0, it will not be played anyway
+            self.mod_row = mod_order[0] * mod_lines
+
+        self.mod_patterns_left_to_play = self._nb_of_patterns_to_play
+
+        self.mod_line = 0
+        self.mod_current_loop = 0  # different to the "loops" variable, this increases until it reaches "loops"
+        self.mod_bpm = 0  # calculated from the tempo and ticks/line (only used for a visual indicator)
+        self.mod_tempo = self._mod_tempo
+        self.mod_ms_per_tick = self._mod_get_tempo_length(self._mod_tempo)
+        self.mod_ticks = self._mod_ticks
+
+        # optimize playback by skipping the dsp for effects that aren't used in the module
+        extended_effects = data.effect_params(0xe)
+        self.mod_using_bass_channel = not self._legacy and 0x02 in extended_effects
+        self.mod_using_delay_channel = not self._legacy and (0x04 in extended_effects or 0x05 in extended_effects)
+
+        self.mod_jumps = [[0, 0]]
+        self.mod_orders_visited = []
+        self.mod_lines_visited = []
+        self.mod_looped = False
+        self.mod_pattern_started = False
+
+        self.sample_number = 0  # these carry over from one line (and channel) to the next, same as they always have
+        self.period = 0
+        self.line_string = ""  # the current line, for the verbose display
+        self.frames = 0  # frames mixed so far
+        self.lines_played = 0
+
+    # https://modarchive.org/forums/index.php?topic=2709.0
+    def _mod_get_tempo_length(self, mod_tempo):
+        return (2500 / mod_tempo) * (self._sample_rate / 1000)
+
+    def set_output(self, output):
+        self._output = output
+
+    def snapshot(self):
+        """Returns a copy of the complete state of the playthrough (between lines), including any inverted samples and the random number generator used by the random waveforms."""
+
+        state = {}
+        for name, value in self.__dict__.items():
+            if name not in _Player._shared_attributes:
+                state[name] = copy.deepcopy(value)
+        return {"state": state, "samples": self.mod_sample_overlay.get_state()}
+
+    def restore(self, snapshot):
+        """Picks the playthrough up from a snapshot, exactly where it left off."""
+
+        self.__dict__.update(copy.deepcopy(snapshot["state"]))
+        self.mod_sample_overlay.set_state(snapshot["samples"])
+        if self.mod_sample_overlay.changed:
+            self.mod_file = self.mod_sample_overlay
+        else:
+            self.mod_file = self.mod_sample_overlay.data
+
+    def next_line(self):
+        """Moves on to the next line to be played. Returns False once the song's finished."""
+
+        while not self.mod_pattern_started or self.mod_line >= self.mod_lines:
+            if self.mod_pattern_started:
+                self._end_pattern()
+                self.mod_pattern_started = False
+            if self.mod_order_position >= self.mod_song_length or self.mod_patterns_left_to_play == 0:
+                return False
+            if self.mod_patterns_left_to_play > 0:
+                self.mod_patterns_left_to_play -= 1
+            self.mod_pattern_started = True
+        return True
+
+    def parse_line(self):
+        """Reads the effects and notes on the current line. When only sequencing, anything that doesn't affect the song's timing is skipped."""
+
+        mod_channels = self.mod_channels
+        mod_samples = self.mod_samples
+        mod_periods = self.mod_periods
+        mod_sample_numbers = self.mod_sample_numbers
+        mod_effects = self.mod_effects
+        mod_params = self.mod_params
+        mod_empty_rows = self.mod_empty_rows
+        mod_note_names = self.mod_note_names
+        mod_period_amount = self.mod_period_amount
+        mod_filter_flag = self.mod_filter_flag
+        mod_orders_visited = self.mod_orders_visited
+        mod_channel_pan = self.mod_channel_pan
+        mod_channel_gain = self.mod_channel_gain
+        mod_sample_offset = self.mod_sample_offset
+        mod_sample_position = self.mod_sample_position
+        mod_sample_number = self.mod_sample_number
+        mod_sample_playing = self.mod_sample_playing
+        mod_sample_volume = self.mod_sample_volume
+        mod_period = self.mod_period
+        mod_next_period = self.mod_next_period
+        mod_raw_period = self.mod_raw_period
+        mod_raw_period_inc_delay = self.mod_raw_period_inc_delay
+        mod_effect_number = self.mod_effect_number
+        mod_effect_param = self.mod_effect_param
+        mod_volslide_amount = self.mod_volslide_amount
+        mod_volslide_fine = self.mod_volslide_fine
+        mod_port_fine = self.mod_port_fine
+        mod_note_cut_ticks = self.mod_note_cut_ticks
+        mod_note_delay_ticks = self.mod_note_delay_ticks
+        mod_port_amount = self.mod_port_amount
+        mod_tone_period = self.mod_tone_period
+        mod_tone_sliding = self.mod_tone_sliding
+        mod_arp_counter = self.mod_arp_counter
+        mod_arp_periods = self.mod_arp_periods
+        mod_arp_period = self.mod_arp_period
+        mod_vibrato = self.mod_vibrato
+        mod_vibrato_counter = self.mod_vibrato_counter
+        mod_vibrato_offset = self.mod_vibrato_offset
+        mod_vibrato_wave = self.mod_vibrato_wave
+        mod_vibrato_retrigger = self.mod_vibrato_retrigger
+        mod_tremolo = self.mod_tremolo
+        mod_tremolo_counter = self.mod_tremolo_counter
+        mod_tremolo_offset = self.mod_tremolo_offset
+        mod_tremolo_wave = self.mod_tremolo_wave
+        mod_tremolo_retrigger = self.mod_tremolo_retrigger
+        mod_retrig_speed = self.mod_retrig_speed
+        mod_invert_loop_counter = self.mod_invert_loop_counter
+        mod_invert_loop_speed = self.mod_invert_loop_speed
+        mod_finetune_temp = self.mod_finetune_temp
+        mod_glissando = self.mod_glissando
+        mod_bass_channel = self.mod_bass_channel
+        mod_delay_channel = self.mod_delay_channel
+        mod_sample_reversed = self.mod_sample_reversed
+        mod_sample_reversed_flag = self.mod_sample_reversed_flag
+        mod_delay_channel_fast = self.mod_delay_channel_fast
+        mod_interpolate_channel = self.mod_interpolate_channel
+        mod_loop_play_full = self.mod_loop_play_full
+        mod_sample_number_cued = self.mod_sample_number_cued
+        mod_offset_flag = self.mod_offset_flag
+        mod_offset_delay_flag = self.mod_offset_delay_flag
+        mod_tone_memory = self.mod_tone_memory
+        mod_offset_memory = self.mod_offset_memory
+        mod_vibrato_memory = self.mod_vibrato_memory
+        mod_tremolo_memory = self.mod_tremolo_memory
+        mod_pattern_loop_start = self.mod_pattern_loop_start
+        mod_pattern_loop_end = self.mod_pattern_loop_end
+        mod_pattern_loop_counter = self.mod_pattern_loop_counter
+        sample_number = self.sample_number
+        period = self.period
+        line_string = ""
+
+        self.mod_pattern_delay_encountered = False
+        mod_cell = self.mod_row * mod_channels  # the cell for the first channel
+        if self.mod_pattern_delay_finished and not mod_empty_rows[self.mod_row]:  # nothing to look for on an empty line
+            for channel in range(0, mod_channels):
+                effect_number = mod_effects[mod_cell + channel]  # ssssh copypasta
+                effect_param = mod_params[mod_cell + channel]
+                if effect_number == 0xf:  # set tempo/ticks (checked for all channels for the note delay - fixes the weird behaviour in ode2ptk - hey, that rhymes)
+                    if effect_param < 32:
+                        self.mod_ticks = effect_param
+                    else:
+                        self.mod_tempo = effect_param
+                        self.mod_ms_per_tick = self._mod_get_tempo_length(self.mod_tempo)
+                if effect_number == 0xe and effect_param >> 4 == 0xe and self._legacy:  # pattern delay and line breaks (should this be part of legacy mode?)
+                    self.mod_next_line_offset = True
+                    self.mod_pattern_delay_encountered = True
+
+        for channel in range(0, mod_channels):
+            # difference between mod_period and mod_raw_period:
+            # mod_period is only changed if the period is non-zero
+            # mod_raw_period is the raw period value - for example, it's used when checking if there's a sample number and no period... (this usually doesn't need to be touched)
+
+            if self.mod_pattern_delay_finished:
+                mod_effect_number[channel] = mod_effects[mod_cell + channel]
+                mod_effect_param[channel] = mod_params[mod_cell + channel]
+                period = mod_periods[mod_cell + channel]  # the period can be changed, even if there's no sample number
+                mod_raw_period[channel] = period
+                mod_raw_period_inc_delay[channel] = period
+                sample_number = mod_sample_numbers[mod_cell + channel]
+                mod_port_amount[channel] = 0
+                mod_volslide_amount[channel] = 0
+            else:
+                sample_number = 0
+                mod_raw_period[channel] = 0
+                mod_effect_number[channel] = 0
+                mod_effect_param[channel] = 0
+
+            if not self._sequence_only:
+                # portamento effects MUST be handled here!
+                # otherwise the periods won't be correct (the periods are updated in the code after this)
+                # that's because with the tone portamento, it uses the LAST period as the period to slide from, and then the current period is grabbed after that
+                if mod_effect_number[channel] == 0x1:  # slide up
+                    mod_port_amount[channel] = mod_effect_param[channel]
+                    mod_port_fine[channel] = False
+                if mod_effect_number[channel] == 0x2:  # slide down
+                    mod_port_amount[channel] = 0 - mod_effect_param[channel]
+                    mod_port_fine[channel] = False
+                mod_tone_sliding[channel] = False
+                if (mod_effect_number[channel] == 0x3 or mod_effect_number[channel] == 0x5) and mod_tone_period[channel] > 0:
+                    mod_tone_sliding[channel] = True
+                if mod_effect_number[channel] == 0x3:
+                    if period > 0:
+                        if mod_tone_period[channel] > 0:
+                            mod_tone_sliding[channel] = True
+                        mod_tone_period[channel] = Module._mod_get_finetune_period(period, mod_finetune_temp[channel], self._legacy)
+                    if mod_effect_param[channel] > 0:
+                        mod_tone_memory[channel] = mod_effect_param[channel]
+
+                if self.mod_pattern_delay_finished:
+                    mod_retrig_speed[channel] = 0
+
+                if sample_number > 0:  # finetune check...
+                    mod_finetune_temp[channel] = mod_samples[sample_number - 1].finetune
+
+            if sample_number > 0:
+                mod_ticks_per_beat = self.mod_ticks * 4  # formula taken from the openmpt source code! (sndfile.cpp)
+                mod_samples_per_beat = self.mod_ms_per_tick * mod_ticks_per_beat
+                self.mod_bpm = (self._sample_rate / mod_samples_per_beat) * 60
+
+            # extended effects are here because the note delay is checked before the sample plays
+            if mod_effect_number[channel] == 0xe:  # extended effects
+                effect = mod_effect_param[channel] >> 4
+                param = mod_effect_param[channel] & 0xf
+                if not self._sequence_only:  # skipping as many irrelevant effects as possible when estimating the length!!
+                    if effect == 0xc:  # note cut
+                        if param == 0:  # ec0 is equivalent to c00
+                            mod_sample_volume[channel] = 0
+                        else:
+                            if param >= self.mod_ticks:  # if the cut amount is the same as the ticks per line, the note plays normally
+                                mod_note_cut_ticks[channel] = -1
+                            else:
+                                mod_note_cut_ticks[channel] = param
+                    mod_note_delay_ticks[channel] = -1  # no note delay effect, reset it
+                    if effect == 0xd:  # note delay
+                        if param >= self.mod_ticks:  # if the delay amount is the same as the ticks per line, the note is ignored
+                            mod_note_delay_ticks[channel] = -2  # pro coder skillz
+                        else:
+                            mod_note_delay_ticks[channel] = param
+                    if effect == 0xa:  # fine volume slide up
+                        mod_volslide_amount[channel] = param
+                        mod_volslide_fine[channel] = True
+                    if effect == 0xb:  # fine volume slide down
+                        mod_volslide_amount[channel] = 0 - param
+                        mod_volslide_fine[channel] = True
+                    if effect == 0x1:  # fine portamento up
+                        mod_port_amount[channel] = param
+                        mod_port_fine[channel] = True
+                    if effect == 0x2:  # fine portamento down
+                        mod_port_amount[channel] = 0 - param
+                        mod_port_fine[channel] = True
+                    if effect == 0x9:  # note retrigger
+                        if param > 0:
+                            mod_retrig_speed[channel] = param
+                            mod_sample_playing[channel] = True
+                            mod_sample_position[channel] = 0
+                    if effect == 0x5:  # set finetune
+                        mod_finetune_temp[channel] = param
+                    if effect == 0xf:  # invert loop
+                        if param == 0:
+                            mod_invert_loop_speed[channel] = 0
+                        else:
+                            mod_invert_loop_counter[channel] = 0
+                            mod_invert_loop_speed[channel] = Module._mod_funk_table[param]
+                    wave_type = param % 4
+                    wave_retrigger = param % 8 < 4
+                    if effect == 0x4:  # vibrato wave type
+                        mod_vibrato_wave[channel] = wave_type
+                        mod_vibrato_retrigger[channel] = wave_retrigger
+                    if effect == 0x7:  # tremolo wave type
+                        mod_tremolo_wave[channel] = wave_type
+                        mod_tremolo_retrigger[channel] = wave_retrigger
+                    if effect == 0x3:  # glissando control
+                        mod_glissando[channel] = param > 0
+                    if effect == 0x0:  # filter on/off
+                        if not mod_filter_flag:
+                            if self._legacy or (not self._legacy and param < 2):
+                                self.mod_filter = param % 2 == 0
+                    if effect == 0x8:  # set panning
+                        if not self._legacy:  # this effect isn't supported in protracker 2.3!
+                            if param == 15:
+                                mod_channel_pan[channel] = 1
+                            else:
+                                mod_channel_pan[channel] = ((param - 8) / 8)
+                            mod_channel_gain[channel] = Module._get_pan_gains(mod_channel_pan[channel], self.stereo)
+
+                if effect == 0x6:  # pattern loop
+                    if param == 0:  # set loop start
+                        mod_pattern_loop_start[channel] = self.mod_line
+                    else:  # loop x amount of times
+                        mod_pattern_loop_end[channel] = self.mod_line
+                        if mod_pattern_loop_counter[channel] == 0:
+                            mod_pattern_loop_counter[channel] = param + 1
+                if effect == 0xe:  # pattern delay:
+                    self.mod_pattern_delay = param
+
+                mod_sample_reversed_flag[channel] = False
+                if effect == 0x0 and not self._legacy:  # pymod exclusive effects
+                    if param == 0x2:  # bass channel filter on
+                        mod_bass_channel[channel] = True
+                    elif param == 0x3:  # bass channel filter off
+                        mod_bass_channel[channel] = False
+                    elif param == 0x4:  # channel delay on (fast decay)
+                        mod_delay_channel[channel] = True
+                        mod_delay_channel_fast[channel] = True
+                    elif param == 0x5:  # channel delay on (slow decay)
+                        mod_delay_channel[channel] = True
+                        mod_delay_channel_fast[channel] = False
+                    elif param == 0x6:  # channel delay off
+                        mod_delay_channel[channel] = False
+                    elif param == 0x7:  # sample reverse
+                        mod_sample_reversed[channel] = True
+                        mod_sample_reversed_flag[channel] = period > 0
+                    elif param == 0x8:  # sample forwards
+                        mod_sample_reversed[channel] = False
+                    elif param == 0x9:  # channel interpolation on
+                        mod_interpolate_channel[channel] = True
+                    elif param == 0xa:  # channel interpolation off
+                        mod_interpolate_channel[channel] = False
+
+            if not self._sequence_only:
+                if sample_number > 0:  # is a sample playing?
+                    mod_invert_loop_counter[channel] = 0
+                    if mod_samples[sample_number - 1].length == 0 and self.mod_pattern_delay_finished:  # is the current sample empty?
+                        sample_number = 32  # play an empty "sample"
+                    mod_sample_number_cued[channel] = sample_number  # "cue up" the next sample
+                    if mod_samples[sample_number - 1].loop_start == 0 and mod_samples[sample_number - 1].loop_length > 2:  # is this sample looping and does the loop start at 0?
+                        if not mod_sample_playing[channel]:  # is there no sample currently playing?
+                            mod_loop_play_full[channel] = True  # the full sample must be played first
+                    else:  # not looping
+                        if not mod_sample_playing[channel]:
+                            mod_loop_play_full[channel] = False  # idk if this is correct, half of the loop code is guess work and playing it by ear
+                    if mod_sample_position[channel] == 0:  # sample hasn't played yet?
+                        mod_sample_number[channel] = sample_number  # ...play it
+                    # if the sample is empty, none of that code will be executed, so nothing will be played
+                    sample_number -= 1
+                    if mod_sample_number[channel] > 0 and mod_raw_period[channel] == 0:  # sample number, no period?
+                        if mod_note_delay_ticks[channel] == -1 and sample_number != 31:  # if there's a note delay, the volume will be set once the counter reaches 0
+                            mod_sample_volume[channel] = mod_samples[sample_number].volume
+                    elif mod_sample_number[channel] > 0 and mod_raw_period[channel] > 0:  # sample number and period...
+                        mod_sample_offset[channel] = mod_samples[sample_number].offset
+                        if not mod_tone_sliding[channel]:  # don't reset the sample position or volume if sliding notes
+                            if mod_note_delay_ticks[channel] == -1 or (mod_note_delay_ticks[channel] > 0 and mod_samples[sample_number].loop_length > 2 and self._legacy):  # this'll always be -1 unless there's a note delay effect
+                                mod_sample_playing[channel] = True
+                                if mod_sample_reversed_flag[channel]:  # has a "reverse" effect been encountered?
+                                    mod_sample_position[channel] = mod_samples[mod_sample_number[channel] - 1].length - 1
+                                else:  # no reverse effect, play sample normally
+                                    mod_sample_position[channel] = 0
+                                    mod_sample_reversed[channel] = False
+                        if mod_note_delay_ticks[channel] == -1 or (mod_note_delay_ticks[channel] > 0 and mod_samples[sample_number].loop_length > 2 and self._legacy):
+                            mod_sample_volume[channel] = mod_samples[sample_number].volume
+                    sample_number += 1
+                elif sample_number == 0:  # no sample number...
+                    if mod_raw_period[channel] > 0:  # period, no sample?
+                        if mod_note_delay_ticks[channel] == -1 and not mod_tone_sliding[channel]:
+                            mod_sample_playing[channel] = True
+                            if mod_sample_reversed_flag[channel]:  # has a "reverse" effect been encountered?
+                                mod_sample_position[channel] = mod_samples[mod_sample_number[channel] - 1].length - 1
+                            else:  # no reverse effect, play sample normally
+                                mod_sample_position[channel] = 0
+                                mod_sample_reversed[channel] = False
+                if mod_raw_period[channel] > 0:  # period, regardless of sample number?
+                    if mod_samples[mod_sample_number_cued[channel] - 1].loop_start == 0:  # i seriously have no clue if this is correct
+                        mod_loop_play_full[channel] = True  # a period will reset this flag
+                    if mod_sample_number[channel] != mod_sample_number_cued[channel]:
+                        mod_sample_offset[channel] = mod_samples[mod_sample_number_cued[channel] - 1].offset
+                        if mod_sample_reversed_flag[channel]:  # has a "reverse" effect been encountered?
+                            mod_sample_position[channel] = mod_samples[mod_sample_number_cued[channel] - 1].length - 1
+                        else:  # no reverse effect, play sample normally
+                            mod_sample_position[channel] = 0
+                            mod_sample_reversed[channel] = False
+                    mod_sample_number[channel] = mod_sample_number_cued[channel]
+
+                if mod_effect_number[channel] != 0x3 and period > 0:  # if there's a slide before a period, this changes it before the slide so it slides to the correct period (slideperiodslideslideperiod)
+                    # that comment continues to crack me up
+                    mod_tone_period[channel] = Module._mod_get_finetune_period(period, mod_finetune_temp[channel], self._legacy)
+                if mod_tone_period[channel] == 0 and period > 0:  # nothing to slide from, use the current period
+                    mod_tone_period[channel] = period
+                if period > 0 and not mod_tone_sliding[channel] and self.mod_pattern_delay_finished:  # the period>0 fixes a bug related to pattern delays, if there's a period on the last channel, the period value will contain that, so without the check all channels will have the same period!
+                    mod_period_temp = Module._mod_get_finetune_period(period, mod_finetune_temp[channel], self._legacy)
+                    if mod_note_delay_ticks[channel] == -1:
+                        mod_period[channel] = mod_period_temp
+                    else:
+                        mod_next_period[channel] = mod_period_temp
+                    mod_arp_period[channel] = period  # are you kidding me, that's all i had to do the entire time, i was faffing around and turns out i was trying to find the finetuned period of a finetuned period, SSCCHHHHEEEEE
+                if mod_sample_volume[channel] > 64:
+                    mod_sample_volume[channel] = 64
+
+                if mod_effect_number[channel] == 0x0:  # arpeggio
+                    if mod_effect_param[channel] > 0:  # 0 means ignore
+                        mod_arp_counter[channel] = 0  # reset the counter every time the effect is encountered
+                        period_note = Module._mod_get_period_note(mod_arp_period[channel], self._legacy)
+                        sample_finetune = mod_finetune_temp[channel]
+                        sample_finetune_temp = sample_finetune
+                        sample_finetune_temp_changed = False  # so the finetune isn't repeatedly increased
+
+                        if mod_effect_param[channel] >> 4 == 0:
+                            if self._legacy:
+                                mod_arp_periods[channel][1] = Module._mod_legacy_periods[sample_finetune][period_note]
+                            else:
+                                mod_arp_periods[channel][1] = Module._mod_extended_periods[sample_finetune][period_note]
+                        else:
+                            period_1 = period_note + (mod_effect_param[channel] >> 4)  # this actually contains the note number, not the period... ;) (the reason it's the period amount+1 is because there's like this extra "period" containing no note when arpeggiating, causing a "cutting" effect)
+                            if period_1 == mod_period_amount:
+                                mod_arp_periods[channel][1] = 0  # don't play the note at all
+                            else:
+                                if period_1 > mod_period_amount:
+                                    sample_finetune_temp += 1  # when a wraparound occurs, the finetune is increased by one, because on the amiga, the period table is stored as one long list, so it reaches the lowest note of the finetune next to the one used with the current sample!
+                                    if self._legacy:
+                                        sample_finetune_temp %= len(Module._mod_legacy_periods)
+                                    else:
+                                        sample_finetune_temp %= len(Module._mod_extended_periods)
+                                    sample_finetune_temp_changed = True
+                                    period_1 -= mod_period_amount
+                                if self._legacy:
+                                    mod_arp_periods[channel][1] = Module._mod_legacy_periods[sample_finetune_temp][period_1]
+                                else:
+                                    mod_arp_periods[channel][1] = Module._mod_extended_periods[sample_finetune_temp][period_1]
+
+                        if mod_effect_param[channel] & 0xf == 0:
+                            if self._legacy:
+                                mod_arp_periods[channel][2] = Module._mod_legacy_periods[sample_finetune][period_note]  # still using the regular finetune for this, since the wraparound hasn't occured
+                            else:
+                                mod_arp_periods[channel][2] = Module._mod_extended_periods[sample_finetune][period_note]
+                        else:
+                            period_2 = period_note + (mod_effect_param[channel] & 0xf)
+                            if period_2 == mod_period_amount:
+                                mod_arp_periods[channel][2] = 0
+                            else:
+                                if period_2 > mod_period_amount:
+                                    if not sample_finetune_temp_changed:  # no need to set the flag here since it's the last of the 2 periods!
+                                        sample_finetune_temp += 1
+                                        if self._legacy:
+                                            sample_finetune_temp %= len(Module._mod_legacy_periods)
+                                        else:
+                                            sample_finetune_temp %= len(Module._mod_extended_periods)
+                                    period_2 -= mod_period_amount
+                                if self._legacy:
+                                    mod_arp_periods[channel][2] = Module._mod_legacy_periods[sample_finetune_temp][period_2]
+                                else:
+                                    mod_arp_periods[channel][2] = Module._mod_extended_periods[sample_finetune_temp][period_2]
+                        if self._legacy:
+                            mod_arp_periods[channel][0] = Module._mod_legacy_periods[sample_finetune][period_note]
+                        else:
+                            mod_arp_periods[channel][0] = Module._mod_extended_periods[sample_finetune][period_note]
+                    else:
+                        mod_arp_periods[channel][0] = 0
+                        mod_arp_periods[channel][1] = 0
+                        mod_arp_periods[channel][2] = 0
+                        mod_arp_counter[channel] = 0
+                else:
+                    mod_arp_periods[channel][0] = 0
+                    mod_arp_periods[channel][1] = 0
+                    mod_arp_periods[channel][2] = 0
+                    mod_arp_counter[channel] = 0
+
+            if mod_effect_number[channel] == 0xb:  # position break
+                self.mod_next_position = mod_effect_param[channel]
+                self.mod_position_break = True
+            if mod_effect_number[channel] == 0xd:  # line break
+                self.mod_next_line = (((mod_effect_param[channel] >> 4) * 10) + (mod_effect_param[channel] & 0xf))
+                if self.mod_next_line_offset and self.mod_pattern_delay_encountered:  # this ensures the line addition only happens if the line break is ALONGSIDE a pattern delay
+                    self.mod_next_line_offset = False
+                    self.mod_next_line += 1
+                    if self.mod_next_line > 63:
+                        self.mod_next_line = 0
+                        self.mod_order_position += 1
+                    mod_orders_visited.append(self.mod_order_position)
+                self.mod_line_break = True
+
+            if not self._sequence_only:
+                if mod_effect_number[channel] == 0x8:  # set panning
+                    if not self._legacy:  # this effect isn't supported in protracker 2.3!
+                        if mod_effect_param[channel] == 255:
+                            mod_channel_pan[channel] = 1
+                        else:
+                            mod_channel_pan[channel] = (mod_effect_param[channel] - 128) / 128
+                        mod_channel_gain[channel] = Module._get_pan_gains(mod_channel_pan[channel], self.stereo)
+
+                if (mod_effect_number[channel] == 0xa or mod_effect_number[channel] == 0x5 or mod_effect_number[channel] == 0x6) and self.mod_pattern_delay_finished:  # volume slide/ + tone portamento/ + vibrato (volume slide doesn't have any memory)
+                    mod_volslide_fine[channel] = False
+                    if mod_effect_param[channel] >= 0x10:  # slide up
+                        mod_volslide_amount[channel] = mod_effect_param[channel] >> 4
+                    else:  # slide down
+                        mod_volslide_amount[channel] = 0 - mod_effect_param[channel]
+
+                if mod_effect_number[channel] == 0xc:  # set volume
+                    if mod_sample_number[channel] == 32:
+                        mod_sample_volume[channel] = 0
+                    else:
+                        mod_sample_volume[channel] = mod_effect_param[channel]
+                        if mod_sample_volume[channel] > 64:
+                            mod_sample_volume[channel] = 64
+
+                # the offset effect has a very specific behaviour in protracker:
+                # * only change the offset if the effect is either on its own or alongside a sample number/period
+                # * only play a sample with the offset if either:
+                #     * it's a period on its own
+                #     * it's a period and a sample number alongside an offset effect
+                #     * there's no tone portamento currently happening
+
+                mod_offset_delay_flag[channel] = False
+                if mod_effect_number[channel] == 0x9:  # set offset
+                    if mod_effect_param[channel] > 0:
+                        mod_offset_memory[channel] = mod_effect_param[channel] * 256  # it's * 256 NOT 255!!!
+                        if mod_offset_memory[channel] > mod_samples[mod_sample_number[channel] - 1].length:
+                            mod_offset_memory[channel] = mod_samples[mod_sample_number[channel] - 1].length
+
+                if mod_raw_period[channel] > 0 and sample_number > 0 and mod_effect_number[channel] != 0x9:
+                    mod_offset_flag[channel] = False
+                elif (mod_raw_period[channel] == 0 and sample_number > 0 and mod_effect_number[channel] == 0x9) or (mod_raw_period[channel] > 0 and sample_number > 0 and mod_effect_number[channel] == 0x9):
+                    mod_offset_flag[channel] = True
+                if ((mod_raw_period[channel] > 0 and sample_number == 0 and mod_effect_number[channel] != 0x9) or (mod_raw_period[channel] > 0 and sample_number > 0 and mod_effect_number[channel] == 0x9) or (mod_raw_period[channel] > 0 and mod_effect_number[channel] == 0x9)) and not mod_tone_sliding[channel]:
+                    if mod_offset_flag[channel]:
+                        if mod_note_delay_ticks[channel] == -1:
+                            mod_sample_position[channel] = mod_offset_memory[channel]
+                        else:
+                            mod_offset_delay_flag[channel] = True
+
+                # vibrato/tremolo
+
+                mod_vibrato[channel] = False
+                mod_tremolo[channel] = False
+                if mod_effect_number[channel] == 0x4:  # vibrato
+                    memory = mod_vibrato_memory[channel]
+                elif mod_effect_number[channel] == 0x7:  # tremolo
+                    memory = mod_tremolo_memory[channel]
+
+                if mod_raw_period[channel] > 0:  # if there's a period...
+                    if not mod_vibrato[channel]:  # ...and there's no vibrato...
+                        if mod_vibrato_retrigger[channel]:
+                            mod_vibrato_counter[channel] = 0  # ...reset the counter, otherwise the note will play slightly out of tune
+                            mod_vibrato_offset[channel] = 0
+                    if not mod_tremolo[channel]:
+                        if mod_tremolo_retrigger[channel]:
+                            mod_tremolo_counter[channel] = 0
+                            mod_tremolo_offset[channel] = 0
+
+                if mod_effect_number[channel] == 0x4 or mod_effect_number[channel] == 0x7:  # vibrato/tremolo
+                    if mod_effect_param[channel] > 0:
+                        if mod_effect_param[channel] >> 4 == 0:  # speed continue (4xY)
+                            memory = (memory & 0xf0) | (mod_effect_param[channel] & 0xf)
+                        elif mod_effect_param[channel] & 0xf == 0:  # depth continue (4Xy)
+                            memory = (mod_effect_param[channel] & 0xf0) | (memory & 0xf)
+                        else:  # speed and depth (4XY)
+                            memory = mod_effect_param[channel]
+
+                if mod_effect_number[channel] == 0x4:  # vibrato
+                    mod_vibrato_memory[channel] = memory
+                elif mod_effect_number[channel] == 0x7:  # tremolo
+                    mod_tremolo_memory[channel] = memory
+                    mod_tremolo[channel] = True
+
+                if mod_effect_number[channel] == 0x4 or mod_effect_number[channel] == 0x6:  # vibrato/volslide + vibrato
+                    mod_vibrato[channel] = True
+                    if mod_raw_period[channel] > 0:
+                        if mod_vibrato_retrigger[channel]:
+                            mod_vibrato_counter[channel] = 0
+
+                if mod_effect_number[channel] == 0x3 and mod_raw_period[channel] > 0 and mod_samples[mod_sample_number[channel] - 1].length > 0:
+                    mod_sample_playing[channel] = True
+
+                # i was finding the finetuned version of a finetuned period... again
+                # ...words can't describe the way i exhaled when i realized this
+
+                if not self._rendering:
+                    if self._verbose:
+                        note_name = "---"
+                        note_number = Module._mod_get_period_note(mod_raw_period[channel], self._legacy)
+                        if self._legacy:
+                            if note_number >= 0 and note_number < mod_period_amount - 1:
+                                note_name = mod_note_names[note_number]
+                        else:
+                            if note_number < mod_period_amount - 1:
+                                note_name = mod_note_names[note_number]
+                        sample_number_string = str(sample_number).zfill(2)
+                        effect_string = hex(mod_effect_number[channel])[2:].upper() + " " + hex(mod_effect_param[channel])[2:].upper().zfill(2)
+                        line_string += f"{note_name} {sample_number_string} {effect_string}|"
+
+        # channels finished
+        if self.mod_pattern_delay_finished:
+            self.mod_row += 1  # next line
+        self.sample_number = sample_number
+        self.period = period
+        self.line_string = line_string
+
+    def mix_line(self):
+        """Plays every tick of the current line, writing each frame to the output."""
+
+        mod_ms_per_tick = self.mod_ms_per_tick
+        mod_ticks = self.mod_ticks
+        line_frames = max(0, math.ceil(mod_ms_per_tick * mod_ticks))
+
+        frame = 0
+        while frame < line_frames:
+            tick = int((frame / (mod_ms_per_tick * mod_ticks)) * mod_ticks)  # the actual tick counter (e.g. by default this'll be from 0-5)
+            self._sequence_tick(tick, frame > 0)
+            tick_end = tick_start(tick + 1, mod_ms_per_tick, mod_ticks, line_frames)  # where the next tick starts (found exactly, rather than working out the tick of every frame)
+            self._mix_frames(tick_end - frame, tick)
+            frame = tick_end
+        self.frames += line_frames
+
+    def _sequence_tick(self, tick, tick_changed):
+        """Does everything that happens on a tick (slides, arpeggios, vibrato, note cuts and delays...) for every channel.
+        tick_changed is false on the first frame of the line, since some effects skip the first tick."""
+
+        # everything used here is copied to local variables first, since they're quicker to access
+        # (the lists are still the player's lists, so changing them changes the player's state)
+        mod_channels = self.mod_channels
+        mod_samples = self.mod_samples
+        mod_file = self.mod_file
+        mod_sample_overlay = self.mod_sample_overlay
+        mod_sample_offset = self.mod_sample_offset
+        mod_sample_position = self.mod_sample_position
+        mod_sample_number = self.mod_sample_number
+        mod_sample_playing = self.mod_sample_playing
+        mod_sample_volume = self.mod_sample_volume
+        mod_period = self.mod_period
+        mod_next_period = self.mod_next_period
+        mod_raw_period_inc_delay = self.mod_raw_period_inc_delay
+        mod_frequency = self.mod_frequency
+        mod_volslide_amount = self.mod_volslide_amount
+        mod_volslide_fine = self.mod_volslide_fine
+        mod_port_fine = self.mod_port_fine
+        mod_note_cut_ticks = self.mod_note_cut_ticks
+        mod_note_delay_ticks = self.mod_note_delay_ticks
+        mod_port_amount = self.mod_port_amount
+        mod_tone_period = self.mod_tone_period
+        mod_tone_sliding = self.mod_tone_sliding
+        mod_arp_counter = self.mod_arp_counter
+        mod_arp_periods = self.mod_arp_periods
+        mod_vibrato = self.mod_vibrato
+        mod_vibrato_counter = self.mod_vibrato_counter
+        mod_vibrato_offset = self.mod_vibrato_offset
+        mod_vibrato_wave = self.mod_vibrato_wave
+        mod_tremolo = self.mod_tremolo
+        mod_tremolo_counter = self.mod_tremolo_counter
+        mod_tremolo_offset = self.mod_tremolo_offset
+        mod_tremolo_wave = self.mod_tremolo_wave
+        mod_retrig_speed = self.mod_retrig_speed
+        mod_invert_loop_counter = self.mod_invert_loop_counter
+        mod_invert_loop_position = self.mod_invert_loop_position
+        mod_invert_loop_speed = self.mod_invert_loop_speed
+        mod_glissando = self.mod_glissando
+        mod_loop_play_full = self.mod_loop_play_full
+        mod_sample_number_cued = self.mod_sample_number_cued
+        mod_offset_delay_flag = self.mod_offset_delay_flag
+        mod_tone_memory = self.mod_tone_memory
+        mod_offset_memory = self.mod_offset_memory
+        mod_vibrato_memory = self.mod_vibrato_memory
+        mod_tremolo_memory = self.mod_tremolo_memory
+        sample_number = self.sample_number
+
+        for channel in range(0, mod_channels):
+            if mod_retrig_speed[channel] > 0:
+                if tick % mod_retrig_speed[channel] == 0:
+                    if mod_raw_period_inc_delay[channel] > 0 and self._legacy:  # note alongside the retrigger?
+                        if tick > 0:  # miss the second occurence of the first tick
+                            mod_sample_playing[channel] = True
+                            mod_sample_position[channel] = 0
+                    else:  # retrigger by itself?
+                        mod_sample_playing[channel] = True  # retrigger on all ticks
+                        mod_sample_position[channel] = 0
+            fine_condition = tick > 0
+            if mod_volslide_fine[channel]:
+                fine_condition = tick == 0  # only fineslide on the first tick
+            if fine_condition:
+                if mod_volslide_amount[channel] >= 0:
+                    mod_sample_volume[channel] += mod_volslide_amount[channel]
+                    if mod_sample_volume[channel] > 65:
+                        mod_sample_volume[channel] = 65
+                else:
+                    mod_sample_volume[channel] += mod_volslide_amount[channel]
+                    if mod_sample_volume[channel] < 0:
+                        mod_sample_volume[channel] = 0
+
+            fine_condition = tick > 0
+            if mod_port_fine[channel]:
+                fine_condition = not tick_changed  # only fineslide on the first tick
+            if mod_port_amount[channel] != 0 and fine_condition:  # portamento happening?
+                mod_period[channel] -= mod_port_amount[channel]
+            if mod_tone_sliding[channel] and tick > 0:  # don't slide on the first tick
+                if mod_period[channel] < mod_tone_period[channel] - mod_tone_memory[channel]:  # first note higher than second note?
+                    mod_period[channel] += mod_tone_memory[channel]
+                elif mod_period[channel] > mod_tone_period[channel] + mod_tone_memory[channel]:  # second note higher than first note?
+                    mod_period[channel] -= mod_tone_memory[channel]
+                else:
+                    mod_period[channel] = mod_tone_period[channel]
+
+            if self._legacy:
+                if mod_period[channel] < Module._mod_legacy_period_lowest:
+                    mod_period[channel] = Module._mod_legacy_period_lowest
+                if mod_period[channel] > Module._mod_legacy_period_highest:
+                    mod_period[channel] = Module._mod_legacy_period_highest
+            if mod_period[channel] > 0:
+                if mod_glissando[channel]:
+                    mod_frequency[channel] = Module._mod_get_frequency(Module._mod_get_closest_period(mod_period[channel], mod_samples[sample_number].finetune, self._legacy))
+                else:
+                    if mod_arp_periods[channel] == [0, 0, 0]:  # no arpeggio?
+                        if self._legacy and tick == 0:  # reset to base note on the first tick
+                            mod_frequency[channel] = Module._mod_get_frequency(mod_period[channel])
+                        else:
+                            mod_frequency[channel] = Module._mod_get_frequency(mod_period[channel] + mod_vibrato_offset[channel])
+                    else:
+                        if mod_arp_periods[channel][mod_arp_counter[channel]] > 0:
+                            mod_frequency[channel] = Module._mod_get_frequency(mod_arp_periods[channel][mod_arp_counter[channel]])
+                        else:
+                            mod_frequency[channel] = 0
+            if mod_arp_periods[channel] != [0, 0, 0]:
+                mod_arp_counter[channel] += 1
+                if mod_arp_counter[channel] > 2:
+                    mod_arp_counter[channel] = 0
+
+            sample_number = mod_sample_number[channel]
+            if sample_number > 0:
+                sample_number -= 1
+                if mod_samples[sample_number].loop_length <= 2:  # sample isn't looping
+                    if mod_sample_position[channel] > mod_samples[sample_number].length - 1 or mod_sample_position[channel] < 0:  # reached end of sample?
+                        mod_sample_playing[channel] = False  # not looping, end sample
+                else:  # sample is looping
+                    if mod_loop_play_full[channel]:  # the current sample's loop begins at 0, play the whole thing first
+                        if mod_sample_position[channel] > mod_samples[sample_number].length:  # reached end?
+                            mod_loop_play_full[channel] = False  # sample has played in full
+                            if mod_samples[mod_sample_number_cued[channel] - 1].loop_length <= 2:  # is the cued sample looping?
+                                mod_sample_playing[channel] = False  # if not, stop playback
+                            mod_sample_number[channel] = mod_sample_number_cued[channel]  # idk if this is technically correct
+                            mod_sample_offset[channel] = mod_samples[mod_sample_number_cued[channel] - 1].offset
+                            mod_sample_position[channel] = mod_samples[mod_sample_number_cued[channel] - 1].loop_start
+                    else:  # sample has either played in full, or the loop begins after 0
+                        if mod_sample_position[channel] > mod_samples[sample_number].loop_length + mod_samples[sample_number].loop_start:  # reached loop point?
+                            mod_sample_position[channel] -= mod_samples[sample_number].loop_length  # loop back
+                            # it's not possible to simply set the position to the loop start, because the sample stepping accuracy will be lost, especially with higher notes
+                            if mod_sample_number[channel] != mod_sample_number_cued[channel]:  # reached the loop end... is the currently looping sample number different to the cued one?
+                                if mod_samples[mod_sample_number_cued[channel] - 1].loop_length > 2:  # is the cued sample looping?
+                                    if mod_sample_number_cued[channel] == 32:
+                                        mod_sample_number[channel] = mod_sample_number_cued[channel]
+                                        mod_sample_volume[channel] = 0
+                                    else:
+                                        mod_sample_number[channel] = mod_sample_number_cued[channel]
+                                        mod_sample_offset[channel] = mod_samples[mod_sample_number_cued[channel] - 1].offset
+                                        mod_sample_position[channel] = mod_samples[mod_sample_number_cued[channel] - 1].loop_start
+                                else:  # cued sample isn't looping, so stop playback altogether
+                                    mod_sample_playing[channel] = False
+                                    mod_sample_number[channel] = mod_sample_number_cued[channel]
+
+            if tick_changed:  # a tick has occured
+                # because of the condition above, the first tick will be missed entirely, which is the correct behaviour
+                if mod_invert_loop_speed[channel] > 0:
+                    mod_invert_loop_counter[channel] += mod_invert_loop_speed[channel]
+                    if mod_invert_loop_counter[channel] > 127:
+                        mod_invert_loop_counter[channel] = 0
+                        mod_invert_loop_position[channel] += 1
+                        if mod_invert_loop_position[channel] > mod_samples[sample_number].loop_length + mod_samples[sample_number].loop_start - 1:
+                            mod_invert_loop_position[channel] = 0
+                        sample_offset = mod_samples[sample_number].offset
+                        mod_sample_overlay.invert(sample_offset + mod_invert_loop_position[channel], sample_offset, sample_offset + max(mod_samples[sample_number].length, mod_samples[sample_number].loop_start + mod_samples[sample_number].loop_length))
+                        mod_file = mod_sample_overlay
+                        self.mod_file = mod_file
+
+                if mod_vibrato[channel] or mod_tremolo[channel]:
+                    if mod_vibrato[channel]:
+                        counter = mod_vibrato_counter[channel]
+                        memory = mod_vibrato_memory[channel]
+                        wave_type = mod_vibrato_wave[channel]
+                    else:
+                        counter = mod_tremolo_counter[channel]
+                        memory = mod_tremolo_memory[channel]
+                        wave_type = mod_tremolo_wave[channel]
+                    depth = memory & 0xf
+                    if wave_type == 0:  # sine
+                        offset = (Module._mod_sine_table[counter] * depth) / 128
+                    if wave_type == 1:  # ramp down
+                        offset = ((counter - 32) * 8 * depth) / 128
+                    # the random waveform isn't implemented in protracker 2.3, square is used instead
+                    if wave_type == 2 or (wave_type == 3 and self._legacy):  # square
+                        offset = depth * 255
+                        if counter > 31:
+                            offset = 0 - offset
+                        offset /= 128
+                    if wave_type == 3 and not self._legacy:  # random
+                        offset = self._random.randint(0 - depth, depth)
+
+                    if mod_vibrato[channel]:
+                        mod_vibrato_offset[channel] = offset
+                        mod_vibrato_counter[channel] += memory >> 4
+                        mod_vibrato_counter[channel] = mod_vibrato_counter[channel] % len(Module._mod_sine_table)
+                    else:
+                        mod_tremolo_offset[channel] = offset
+                        mod_tremolo_counter[channel] += memory >> 4
+                        mod_tremolo_counter[channel] = mod_tremolo_counter[channel] % len(Module._mod_sine_table)
+
+                if mod_note_cut_ticks[channel] >= 0:  # note actually cutting?
+                    mod_note_cut_ticks[channel] -= 1
+                    if mod_note_cut_ticks[channel] == 0:
+                        mod_note_cut_ticks[channel] = -1
+                        mod_sample_volume[channel] = 0
+                # despite the name, the note cut doesn't actually cut at all, it just changes the volume to 0
+                # if you put a sample number on the same line as a note cut, the volume will open up before being cut by the effect
+                if mod_note_delay_ticks[channel] >= 0:  # note delayed?
+                    mod_note_delay_ticks[channel] -= 1
+                    if mod_note_delay_ticks[channel] == 0:  # note delay finished?
+                        mod_note_delay_ticks[channel] = -1
+                        mod_period[channel] = mod_next_period[channel]  # just change the period without restarting the sample
+                        mod_frequency[channel] = Module._mod_get_frequency(mod_period[channel])
+                        if mod_samples[sample_number].loop_length <= 2:  # sample NOT looping?
+                            if mod_offset_delay_flag[channel]:
+                                mod_sample_position[channel] = mod_offset_memory[channel]
+                            else:
+                                mod_sample_position[channel] = 0  # sample isn't looping, so start it from the beginning
+                        mod_sample_playing[channel] = True  # spent over an hour trying to figure out why this didn't work... turns out THIS LINE was in the wrong place... SSSSSSCCCCCCHHHHSSSSHHHHH
+                        mod_sample_volume[channel] = mod_samples[sample_number].volume
+                elif mod_note_delay_ticks[channel] == -2:  # previously specified delay command greater than the ticks per line?
+                    mod_note_delay_ticks[channel] = -1  # the note didn't play, so reset tick counter
+                    # this works because there are explicit checks to only play the note if the tick counter has reached -1!!
+        self.sample_number = sample_number
+        self._schedule_voices()
+
+    def _schedule_voices(self):
+        """Works out which channels the mixer has to bother with until the next tick, after notes have started, stopped, been
+        cut or had their volume changed. Most channels in a module with lots of them are silent most of the time, so
+        the mixer only goes through the ones that are doing something."""
+
+        mod_channels = self.mod_channels
+        mod_samples = self.mod_samples
+        mod_sample_number = self.mod_sample_number
+        mod_sample_playing = self.mod_sample_playing
+        mod_sample_offset = self.mod_sample_offset
+        mod_sample_volume = self.mod_sample_volume
+        mod_channel_byte = self.mod_channel_byte
+        mod_channel_byte_last = self.mod_channel_byte_last
+        mod_bass_history = self.mod_bass_history
+        mod_using_bass_channel = self.mod_using_bass_channel
+        mod_delay_silent = self.mod_delay_silent
+
+        using_delay = self.mod_using_delay_channel and not self._legacy
+        if using_delay:
+            for channel in range(0, mod_channels):
+                if self.mod_delay_channel[channel]:
+                    mod_delay_silent[channel] = False
+                elif not mod_delay_silent[channel]:  # (once it's died away it stays that way, until the delay's turned on again)
+                    mod_delay_silent[channel] = self._delay_died_away(channel)
+
+        voices = []
+        mixdown_channels = []
+        for channel in range(0, mod_channels):
+            playing = mod_sample_playing[channel]
+            # anything that'll be heard: a sample playing, or the filters still dying away after one's stopped
+            audible = playing or mod_channel_byte[channel] != 0 or mod_channel_byte_last[channel] != 0
+            if not audible and mod_using_bass_channel:
+                audible = any(mod_bass_history[channel])
+            if audible:
+                voices.append(channel)
+            else:
+                # a channel that isn't playing still has to be gone through if its sample's looping (it can still loop back,
+                # or the cued sample can take over) or if its volume's about to be set to 0
+                sample_number = mod_sample_number[channel]
+                if (sample_number > 0 and mod_samples[sample_number - 1].loop_length > 2) or (mod_sample_offset[channel] == 0 and mod_sample_volume[channel] != 0):
+                    voices.append(channel)
+            if audible or (using_delay and not mod_delay_silent[channel]):
+                mixdown_channels.append(channel)
+        self.mod_voices = voices
+        self.mod_mixdown_channels = mixdown_channels
+
+    def _delay_died_away(self, channel):
+        # it has to be completely silent, rather than just too quiet to hear: anything left in the buffer would still be
+        # added to the next bytes if the delay was turned on again
+        delay_buffer = self.mod_channel_delay_buffer[channel]
+        if hasattr(delay_buffer, "any"):  # the numpy engine keeps the buffers in an array, so it's checked all at once
+            return not delay_buffer.any()
+        return not any(delay_buffer)
+
+    def _write_stems(self, stem_sums, output):
+        # the same as the end of _mix_frames(), but for every channel's own output (each one through its own filters)
+        stem_values = [value for channel_sums in stem_sums for value in channel_sums]
+        if self._amiga_filter is not None:
+            stem_values = self._amiga_filter.process(stem_values, self.mod_filter)
+        if output is not None:
+            for value in stem_values:
+                if value > 32767:
+                    value = 32767
+                if value < -32768:
+                    value = -32768
+                output.append(value & 65535)
+
+    def _advance_delay_counter(self, mod_delay_counter, steps):
+        # where the delay counter ends up after going up the given amount of times (it goes back to 0 when it gets to
+        # the last place in the buffer, then straight on to 1, so after the first step it's always somewhere from 1 up)
+        if steps <= 0:
+            return mod_delay_counter
+        if mod_delay_counter == 0:
+            mod_delay_counter = 1
+            steps -= 1
+        return ((mod_delay_counter - 1 + steps) % (self.mod_delay_length - 1)) + 1
+
+    def _mix_frames(self, frames, tick):
+        """Mixes the given amount of frames (all in the same tick), writing each one to the output. Only the sample
+        positions change from frame to frame, everything else is done once per tick by _sequence_tick()."""
+
+        # everything used for every frame is copied to local variables first, since they're quicker to access
+        stereo = self.stereo
+        output = self._output
+        stems = self._stems
+        mod_channels = self.mod_channels
+        mod_samples = self.mod_samples
+        mod_file = self.mod_file
+        mod_filter = self.mod_filter
+        amiga_filter = self._amiga_filter
+        mod_filter_order = self.mod_filter_order
+        mod_delay_length = self.mod_delay_length
+        mod_delay_counter = self.mod_delay_counter
+        mod_using_bass_channel = self.mod_using_bass_channel
+        mod_using_delay_channel = self.mod_using_delay_channel
+        mod_channel_byte = self.mod_channel_byte
+        mod_channel_delay_buffer = self.mod_channel_delay_buffer
+        mod_channel_byte_last = self.mod_channel_byte_last
+        mod_bass_history = self.mod_bass_history
+        mod_bass_sum = self.mod_bass_sum
+        mod_bass_position = self.mod_bass_position
+        mod_channel_gain = self.mod_channel_gain
+        mod_sample_offset = self.mod_sample_offset
+        mod_sample_position = self.mod_sample_position
+        mod_sample_number = self.mod_sample_number
+        mod_sample_playing = self.mod_sample_playing
+        mod_sample_volume = self.mod_sample_volume
+        mod_frequency = self.mod_frequency
+        mod_tremolo_offset = self.mod_tremolo_offset
+        mod_bass_channel = self.mod_bass_channel
+        mod_delay_channel = self.mod_delay_channel
+        mod_sample_reversed = self.mod_sample_reversed
+        mod_delay_channel_fast = self.mod_delay_channel_fast
+        mod_interpolate_channel = self.mod_interpolate_channel
+        mod_loop_play_full = self.mod_loop_play_full
+        mod_sample_number_cued = self.mod_sample_number_cued
+        sample_number = self.sample_number
+        block_mixer = self._block_mixer
+        sample_values = Module._mod_sample_values
+        last_byte_position = len(mod_file) - 1  # (inverting samples doesn't change the length)
+        kernel = self._kernel
+        paula = self._paula
+        paula_gain = self._paula_gain
+        voices = self.mod_voices
+        mixdown_channels = self.mod_mixdown_channels
+        delay_silent = self.mod_delay_silent
+        using_delay = mod_using_delay_channel and not self._legacy
+        last_channel = mod_channels - 1
+
+        loop_checked = True
+        while frames > 0:
+            if block_mixer is not None:  # as many frames as possible are mixed in one go
+                self.mod_bass_position = mod_bass_position  # (the block mixer moves the bass history along too)
+                block_frames, mod_delay_counter = block_mixer.mix(frames, tick, mod_delay_counter, loop_checked)
+                mod_bass_position = self.mod_bass_position
+                if block_frames > 0:
+                    if block_frames > 1 or not loop_checked:
+                        sample_number = max(mod_sample_number[mod_channels - 1] - 1, 0)  # what it would've been left at after the last frame
+                    frames -= block_frames
+                    loop_checked = False
+                    continue
+            for channel in voices:  # (every other channel's silent, and would be left exactly the same)
+                if mod_using_bass_channel:  # the oldest byte's swapped for the last one, and the sum goes up or down by the difference
+                    mod_bass_sum[channel] += mod_channel_byte[channel] - mod_bass_history[channel][mod_bass_position]
+                    mod_bass_history[channel][mod_bass_position] = mod_channel_byte[channel]
+                mod_channel_byte_last[channel] = mod_channel_byte[channel]
+
+                if not loop_checked:  # (_sequence_tick() has already done this on the first frame of a tick)
+                    sample_number = mod_sample_number[channel]
+                    if sample_number > 0:
+                        sample_number -= 1
+                        if mod_samples[sample_number].loop_length <= 2:  # sample isn't looping
+                            if mod_sample_position[channel] > mod_samples[sample_number].length - 1 or mod_sample_position[channel] < 0:  # reached end of sample?
+                                mod_sample_playing[channel] = False  # not looping, end sample
+                        else:  # sample is looping
+                            if mod_loop_play_full[channel]:  # the current sample's loop begins at 0, play the whole thing first
+                                if mod_sample_position[channel] > mod_samples[sample_number].length:  # reached end?
+                                    mod_loop_play_full[channel] = False  # sample has played in full
+                                    if mod_samples[mod_sample_number_cued[channel] - 1].loop_length <= 2:  # is the cued sample looping?
+                                        mod_sample_playing[channel] = False  # if not, stop playback
+                                    mod_sample_number[channel] = mod_sample_number_cued[channel]  # idk if this is technically correct
+                                    mod_sample_offset[channel] = mod_samples[mod_sample_number_cued[channel] - 1].offset
+                                    mod_sample_position[channel] = mod_samples[mod_sample_number_cued[channel] - 1].loop_start
+                            else:  # sample has either played in full, or the loop begins after 0
+                                if mod_sample_position[channel] > mod_samples[sample_number].loop_length + mod_samples[sample_number].loop_start:  # reached loop point?
+                                    mod_sample_position[channel] -= mod_samples[sample_number].loop_length  # loop back
+                                    # it's not possible to simply set the position to the loop start, because the sample stepping accuracy will be lost, especially with higher notes
+                                    if mod_sample_number[channel] != mod_sample_number_cued[channel]:  # reached the loop end... is the currently looping sample number different to the cued one?
+                                        if mod_samples[mod_sample_number_cued[channel] - 1].loop_length > 2:  # is the cued sample looping?
+                                            if mod_sample_number_cued[channel] == 32:
+                                                mod_sample_number[channel] = mod_sample_number_cued[channel]
+                                                mod_sample_volume[channel] = 0
+                                            else:
+                                                mod_sample_number[channel] = mod_sample_number_cued[channel]
+                                                mod_sample_offset[channel] = mod_samples[mod_sample_number_cued[channel] - 1].offset
+                                                mod_sample_position[channel] = mod_samples[mod_sample_number_cued[channel] - 1].loop_start
+                                        else:  # cued sample isn't looping, so stop playback altogether
+                                            mod_sample_playing[channel] = False
+                                            mod_sample_number[channel] = mod_sample_number_cued[channel]
+
+                if mod_sample_offset[channel] == 0:
+                    mod_sample_volume[channel] = 0  # slightly janky way of not playing samples if no offset is specified!
+
+                if paula:  # a whole number of 1 / 2**32 steps, so the position never drifts
+                    sample_step_rate = paula_step_rate(mod_frequency[channel], self._sample_rate) / paula_phase_one
+                else:
+                    sample_step_rate = mod_frequency[channel] / self._sample_rate
+
+                if mod_sample_playing[channel]:
+                    if self._legacy and tick == 0:  # reset to base volume on the first tick
+                        volume = mod_sample_volume[channel]
+                    else:
+                        volume = mod_sample_volume[channel] + mod_tremolo_offset[channel]
+                    if volume > 64:
+                        volume = 64
+                    if volume < 0:
+                        volume = 0
+                    if volume == 0:  # nothing to hear, so there's no need to read the sample (it still moves along though)
+                        sample_byte = 0
+                    else:
+                        sample_byte_position = int(mod_sample_offset[channel] + mod_sample_position[channel])
+                        if sample_byte_position > last_byte_position:
+                            sample_byte_position = last_byte_position
+                        if mod_interpolate_channel[channel] and kernel is not None:
+                            # the weights for every byte around the position have already been worked out, so it's just a case of adding them up
+                            weights = kernel.weights[int((mod_sample_position[channel] % 1) * kernel_phases)]
+                            sample_byte = 0
+                            for tap in range(0, kernel.taps):
+                                tap_position = sample_byte_position + kernel.start + tap
+                                if tap_position < 0:
+                                    tap_position = 0
+                                elif tap_position > last_byte_position:
+                                    tap_position = last_byte_position
+                                sample_byte += sample_values[mod_file[tap_position]] * weights[tap]
+                        elif mod_interpolate_channel[channel]:
+                            sample_byte = (mod_file[sample_byte_position] + 128) & 255  # sample byte converted to an unsigned value
+                            # source: none, i stayed up until half 2 coding this "algorithm" in bed ;)
+                            sample_position_mod = mod_sample_position[channel] % 1  # current position between 0.0 and 0.9 recurring
+                            if sample_byte_position + 1 > last_byte_position:
+                                sample_byte_next = sample_byte
+                            else:
+                                sample_byte_next = (mod_file[sample_byte_position + 1] + 128) & 255
+                            sample_byte <<= 8  # convert to 16-bit to remove noise!
+                            sample_byte_next <<= 8
+                            sample_byte_difference = sample_byte_next - sample_byte  # the difference between the current and next bytes
+                            sample_byte_step = sample_byte_difference * sample_position_mod  # how much to add/subtract depending on the current position
+                            sample_byte_16 = ((mod_file[sample_byte_position] + 128) & 255) << 8  # the CURRENT sample byte, converted to an unsigned 16 bit value...
+                            sample_byte_interpolated = sample_byte_16 + sample_byte_step  # apply the step difference
+                            sample_byte = (sample_byte_interpolated - 32768) / 32768  # convert to a value between -1 and 1
+                        else:
+                            sample_byte = sample_values[mod_file[sample_byte_position]]  # a value between -1 and 1
+                        if paula:  # the volume's a whole number, like the amiga's volume registers
+                            sample_byte = (int(sample_byte * 32768) * (int(volume) * paula_gain)) >> (6 + paula_gain_bits)
+                        else:
+                            volume /= 64
+                            volume *= self._amplify
+                            sample_byte *= volume
+                            sample_byte /= mod_channels  # it makes way more sense to reduce the volume per-channel instead of overall
+                            sample_byte = int(sample_byte * 32768)
+                    if mod_sample_reversed[channel]:
+                        mod_sample_position[channel] -= sample_step_rate
+                    else:
+                        mod_sample_position[channel] += sample_step_rate
+                else:
+                    sample_byte = 0
+
+                mod_channel_byte[channel] = sample_byte
+
+            if not loop_checked and (len(voices) == 0 or voices[-1] != last_channel):
+                sample_number = max(mod_sample_number[last_channel] - 1, 0)  # what going through the last channel would've left it at
+
+            if mod_using_bass_channel:
+                mod_bass_position += 1
+                if mod_bass_position == mod_filter_order:
+                    mod_bass_position = 0
+
+            channel_sum = 0
+            channel_sum_left = 0
+            channel_sum_right = 0
+            if stems:
+                stem_sums = [(0, 0) if stereo else (0,)] * mod_channels
+            previous_counter = -1
+            for counter in mixdown_channels:
+                channel_byte = mod_channel_byte[counter]
+                if mod_bass_channel[counter]:
+                    # https://dobrian.github.io/cmp/topics/filters/lowpassfilter.html
+                    channel_byte = mod_bass_sum[counter] // mod_filter_order  # the average of x amount of previous bytes
+                elif mod_filter and amiga_filter is None:
+                    channel_byte = (channel_byte + mod_channel_byte_last[counter]) // 2
+                if stereo:
+                    gain = mod_channel_gain[counter]
+                    channel_sum_left += int(channel_byte * gain[0]) * 2
+                    channel_sum_right += int(channel_byte * gain[1]) * 2
+                else:
+                    channel_sum += channel_byte
+
+                if using_delay:
+                    if counter > previous_counter + 1:  # the counter still goes up for every channel that's been skipped
+                        mod_delay_counter = self._advance_delay_counter(mod_delay_counter, counter - previous_counter - 1)
+                    previous_counter = counter
+                    if mod_delay_counter == mod_delay_length - 1:  # i programmed this delay myself, no references!!
+                        mod_delay_counter = 0
+                    elif not delay_silent[counter]:
+                        if mod_delay_channel[counter]:
+                            mod_channel_delay_buffer[counter][mod_delay_counter] += channel_byte
+                        if mod_delay_channel_fast[counter]:
+                            delay_decay = 0.5
+                        else:
+                            delay_decay = 0.8
+                        mod_channel_delay_buffer[counter][mod_delay_counter] *= delay_decay
+                    if not delay_silent[counter]:
+                        # reduce clicking
+                        delayed_byte = 0
+                        delay_filter_passes = 2
+                        for delay_filter in range(0, delay_filter_passes):
+                            delayed_byte += mod_channel_delay_buffer[counter][mod_delay_counter - delay_filter]
+                        delayed_byte /= delay_filter_passes
+                        delayed_byte *= 1.2  # make the delay a smidge louder
+                        if not mod_delay_channel_fast[last_channel]:  # (the last channel's, as that's where the loop above finished)
+                            delayed_byte *= 0.6  # reduce volume slightly for longer decays
+                        delayed_byte = int(0 - delayed_byte)
+                        if stereo:
+                            channel_sum_right += delayed_byte  # delay only appears in the right channel - this is the intended behaviour! (it's a crude way of simulating stereo depth)
+                        else:
+                            channel_sum += delayed_byte
+                    mod_delay_counter += 1
+
+                if stems:  # this channel's finished, so it's kept to itself and the next one starts from 0
+                    if stereo:
+                        stem_sums[counter] = (channel_sum_left, channel_sum_right)
+                    else:
+                        stem_sums[counter] = (channel_sum,)
+                    channel_sum = 0
+                    channel_sum_left = 0
+                    channel_sum_right = 0
+
+            if using_delay and previous_counter < last_channel:
+                mod_delay_counter = self._advance_delay_counter(mod_delay_counter, last_channel - previous_counter)
+
+            if stems:
+                self._write_stems(stem_sums, output)
+                loop_checked = False
+                frames -= 1
+                continue
+
+            if amiga_filter is not None:  # the amiga's filters are on the output, after everything's been mixed
+                if stereo:
+                    channel_sum_left, channel_sum_right = amiga_filter.process((channel_sum_left, channel_sum_right), mod_filter)
+                else:
+                    channel_sum = amiga_filter.process((channel_sum,), mod_filter)[0]
+
+            if stereo:
+                if channel_sum_left > 32767:
+                    channel_sum_left = 32767
+                if channel_sum_left < -32768:
+                    channel_sum_left = 32768
+                if channel_sum_right > 32767:
+                    channel_sum_right = 32767
+                if channel_sum_right < -32768:
+                    channel_sum_right = -32768
+            else:
+                if channel_sum > 32767:
+                    channel_sum = 32767
+                if channel_sum < -32768:
+                    channel_sum = 32768
+
+            if stereo:
+                channel_sum_left += 32768
+                channel_sum_right += 32768
+                channel_sum_left = (channel_sum_left + 32768) & 65535
+                channel_sum_right = (channel_sum_right + 32768) & 65535
+            else:
+                channel_sum += 32768
+                channel_sum = (channel_sum + 32768) & 65535
+
+            if output is not None:  # append the 16-bit values to the output (there isn't one when fast-forwarding, and it's played a line at a time if it isn't being rendered)
+                if stereo:
+                    output.append(channel_sum_left)
+                    output.append(channel_sum_right)
+                else:
+                    output.append(channel_sum)
+
+            loop_checked = False
+            frames -= 1
+        self.mod_delay_counter = mod_delay_counter
+        self.mod_bass_position = mod_bass_position
+        self.sample_number = sample_number
+
+    def advance_line(self):
+        """Moves on from the current line, following any breaks, loops and pattern delays."""
+
+        mod_lines = self.mod_lines
+        mod_channels = self.mod_channels
+        mod_song_length = self.mod_song_length
+        mod_order = self.mod_order
+        mod_orders_visited = self.mod_orders_visited
+        mod_lines_visited = self.mod_lines_visited
+        mod_pattern_loop_start = self.mod_pattern_loop_start
+        mod_pattern_loop_end = self.mod_pattern_loop_end
+        mod_pattern_loop_counter = self.mod_pattern_loop_counter
+        total_nb_of_loops = self.total_nb_of_loops
+
+        self.lines_played += 1
+
+        if not self.mod_position_break and not self.mod_line_break and self.mod_pattern_delay_finished:
+            mod_lines_visited.append([self.mod_order_position, self.mod_line])
+
+        self.mod_looped = False  # it only makes sense to add one loop at a time... this also fixes some duplicate loop errors
+        if self.mod_pattern_delay == 0:
+            if self.mod_position_break:
+                if not self.mod_line_break:  # position break on its own?
+                    self.mod_next_line = 0  # if so, reset to beginning of pattern
+                    if self.mod_next_position == self.mod_order_position:  # if a position breaks to itself without a line break, that counts as a loop
+                        self.mod_current_loop += 1
+                        self.mod_looped = True
+                self.mod_row = (mod_order[self.mod_next_position] * mod_lines) + self.mod_next_line
+                self.mod_order_position = self.mod_next_position  # change current order
+                self.mod_line = 0  # reset line COUNTER
+            else:
+                self.mod_line += 1
+
+            # there's one pattern loop per channel!!
+            any_pattern_loops = False
+            for channel in range(0, mod_channels):
+                if mod_pattern_loop_start[channel] >= 0:
+                    if mod_pattern_loop_counter[channel] > 0 and self.mod_line - 1 == mod_pattern_loop_end[channel]:
+                        self.mod_line = mod_pattern_loop_start[channel]
+                        self.mod_row = (mod_order[self.mod_order_position] * mod_lines) + self.mod_line
+                        mod_pattern_loop_counter[channel] -= 1
+                        if mod_pattern_loop_counter[channel] == 0:
+                            mod_pattern_loop_start[channel] = -1
+                            self.mod_line = mod_pattern_loop_end[channel] + 1
+                            mod_pattern_loop_end[channel] = -1
+                            self.mod_row = (mod_order[self.mod_order_position] * mod_lines) + self.mod_line
+                if mod_pattern_loop_counter[channel] > 0:
+                    any_pattern_loops = True
+
+            if self.mod_line_break:
+                if not self.mod_position_break:
+                    if mod_song_length > 1:  # if the song is only one order long and there's a line break, stay on the same order
+                        self.mod_order_position += 1
+                        if self.mod_order_position > mod_song_length - 1:
+                            self.mod_order_position = 0
+                            if not self.mod_looped:
+                                self.mod_looped = True
+                                self.mod_current_loop += 1
+                    if [self.mod_order_position, self.mod_next_line] in mod_lines_visited:
+                        if not self.mod_looped:
+                            self.mod_looped = True
+                            self.mod_current_loop += 1
+                self.mod_line = self.mod_next_line
+                self.mod_row = (mod_order[self.mod_order_position] * mod_lines) + self.mod_next_line
+
+            if (self.mod_position_break or self.mod_line_break) and not any_pattern_loops:
+                if [self.mod_order_position, self.mod_line] in self.mod_jumps:  # has this specific line and order been visited before?
+                    if not self.mod_looped:
+                        self.mod_looped = True
+                        self.mod_current_loop += 1
+                    self.mod_jumps = [[self.mod_order_position, self.mod_line]]  # fixes "delayskip.mod" - probably not correct, but it works
+                    mod_orders_visited.clear()
+                else:
+                    if self.mod_order_position in mod_orders_visited:  # has this order been visited before? (used for position jumps determining the loop point)
+                        if not self.mod_looped:
+                            self.mod_looped = True
+                            self.mod_current_loop += 1
+                        mod_orders_visited.clear()
+                    self.mod_jumps.append([self.mod_order_position, self.mod_line])
+
+            self.mod_position_break = False
+            self.mod_line_break = False
+
+            if self.mod_current_loop > total_nb_of_loops - 1:
+                self.mod_order_position = mod_song_length  # end
+                self.mod_line = mod_lines
+
+        if self.mod_pattern_delay > 0:
+            self.mod_pattern_delay_finished = False
+            self.mod_pattern_delay -= 1
+        else:
+            self.mod_pattern_delay_finished = True
+
+    def _end_pattern(self):
+        mod_lines = self.mod_lines
+        mod_song_length = self.mod_song_length
+        mod_order = self.mod_order
+        mod_orders_visited = self.mod_orders_visited
+        total_nb_of_loops = self.total_nb_of_loops
+
+        mod_orders_visited.append(self.mod_order_position)  # this is only executed if the END of a pattern is reached with no breaks!!
+        if not self.mod_line_break:  # position breaks reset the line anyway
+            self.mod_line = 0
+        if mod_song_length > 1:
+            self.mod_order_position += 1
+            if self.mod_order_position == mod_song_length:  # reached the very last order?
+                self.mod_order_position = 0
+                self.mod_row = mod_order[0] * mod_lines
+                self.mod_line = 0
+                if not self.mod_looped:
+                    self.mod_looped = True
+                    self.mod_current_loop += 1
+                    self.mod_jumps.clear()
+                    mod_orders_visited.clear()
+        else:
+            if not self.mod_looped:
+                self.mod_looped = True
+                self.mod_current_loop += 1
+        if self.mod_current_loop > total_nb_of_loops - 1:  # copypasta SSSSHHHHH (but this is for when the pattern ends, not per line... so if you're line breaking/position breaking this won't be reached)
+            self.mod_order_position = mod_song_length  # end
+            self.mod_line = mod_lines
+        self.mod_row = mod_order[self.mod_order_position] * mod_lines
@@ -0,0 +1,100 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import sys
+
+from .wavwriter import WavWriter
+
+
+# -- Classes
+# every sink has the same three methods: open() (called with the amount of channels and the sample rate before
+# anything's written), write() (called with an array of 16-bit values in the machine's byte order, which the sink
+# can keep, as it isn't used again) and close() (once everything's been written)
+
+class NullSink:
+    """Throws the audio away (for measuring how quickly modules are mixed, without a disk or sound card slowing it
+    down). bytes_written is how much it was given."""
+
+    def __init__(self):
+        self.bytes_written = 0
+
+    def open(self, channels, sample_rate):
+        pass
+
+    def write(self, data):
+        self.bytes_written += len(data) * data.itemsize
+
+    def close(self):
+        pass
+
+
+class RawSink:
+    """Writes raw signed 16-bit little endian PCM (s16le) to a binary file object, such as sys.stdout.buffer, a pipe
+    to another program or a BytesIO. The file's left open, as it belongs to whatever passed it in."""
+
+    def __init__(self, file):
+        self._file = file
+
+    def open(self, channels, sample_rate):
+        pass
+
+    def write(self, data):
+        if sys.byteorder == "big":
+            data.byteswap()
+        self._file.write(data)
+
+    def close(self):
+        self._file.flush()
+
+
+class WavSink:
+    """Writes a WAV file as it goes (with a WavWriter, so the writing's done by another thread)."""
+
+    def __init__(self, filename):
+        self._filename = filename
+        self._wav_writer = None
+
+    def open(self, channels, sample_rate):
+        self._wav_writer = WavWriter(self._filename, channels, sample_rate)
+
+    def write(self, data):
+        if sys.byteorder == "big":  # wav files are always little endian
+            data.byteswap()
+        self._wav_writer.write(data)
+
+    def close(self):
+        self._wav_writer.close()
+
+
+class PyAudioSink:
+    """Plays the audio in realtime through the default output device, using PyAudio."""
+
+    def __init__(self, buffer_size, preroll):
+        self._buffer_size = buffer_size
+        self._preroll = preroll
+        self._playback = None
+
+    def open(self, channels, sample_rate):
+        from .playback import Playback  # pyaudio's only imported when something's actually played, so rendering doesn't need it
+
+        self._playback = Playback(sample_rate, channels, self._buffer_size, self._preroll)
+
+    def write(self, data):
+        self._playback.write(data)
+
+    def close(self):
+        self._playback.close()  # (once everything's been played)
@@ -0,0 +1,104 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import bisect
+import math
+
+from array import array
+
+
+# -- Functions
+def tick_start(tick, tick_length, ticks, line_frames):
+    """Returns the first frame (counting from the start of the line) on or after which the player's tick counter reaches the given tick."""
+
+    line_length = tick_length * ticks
+    # the tick of frame n is int((n / line length) * ticks), so start from a guess and nudge it until it's the first frame of the tick
+    frame = min(math.ceil(tick * tick_length), line_frames)
+    while frame > 0 and int(((frame - 1) / line_length) * ticks) >= tick:
+        frame -= 1
+    while frame < line_frames and int((frame / line_length) * ticks) < tick:
+        frame += 1
+    return frame
+
+
+# -- Classes
+class Timeline:
+    """Where every line of a song starts (in frames) when it's played at a certain sample rate. It's found by going through
+    the song without mixing any audio, so it's exact: the length of the timeline is the length of the rendered file."""
+
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.length = 0  # in frames
+
+        # one entry per line, in the order they're played (a line can appear more than once thanks to loops and pattern delays)
+        self.order_positions = array("B")
+        self.patterns = array("B")
+        self.lines = array("B")
+        self.loops = array("H")
+        self.tempos = array("B")
+        self.ticks = array("B")  # ticks per line
+        self.tick_lengths = array("d")  # frames per tick (not a whole number!)
+        self.frames = array("Q")  # the frame each line starts on
+
+    def __len__(self):
+        return len(self.frames)
+
+    def add_line(self, order_position, pattern, line, loop, tempo, ticks, tick_length):
+        """Adds the next line played, and returns how many frames it lasts."""
+
+        # a line lasts as many frames as it takes the tick counter to reach ticks * tick length (counting up from 0)
+        line_frames = max(0, math.ceil(tick_length * ticks))
+
+        self.order_positions.append(order_position)
+        self.patterns.append(pattern)
+        self.lines.append(line)
+        self.loops.append(loop)
+        self.tempos.append(tempo)
+        self.ticks.append(ticks)
+        self.tick_lengths.append(tick_length)
+        self.frames.append(self.length)
+        self.length += line_frames
+        return line_frames
+
+    def length_ms(self):
+        return self.frame_to_ms(self.length)
+
+    def frame_to_ms(self, frame):
+        return (frame * 1000) / self.sample_rate
+
+    def ms_to_frame(self, ms):
+        return int((ms * self.sample_rate) / 1000)
+
+    def find_line(self, frame):
+        """Returns the index of the line playing at the given frame (or -1 if the timeline's empty)."""
+
+        if len(self.frames) == 0:
+            return -1
+        if frame >= self.length:
+            frame = self.length - 1
+        return bisect.bisect_right(self.frames, frame) - 1  # lines lasting 0 frames are skipped over, since the next line starts on the same frame
+
+    def line_frames(self, index):
+        if index == len(self.frames) - 1:
+            return self.length - self.frames[index]
+        return self.frames[index + 1] - self.frames[index]
+
+    def tick_frames(self, index):
+        """Returns the frame each tick of a line starts on."""
+
+        line_frames = self.line_frames(index)
+        return [self.frames[index] + tick_start(tick, self.tick_lengths[index], self.ticks[index], line_frames) for tick in range(0, self.ticks[index])]
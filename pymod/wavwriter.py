@@ -0,0 +1,70 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import wave
+import queue
+import threading
+
+
+# -- Constants
+stream_block_size = 65536  # how many bytes of audio are handed to the writer at a time
+stream_queue_length = 8  # how many blocks can be waiting to be written
+
+
+# -- Classes
+class WavWriter:
+    """Writes a WAV file a block at a time while the rest of the song's still being rendered. The blocks go in a
+    queue, and a thread writes them to the file, so the disk's being written to while the next blocks are mixed.
+    The queue only holds a few blocks (rendering waits if the disk can't keep up), so the memory used stays the
+    same however long the song is. The sizes in the header are filled in when the file's closed."""
+
+    def __init__(self, filename, channels, sample_rate):
+        self._wave_file = wave.open(filename, "wb")
+        self._wave_file.setnchannels(channels)
+        self._wave_file.setsampwidth(2)
+        self._wave_file.setframerate(sample_rate)
+        self._queue = queue.Queue(stream_queue_length)
+        self._error = None
+        self._thread = threading.Thread(target=self._write_blocks, daemon=True)  # (so an interrupted render doesn't wait for it)
+        self._thread.start()
+
+    def write(self, data):
+        """Queues a block of 16-bit little endian frames to be written. It isn't copied, so it mustn't be changed afterwards!"""
+
+        if self._error is not None:
+            raise self._error
+        self._queue.put(data)
+
+    def close(self):
+        """Waits for every block to be written, then closes the file (which fills in the header)."""
+
+        self._queue.put(None)
+        self._thread.join()
+        self._wave_file.close()
+        if self._error is not None:
+            raise self._error
+
+    def _write_blocks(self):
+        while True:
+            data = self._queue.get()
+            if data is None:
+                break
+            if self._error is None:  # after an error, the rest are just taken off the queue (so nothing's left waiting)
+                try:
+                    self._wave_file.writeframesraw(data)
+                except OSError as error:
+                    self._error = error
@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+import sys
+import os
+import math
+
+from array import array
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+from pymod.amigafilter import AmigaFilter  # noqa: E402
+from tests.render_test import _setup_module  # noqa: E402
+from tests.seek_test import read_frames  # noqa: E402
+
+
+# -- Utility functions
+def filter_sine(model, frequency, led, sample_rate=44100):
+    '''The loudest a sine wave gets after being filtered (once the filter's settled down).'''
+    amiga_filter = AmigaFilter(model, sample_rate, 1)
+    filtered = [amiga_filter.process((int(16384 * math.sin(2 * math.pi * frequency * frame / sample_rate)),), led)[0] for frame in range(0, sample_rate // 10)]
+    return max(abs(value) for value in filtered[sample_rate // 20:])
+
+
+# -- Tests
+@pytest.mark.parametrize("model", ['a500', 'a1200'])
+def test_filter_response(model):
+    # -- Low frequencies go straight through, and the led filter takes away the high frequencies
+    assert filter_sine(model, 100, False) == pytest.approx(16384, abs=50)
+    assert filter_sine(model, 100, True) == pytest.approx(16384, abs=50)
+    assert filter_sine(model, 10000, True) < 16384 / 8
+    assert filter_sine(model, 10000, True) < filter_sine(model, 10000, False)
+    assert filter_sine('a500', 10000, False) < filter_sine('a1200', 10000, False)
+
+
+@pytest.mark.parametrize("frames", [1, 31, 32, 100, 1000])
+def test_filter_block(frames):
+    np = pytest.importorskip('numpy')
+
+    # -- Filtering a block at a time should be exactly the same as filtering one frame at a time (give or take rounding)
+    amiga_filter = AmigaFilter('a500', 22050, 2)
+    amiga_filter_block = AmigaFilter('a500', 22050, 2)
+    rng = np.random.default_rng(23)
+    for led in (True, False, True):
+        values = rng.integers(-32768, 32767, (2, frames))
+        filtered = np.array([amiga_filter.process(values[:, frame].tolist(), led) for frame in range(0, frames)]).T
+        assert np.abs(amiga_filter_block.process_block(values, led) - filtered).max() <= 1
+
+
+def test_render_filter_model(tmp_path):
+    # -- E0x turns the led filter on and off, and the simple filter isn't used at all
+    temp_files = {}
+    for model in pymod.Module.filter_models():
+        module = _setup_module({'filename': 'filter'})
+        module.set_filter_model(model)
+        temp_files[model] = os.path.join(tmp_path, f'pymod-test-filter-{model}.wav')
+        module.render_to(temp_files[model])
+
+    frames = {model: read_frames(temp_file) for model, temp_file in temp_files.items()}
+    assert frames['simple'] == read_frames(os.path.join(sys.path[0], 'tests', 'wavs', 'filter.wav'))
+    assert len(frames['a500']) == len(frames['simple'])
+    assert frames['a500'] != frames['simple']
+
+
+def test_render_filter_model_numpy(tmp_path):
+    pytest.importorskip('numpy')
+
+    temp_files = {}
+    for engine in ('python', 'numpy'):
+        module = _setup_module({'filename': 'filter'})
+        module.set_filter_model('a500')
+        module.set_engine(engine)
+        temp_files[engine] = os.path.join(tmp_path, f'pymod-test-filter-{engine}.wav')
+        module.render_to(temp_files[engine])
+
+    frames = {engine: array('h', read_frames(temp_file)) for engine, temp_file in temp_files.items()}
+    assert max(abs(a - b) for a, b in zip(frames['python'], frames['numpy'])) <= 1
+
+
+@pytest.mark.parametrize("engine", ['python', 'numpy'])
+def test_render_channels_filter_model(engine, tmp_path):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+
+    # -- Each channel's filtered on its own, and since the filters are linear, they still add up to the whole mix
+    module = _setup_module({'filename': 'filter'})
+    module.set_filter_model('a500')
+    module.set_engine(engine)
+    temp_file = os.path.join(tmp_path, 'pymod-test-filter.wav')
+    module.render_to(temp_file)
+    module.render_to(temp_file.replace('.wav', '_1.wav'), separate_channels=True)
+
+    mixed = array('h', read_frames(temp_file))
+    channels = [array('h', read_frames(temp_file.replace('.wav', f'_{channel + 1}.wav'))) for channel in range(0, module._channels)]
+    assert all(len(channel) == len(mixed) for channel in channels)
+    assert max(abs(sum(values[1:]) - values[0]) for values in zip(mixed, *channels)) <= module._channels
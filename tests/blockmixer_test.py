@@ -0,0 +1,111 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+import sys
+import os
+import filecmp
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+from tests.render_test import modules_list, _setup_module  # noqa: E402
+from tests.seek_test import read_frames, golden_frames  # noqa: E402
+
+pytest.importorskip('numpy')
+
+
+# -- Tests
+@pytest.mark.parametrize("module_info", modules_list)
+def test_render_numpy(module_info, tmp_path):
+    # -- The numpy engine should sound exactly the same as the python one
+    module = _setup_module(module_info)
+    module.set_engine('numpy')
+
+    filename = module_info['filename']
+    if 'start_pos' in module_info:
+        wav_filepath = os.path.join(sys.path[0], 'tests', 'wavs', f"{filename}_{module_info['start_pos']}_{module_info['pattern_count']}.wav")
+    else:
+        wav_filepath = os.path.join(sys.path[0], 'tests', 'wavs', f'{filename}.wav')
+    temp_file = os.path.join(tmp_path, f'pymod-test-{filename}.wav')
+    module.render_to(temp_file)
+
+    assert filecmp.cmp(wav_filepath, temp_file)
+
+    os.remove(temp_file)
+
+
+@pytest.mark.parametrize("filename", ['basschan', 'delayfx', 'loopchange2', 'reverse', 'pan'])
+@pytest.mark.parametrize("play_mode", ['mono_filter', 'stereo_soft'])
+def test_render_channels_numpy(filename, play_mode, tmp_path):
+    temp_files = {}
+    for engine in ('python', 'numpy'):
+        module = _setup_module({'filename': filename})
+        module.set_play_mode(play_mode)
+        module.set_interpolate(True)
+        module.set_engine(engine)
+        temp_files[engine] = os.path.join(tmp_path, f'pymod-test-{filename}-{engine}_1.wav')
+        module.render_to(temp_files[engine], separate_channels=True)
+
+    for channel in range(0, module._channels):
+        assert filecmp.cmp(temp_files['python'].replace('_1.wav', f'_{channel + 1}.wav'), temp_files['numpy'].replace('_1.wav', f'_{channel + 1}.wav'))
+
+
+@pytest.mark.parametrize("filename", ['basschan', 'delay', 'delaysim'])
+def test_render_44100_numpy(filename, tmp_path):
+    # -- The bass filter's history and the delay's buffer are much longer at higher sample rates, and blocks are
+    # -- split up differently
+    temp_files = {}
+    for engine in ('python', 'numpy'):
+        module = _setup_module({'filename': filename})
+        module.set_sample_rate(44100)
+        module.set_engine(engine)
+        temp_files[engine] = os.path.join(tmp_path, f'pymod-test-{filename}-{engine}.wav')
+        module.render_to(temp_files[engine])
+
+    assert filecmp.cmp(temp_files['python'], temp_files['numpy'], shallow=False)
+
+
+def test_render_range_numpy(tmp_path):
+    module = _setup_module({'filename': 'vibwave'})
+    module.set_engine('numpy')
+    temp_file = os.path.join(tmp_path, 'pymod-test-vibwave.wav')
+
+    module.render_range(temp_file, 1.3, 2.9)
+    assert read_frames(temp_file) == golden_frames('vibwave', 1.3, 2.9)
+
+    os.remove(temp_file)
+
+
+def test_sample_bank():
+    data = pymod.ModuleData.from_file(os.path.join(sys.path[0], 'tests', 'modules', 'pwm.mod'))
+    sample_overlay = pymod.moduledata.SampleOverlay(data.data)
+    sample_bank = pymod.blockmixer.SampleBank(sample_overlay)
+
+    sample = data.samples[0]
+    sample_overlay.invert(sample.offset + 10, sample.offset, sample.offset + sample.length)
+    sample_overlay.invert(len(data.data) - 1, len(data.data) - 4, len(data.data))
+    sample_bank.update()
+
+    for position in (0, sample.offset + 9, sample.offset + 10, len(data.data) - 1):
+        assert sample_bank.values[position] == (sample_overlay[position] + 128) & 255
+    assert sample_bank.values[len(data.data)] == sample_bank.values[len(data.data) - 1]  # the guard byte
+
+    # -- The module data itself is never changed
+    assert pymod.blockmixer.SampleBank(pymod.moduledata.SampleOverlay(data.data)).values[sample.offset + 10] == (data.data[sample.offset + 10] + 128) & 255
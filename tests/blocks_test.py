@@ -0,0 +1,143 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+import sys
+import os
+import asyncio
+
+from array import array
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+from tests.render_test import _setup_module  # noqa: E402
+from tests.seek_test import read_frames, golden_frames  # noqa: E402
+
+
+# -- Utility functions
+def golden_values(filename):
+    return array('h', read_frames(os.path.join(sys.path[0], 'tests', 'wavs', f'{filename}.wav')))
+
+
+async def collect_blocks(module, block_frames):
+    rendered = array('h')
+    async for block in module.aiter_blocks(block_frames):
+        rendered += block
+    return rendered
+
+
+# -- Tests
+@pytest.mark.parametrize("filename", ['ode2ptk', 'delayfx', 'vibwave'])
+@pytest.mark.parametrize("engine", ['python', 'numpy'])
+def test_iter_blocks(filename, engine):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+
+    # -- Every block's the same length apart from the last one, and put together they're the same as a render
+    module = _setup_module({'filename': filename})
+    module.set_engine(engine)
+    blocks = list(module.iter_blocks(1000))
+    assert all(len(block) == 2000 for block in blocks[:-1])
+    assert 0 < len(blocks[-1]) <= 2000
+    rendered = array('h')
+    for block in blocks:
+        rendered += block
+    assert rendered == golden_values(filename)
+
+
+def test_iter_blocks_planar():
+    module = _setup_module({'filename': 'vibwave'})
+    module.seek(1.3)
+    expected = array('h', golden_frames('vibwave', 1.3, 100))
+    left = array('f')
+    right = array('f')
+    for block_left, block_right in module.iter_blocks(333, sample_format='float32', planar=True):
+        assert len(block_left) == len(block_right)
+        left += block_left
+        right += block_right
+    assert list(left) == [value / 32768 for value in expected[0::2]]
+    assert list(right) == [value / 32768 for value in expected[1::2]]
+
+
+def test_iter_blocks_lazy(monkeypatch):
+    # -- Only the lines needed for each block are mixed
+    lines_mixed = []
+    mix_line = pymod.pymod._Player.mix_line
+
+    def mix_line_counted(self):
+        lines_mixed.append(self.lines_played)
+        mix_line(self)
+
+    monkeypatch.setattr(pymod.pymod._Player, 'mix_line', mix_line_counted)
+    module = _setup_module({'filename': 'ode2ptk'})
+    blocks = module.iter_blocks(256)
+    assert lines_mixed == []
+    next(blocks)
+    assert len(lines_mixed) == 1
+    blocks.close()
+
+
+def test_iter_blocks_invalid():
+    module = _setup_module({'filename': 'vibwave'})
+    assert list(module.iter_blocks(256, sample_format='int8')) == []
+    assert list(module.iter_blocks(0)) == []
+    module.set_play_mode('info')
+    assert list(module.iter_blocks(256)) == []
+
+
+def test_aiter_blocks():
+    # -- Several modules rendered at once (their blocks mixed in turn, on the executor's threads) each come out the same
+    # -- as rendering them on their own, as every render keeps its own state
+    filenames = ['delayfx', 'pwm', 'tremolo']
+    modules = [_setup_module({'filename': filename}) for filename in filenames]
+
+    async def render_all():
+        return await asyncio.gather(*(collect_blocks(module, 1000) for module in modules))
+
+    for filename, rendered in zip(filenames, asyncio.run(render_all())):
+        assert rendered == golden_values(filename)
+
+
+def test_aiter_blocks_cancel(monkeypatch):
+    # -- Once it's cancelled, nothing else is mixed
+    lines_mixed = []
+    mix_line = pymod.pymod._Player.mix_line
+
+    def mix_line_counted(self):
+        lines_mixed.append(self.lines_played)
+        mix_line(self)
+
+    monkeypatch.setattr(pymod.pymod._Player, 'mix_line', mix_line_counted)
+    module = _setup_module({'filename': 'ode2ptk'})
+
+    async def render_cancelled():
+        task = asyncio.create_task(collect_blocks(module, 256))
+        while len(lines_mixed) < 3:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.1)
+
+    asyncio.run(render_cancelled())
+    lines = len(lines_mixed)
+    assert lines < len(module.get_timeline())
+    asyncio.run(asyncio.sleep(0.1))
+    assert len(lines_mixed) == lines
@@ -0,0 +1,103 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+import sys
+import os
+import random
+import filecmp
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+from pymod.interpolation import get_kernel, kernel_phases  # noqa: E402
+from tests.render_test import _setup_module  # noqa: E402
+
+
+# -- Tests
+@pytest.mark.parametrize("kind", ['cubic', 'sinc'])
+def test_kernel(kind):
+    kernel = get_kernel(kind)
+    assert len(kernel.weights) == kernel_phases
+    for weights in kernel.weights:
+        assert len(weights) == kernel.taps
+        assert sum(weights) == pytest.approx(1)
+
+    # -- Right on a byte, that byte is all that's heard
+    assert kernel.weights[0][0 - kernel.start] == pytest.approx(1)
+    assert sum(abs(weight) for weight in kernel.weights[0]) == pytest.approx(1)
+
+    with pytest.raises(ValueError):
+        get_kernel('linear')
+
+
+@pytest.mark.parametrize("filename", ['reverse', 'offset'])
+def test_render_interpolation(filename, tmp_path):
+    temp_files = {}
+    for kind in pymod.Module.interpolations():
+        module = _setup_module({'filename': filename})
+        module.set_interpolate(True)
+        module.set_interpolation(kind)
+        temp_files[kind] = os.path.join(tmp_path, f'pymod-test-{filename}-{kind}.wav')
+        module.render_to(temp_files[kind])
+
+    assert not filecmp.cmp(temp_files['linear'], temp_files['cubic'], shallow=False)
+    assert not filecmp.cmp(temp_files['cubic'], temp_files['sinc'], shallow=False)
+
+
+@pytest.mark.parametrize("kind", ['cubic', 'sinc'])
+def test_render_interpolation_numpy(kind, tmp_path):
+    pytest.importorskip('numpy')
+
+    # -- Both engines should sound exactly the same, with every play mode's mixdown
+    for play_mode in ('stereo_hard', 'mono_filter'):
+        temp_files = {}
+        for engine in pymod.Module.engines():
+            module = _setup_module({'filename': 'reverse'})
+            module.set_play_mode(play_mode)
+            module.set_interpolate(True)
+            module.set_interpolation(kind)
+            module.set_engine(engine)
+            temp_files[engine] = os.path.join(tmp_path, f'pymod-test-reverse-{kind}-{play_mode}-{engine}.wav')
+            module.render_to(temp_files[engine])
+
+        assert filecmp.cmp(temp_files['python'], temp_files['numpy'], shallow=False)
+
+
+def test_interpolation_effect(tmp_path):
+    # -- Put an E09 on the first line of the first channel, so only that channel's interpolated
+    module_filepath = os.path.join(sys.path[0], 'tests', 'modules', 'offset.mod')
+    with open(module_filepath, 'rb') as file:
+        mod_file = bytearray(file.read())
+    data = pymod.ModuleData.from_bytes(bytes(mod_file))
+    cell = data.pattern_offsets[data.order[0]]
+    mod_file[cell + 2] = (mod_file[cell + 2] & 0xf0) | 0xe
+    mod_file[cell + 3] = 0x09
+    data = pymod.ModuleData.from_bytes(bytes(mod_file))
+
+    temp_files = {}
+    for kind in pymod.Module.interpolations():
+        random.seed(pymod.Module.render_test_random_seed())
+        module = pymod.Module(data, sample_rate=pymod.Module.render_test_sample_rate(), play_mode='stereo_hard', quiet=True)
+        module.set_interpolation(kind)
+        temp_files[kind] = os.path.join(tmp_path, f'pymod-test-e09-{kind}.wav')
+        module.render_to(temp_files[kind])
+
+    assert not filecmp.cmp(temp_files['linear'], temp_files['cubic'], shallow=False)
+    assert not filecmp.cmp(temp_files['linear'], temp_files['sinc'], shallow=False)
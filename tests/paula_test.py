@@ -0,0 +1,76 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+import sys
+import os
+
+from array import array
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+from pymod.paula import paula_phase_one, paula_step_rate  # noqa: E402
+from tests.render_test import _setup_module  # noqa: E402
+from tests.seek_test import read_frames  # noqa: E402
+
+pytest.importorskip('numpy')
+
+
+# -- Tests
+@pytest.mark.parametrize("filename", ['ode2ptk', 'reverse', 'tremolo', 'delayfx'])
+def test_render_paula(filename, tmp_path):
+    # -- The paula engine isn't meant to sound exactly the same, just very close to it (without tremolo or
+    # -- long notes, it often is exactly the same)
+    temp_files = {}
+    for engine in ('numpy', 'paula'):
+        module = _setup_module({'filename': filename})
+        module.set_engine(engine)
+        temp_files[engine] = os.path.join(tmp_path, f'pymod-test-{filename}-{engine}.wav')
+        module.render_to(temp_files[engine])
+
+    frames = {engine: array('h', read_frames(temp_file)) for engine, temp_file in temp_files.items()}
+    assert len(frames['paula']) == len(frames['numpy'])
+    difference = sum(abs(a - b) for a, b in zip(frames['paula'], frames['numpy']))
+    assert difference <= sum(abs(a) for a in frames['numpy']) / 50  # (tremolo's the biggest difference, as the volume's always a whole number)
+
+
+def test_render_range_paula(tmp_path):
+    # -- Seeking has to end up in exactly the same place as playing from the start
+    module = _setup_module({'filename': 'vibwave'})
+    module.set_engine('paula')
+    temp_file = os.path.join(tmp_path, 'pymod-test-vibwave.wav')
+    module.render_to(temp_file)
+    sample_rate = pymod.Module.render_test_sample_rate()
+    expected = read_frames(temp_file)[int(1.3 * sample_rate) * 4:int(2.9 * sample_rate) * 4]
+
+    module.render_range(temp_file, 1.3, 2.9)
+    assert read_frames(temp_file) == expected
+
+    os.remove(temp_file)
+
+
+def test_paula_step_rate():
+    # -- The steps are whole numbers, so adding them up never drifts
+    step = paula_step_rate(pymod.Module._mod_get_frequency(428), 44100)
+    assert isinstance(step, int)
+    position = 0.0
+    for frame in range(0, 100000):
+        position += step / paula_phase_one
+    assert position * paula_phase_one == step * 100000
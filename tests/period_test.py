@@ -0,0 +1,45 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+import sys
+import os
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+
+# -- Tests
+@pytest.mark.parametrize("legacy", [False, True])
+def test_period_note_lookup(legacy):
+    # -- The lookup tables should give exactly the same notes as searching through the period tables
+    for period in range(-2, 4098):
+        assert pymod.Module._mod_get_period_note(period, legacy) == pymod.Module._mod_find_period_note(period, legacy)
+
+
+@pytest.mark.parametrize("legacy", [False, True])
+def test_closest_period_lookup(legacy):
+    if legacy:
+        finetunes = len(pymod.Module._mod_legacy_periods)
+    else:
+        finetunes = len(pymod.Module._mod_extended_periods)
+
+    for finetune in range(0, finetunes):
+        for period in range(-2, 4098):
+            assert pymod.Module._mod_get_closest_period(period, finetune, legacy) == pymod.Module._mod_find_closest_period(period, finetune, legacy)
@@ -0,0 +1,51 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+import sys
+import os
+import threading
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+from pymod.playback import RingBuffer  # noqa: E402
+
+
+# -- Tests
+def test_ring_buffer():
+    # -- Going round the end of the buffer, and never giving out more than's been written
+    ring_buffer = RingBuffer(10)
+    ring_buffer.write(b'abcdefg')
+    assert ring_buffer.read(4) == b'abcd'
+    ring_buffer.write(b'hijkl')
+    assert ring_buffer.available() == 8
+    assert ring_buffer.read(100) == b'efghijkl'
+    assert ring_buffer.read(100) == b''
+
+
+def test_ring_buffer_threads():
+    # -- The writer waits for the reader to make room, and everything comes out in order
+    ring_buffer = RingBuffer(64)
+    data = bytes(a & 255 for a in range(0, 10000))
+    writer = threading.Thread(target=lambda: [ring_buffer.write(data[a:a + 100]) for a in range(0, len(data), 100)])
+    writer.start()
+
+    read_data = b''
+    while len(read_data) < len(data):
+        assert ring_buffer.available() <= 64
+        read_data += ring_buffer.read(37)
+    writer.join()
+    assert read_data == data
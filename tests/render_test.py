@@ -230,3 +230,36 @@ def test_render_channels(module_info, tmp_path):
 
     for channel in range(0, module._channels):
         os.remove(temp_file_prefix + f"_{channel + 1}.wav")
+
+
+def test_render_shared_data(tmp_path):
+    # -- pwm.mod uses the "invert loop" effect, which changes the sample data while it plays
+    module_filepath = os.path.join(sys.path[0], 'tests', 'modules', 'pwm.mod')
+    module_data = pymod.ModuleData.from_file(module_filepath)
+    wav_filepath = os.path.join(sys.path[0], 'tests', 'wavs', 'pwm.wav')
+
+    for render in range(0, 2):
+        module = pymod.Module(module_data, sample_rate=pymod.Module.render_test_sample_rate(), play_mode='stereo_hard', quiet=True)
+        random.seed(pymod.Module.render_test_random_seed())
+
+        temp_file = os.path.join(tmp_path, f'pymod-test-pwm-{render}.wav')
+        module.render_to(temp_file)
+
+        assert filecmp.cmp(wav_filepath, temp_file)
+
+    # -- The samples changed by the effect are copies, the module data itself should never change
+    with open(module_filepath, 'rb') as module_file:
+        assert module_data.data == module_file.read()
+
+
+@pytest.mark.parametrize("length", [0, 500])
+def test_invalid_module(length, tmp_path, capsys):
+    # -- Empty and truncated files aren't modules, and they're reported as such
+    module_filepath = os.path.join(tmp_path, 'pymod-test-invalid.mod')
+    with open(module_filepath, 'wb') as module_file:
+        module_file.write(bytes(length))
+    assert pymod.ModuleData.from_file(module_filepath).channels == 0
+
+    module = pymod.Module(module_filepath, play_mode='info', quiet=True)
+    module.play()
+    assert 'Error: Invalid module!' in capsys.readouterr().out
@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+import sys
+import os
+import filecmp
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+from tests.render_test import _setup_module  # noqa: E402
+
+
+# -- Utility functions
+def read_file(filepath):
+    with open(filepath, 'rb') as file:
+        return file.read()
+
+
+def interrupt_after(monkeypatch, lines):
+    '''Makes the next render stop (as if it was killed) after the given amount of lines.'''
+    advance_line = pymod.pymod._Player.advance_line
+    lines_played = [0]
+
+    def advance_line_interrupted(player):
+        advance_line(player)
+        if not player._sequence_only:  # the song's also followed through (without any audio) to find its length
+            lines_played[0] += 1
+            if lines_played[0] == lines:
+                raise KeyboardInterrupt
+
+    monkeypatch.setattr(pymod.pymod._Player, 'advance_line', advance_line_interrupted)
+
+
+# -- Tests
+@pytest.mark.parametrize("filename", ['vibwave', 'patloop2', 'delayfx'])
+def test_resume(filename, tmp_path, monkeypatch):
+    module = _setup_module({'filename': filename})
+    module.set_resume_interval(0)  # save after every line
+    temp_file = os.path.join(tmp_path, f'pymod-test-{filename}.wav')
+
+    interrupt_after(monkeypatch, 37)
+    with pytest.raises(KeyboardInterrupt):
+        module.render_to(temp_file, resume=True)
+    monkeypatch.undo()
+    assert os.path.exists(temp_file + '.resume')
+    assert os.path.exists(temp_file + '.part')
+
+    module.render_to(temp_file, resume=True)
+    assert filecmp.cmp(os.path.join(sys.path[0], 'tests', 'wavs', f'{filename}.wav'), temp_file)
+    assert not os.path.exists(temp_file + '.resume')
+    assert not os.path.exists(temp_file + '.part')
+
+    os.remove(temp_file)
+
+
+def test_resume_channels(tmp_path, monkeypatch):
+    module = _setup_module({'filename': 'basschan'})
+    module.set_resume_interval(0)
+    temp_file_prefix = os.path.join(tmp_path, 'pymod-test-basschan')
+
+    module.render_to(temp_file_prefix + '_1.wav', separate_channels=True)
+    expected = [read_file(f'{temp_file_prefix}_{channel + 1}.wav') for channel in range(0, module._channels)]
+
+    # -- Stop halfway through the song (every channel's rendered at once, so they've all been half rendered)
+    interrupt_after(monkeypatch, 32)
+    with pytest.raises(KeyboardInterrupt):
+        module.render_to(temp_file_prefix + '_1.wav', separate_channels=True, resume=True)
+    monkeypatch.undo()
+
+    module.render_to(temp_file_prefix + '_1.wav', separate_channels=True, resume=True)
+    for channel in range(0, module._channels):
+        assert read_file(f'{temp_file_prefix}_{channel + 1}.wav') == expected[channel]
+
+
+def test_resume_different_settings(tmp_path, monkeypatch):
+    module = _setup_module({'filename': 'pwm'})
+    module.set_resume_interval(0)
+    temp_file = os.path.join(tmp_path, 'pymod-test-pwm.wav')
+
+    module.set_amplify(2)
+    interrupt_after(monkeypatch, 20)
+    with pytest.raises(KeyboardInterrupt):
+        module.render_to(temp_file, resume=True)
+    monkeypatch.undo()
+
+    # -- The saved render was louder, so it's started again from the beginning
+    module.set_amplify(1)
+    module.render_to(temp_file, resume=True)
+    assert filecmp.cmp(os.path.join(sys.path[0], 'tests', 'wavs', 'pwm.wav'), temp_file)
+
+
+def test_resume_interrupted_settings(tmp_path, monkeypatch):
+    # -- An interrupted render doesn't leave the next one resumable
+    module = _setup_module({'filename': 'pwm'})
+    module.set_resume_interval(0)
+    temp_file = os.path.join(tmp_path, 'pymod-test-pwm.wav')
+
+    interrupt_after(monkeypatch, 20)
+    with pytest.raises(KeyboardInterrupt):
+        module.render_to(temp_file, resume=True)
+    monkeypatch.undo()
+
+    saves = []
+    monkeypatch.setattr(pymod.Module, '_mod_save_resume', lambda module, *arguments: saves.append(arguments))
+    other_temp_file = os.path.join(tmp_path, 'pymod-test-pwm-other.wav')
+    module.render_range(other_temp_file, 0, 10000)
+    assert filecmp.cmp(os.path.join(sys.path[0], 'tests', 'wavs', 'pwm.wav'), other_temp_file)
+    assert saves == []
@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+import sys
+import os
+import io
+import re
+import random
+
+import wave
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+from tests.render_test import _setup_module  # noqa: E402
+
+
+# -- Utility functions
+def read_frames(wav_filepath):
+    with wave.open(wav_filepath, 'rb') as wave_file:
+        return wave_file.readframes(wave_file.getnframes())
+
+
+def golden_frames(filename, start, end):
+    '''The part of the test file between start and end (in seconds).'''
+    frame_size = 4
+    sample_rate = pymod.Module.render_test_sample_rate()
+    data = read_frames(os.path.join(sys.path[0], 'tests', 'wavs', f'{filename}.wav'))
+    return data[int(start * sample_rate) * frame_size:int(end * sample_rate) * frame_size]
+
+
+# -- Tests
+@pytest.mark.parametrize("filename", ['pwm', 'ode2ptk', 'vibwave', 'patloop2', 'delayfx', 'patdelay'])
+def test_render_range(filename, tmp_path):
+    module = _setup_module({'filename': filename})
+    module.set_checkpoint_interval(4)
+    temp_file = os.path.join(tmp_path, f'pymod-test-{filename}.wav')
+
+    # -- The second range starts before the first, so it's rendered from the checkpoints made for the first one
+    for start, end in ((2.5, 4.25), (0.75, 2.0)):
+        module.render_range(temp_file, start, end)
+        assert read_frames(temp_file) == golden_frames(filename, start, end)
+
+    os.remove(temp_file)
+
+
+def test_render_range_past_end(tmp_path):
+    module = _setup_module({'filename': 'basschan'})
+    temp_file = os.path.join(tmp_path, 'pymod-test-basschan.wav')
+
+    module.render_range(temp_file, 1.5, 10000)
+    assert read_frames(temp_file) == golden_frames('basschan', 1.5, 10000)
+
+    os.remove(temp_file)
+
+
+def test_seek(tmp_path):
+    module = _setup_module({'filename': 'breaks'})
+    temp_file = os.path.join(tmp_path, 'pymod-test-breaks.wav')
+
+    module.seek(1.125)
+    module.render_to(temp_file)
+    assert read_frames(temp_file) == golden_frames('breaks', 1.125, 10000)
+
+    os.remove(temp_file)
+
+
+def test_seek_after_render(capsys):
+    # -- The checkpoints taken while rendering are used when playing too, but they're still played like anything else
+    module = _setup_module({'filename': 'breaks'})
+    module.render_range(pymod.RawSink(io.BytesIO()), 1.125, 10000)
+
+    module.set_quiet(False)
+    module.set_verbose(True)
+    module.seek(1.125)
+    module.play(pymod.RawSink(io.BytesIO()))
+    assert re.search(r'\|[A-G][-#][0-9]', capsys.readouterr().out)
+
+
+def test_seek_random_state():
+    # -- The random waveforms start off from the random module's state, but seeking and playing never change it
+    module = _setup_module({'filename': 'vibwave'})
+    raw_file = io.BytesIO()
+    module.render_range(pymod.RawSink(raw_file), 1.3, 2.9)
+    assert raw_file.getvalue() == golden_frames('vibwave', 1.3, 2.9)
+
+    random.seed(1)
+    state = random.getstate()
+    raw_file = io.BytesIO()
+    module.render_range(pymod.RawSink(raw_file), 1.3, 2.9)
+    assert random.getstate() == state
+    assert raw_file.getvalue() == golden_frames('vibwave', 1.3, 2.9)
+
+
+def test_seek_checkpoints():
+    # -- Only the checkpoints for the last settings used are kept
+    module = _setup_module({'filename': 'breaks'})
+    for sample_rate in (8000, 11025, 8000):
+        module.set_sample_rate(sample_rate)
+        module.render_range(pymod.RawSink(io.BytesIO()), 1.125, 10000)
+        assert len(module._checkpoints) == 1
+
+    module.set_sample_rate(pymod.Module.render_test_sample_rate())
+    raw_file = io.BytesIO()
+    module.render_range(pymod.RawSink(raw_file), 1.125, 10000)
+    assert raw_file.getvalue() == golden_frames('breaks', 1.125, 10000)
@@ -0,0 +1,108 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+import pytest
+import sys
+import os
+import io
+import filecmp
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+from tests.render_test import _setup_module  # noqa: E402
+from tests.seek_test import read_frames, golden_frames  # noqa: E402
+
+
+# -- Utility functions
+def golden_wav(filename):
+    return os.path.join(sys.path[0], 'tests', 'wavs', f'{filename}.wav')
+
+
+class BrokenFile:
+    '''A file that can't be written to (like a pipe that's been closed).'''
+
+    def write(self, data):
+        raise OSError("broken")
+
+    def flush(self):
+        pass
+
+
+# -- Tests
+@pytest.mark.parametrize("filename", ['ode2ptk', 'delayfx'])
+@pytest.mark.parametrize("engine", ['python', 'numpy'])
+def test_render_raw_sink(filename, engine):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+
+    module = _setup_module({'filename': filename})
+    module.set_engine(engine)
+    raw_file = io.BytesIO()
+    module.render_to(pymod.RawSink(raw_file))
+    assert raw_file.getvalue() == read_frames(golden_wav(filename))
+
+
+def test_render_null_sink():
+    module = _setup_module({'filename': 'vibwave'})
+    sink = pymod.NullSink()
+    module.render_to(sink)
+    assert sink.bytes_written == len(read_frames(golden_wav('vibwave')))
+
+
+def test_render_wav_sink(tmp_path):
+    module = _setup_module({'filename': 'vibwave'})
+    temp_file = os.path.join(tmp_path, 'pymod-test-vibwave.wav')
+    module.render_to(pymod.WavSink(temp_file))
+    assert filecmp.cmp(golden_wav('vibwave'), temp_file)
+
+
+def test_render_range_sink():
+    module = _setup_module({'filename': 'vibwave'})
+    raw_file = io.BytesIO()
+    module.render_range(pymod.RawSink(raw_file), 1.3, 2.9)
+    assert raw_file.getvalue() == golden_frames('vibwave', 1.3, 2.9)
+
+
+def test_play_sink():
+    # -- Playing doesn't stop exactly at the end of the song (the last line's played in full), but it's otherwise the same
+    module = _setup_module({'filename': 'vibwave'})
+    raw_file = io.BytesIO()
+    module.play(pymod.RawSink(raw_file))
+    expected = read_frames(golden_wav('vibwave'))
+    assert raw_file.getvalue()[:len(expected)] == expected
+
+
+def test_render_channels_sink():
+    # -- Rendering channels separately needs a file for each one
+    module = _setup_module({'filename': 'vibwave'})
+    raw_file = io.BytesIO()
+    module.render_to(pymod.RawSink(raw_file), separate_channels=True)
+    assert raw_file.getvalue() == b''
+
+
+def test_render_range_sink_error():
+    # -- A sink that fails isn't used again, so the next play goes to its own sink
+    module = _setup_module({'filename': 'vibwave'})
+    with pytest.raises(OSError):
+        module.render_range(pymod.RawSink(BrokenFile()), 1.3, 2.9)
+
+    raw_file = io.BytesIO()
+    module.play(pymod.RawSink(raw_file))
+    expected = read_frames(golden_wav('vibwave'))
+    assert raw_file.getvalue()[:len(expected)] == expected
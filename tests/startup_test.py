@@ -0,0 +1,78 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+import sys
+import os
+import subprocess
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+
+# -- Utility functions
+def import_times(*arguments):
+    '''Runs Python with -X importtime and the given arguments, returning how long (in microseconds, including
+    everything it imported) each module it imported took.'''
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + list(arguments), cwd=sys.path[0], capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('| imported package'):
+            self_time, cumulative_time, name = line[len('import time:'):].split('|')
+            times[name.strip()] = int(cumulative_time)
+    return times
+
+
+# -- Tests
+def test_startup_imports():
+    # -- Neither NumPy nor PyAudio (nor asyncio) should be imported until something actually uses them
+    times = import_times('-c', 'import pymod')
+    assert 'pymod' in times
+    for name in ('numpy', 'pyaudio', 'asyncio', 'pymod.blockmixer', 'pymod.playback'):
+        assert name not in times
+    print(f"import pymod: {times['pymod'] / 1000:.1f} ms")
+
+
+def test_startup_playback():
+    # -- The ring buffer doesn't need PyAudio, only playing something does
+    times = import_times('-c', 'from pymod.playback import RingBuffer')
+    assert 'pymod.playback' in times
+    assert 'pyaudio' not in times
+
+
+def test_startup_info():
+    # -- Showing a module's info is the quickest thing the command line does, so it shouldn't need them either
+    times = import_times('-m', 'pymod', os.path.join('tests', 'modules', 'ode2ptk.mod'), 'info')
+    assert 'pymod' in times
+    assert 'numpy' not in times
+    assert 'pyaudio' not in times
+
+
+def test_startup_render(tmp_path):
+    # -- Rendering with the python engine doesn't need either of them, and the numpy engine only needs NumPy
+    filepath = os.path.join('tests', 'modules', 'simpy.mod')
+    temp_file = os.path.join(tmp_path, 'pymod-test-startup.wav')
+    render = f"import pymod; module = pymod.Module({filepath!r}, sample_rate=8000, quiet=True); module.set_engine('%s'); module.render_to({temp_file!r})"
+    times = import_times('-c', render % 'python')
+    assert os.path.getsize(temp_file) > 44
+    assert 'numpy' not in times
+    assert 'pyaudio' not in times
+
+    pytest.importorskip('numpy')
+    times = import_times('-c', render % 'numpy')
+    assert 'numpy' in times
+    assert 'pyaudio' not in times
@@ -0,0 +1,63 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+import sys
+import os
+
+import wave
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+from tests.render_test import modules_list, _setup_module  # noqa: E402
+
+
+# -- Tests
+@pytest.mark.parametrize("module_info", modules_list)
+def test_timeline_length(module_info):
+    # -- The timeline is found without mixing anything, but it should be exactly as long as the rendered file
+    module = _setup_module(module_info)
+    timeline = module.get_timeline()
+
+    filename = module_info['filename']
+    if 'start_pos' in module_info:
+        wav_filepath = os.path.join(sys.path[0], 'tests', 'wavs', f"{filename}_{module_info['start_pos']}_{module_info['pattern_count']}.wav")
+    else:
+        wav_filepath = os.path.join(sys.path[0], 'tests', 'wavs', f'{filename}.wav')
+    with wave.open(wav_filepath, 'rb') as wave_file:
+        assert timeline.length == wave_file.getnframes()
+    assert timeline.length_ms() == (timeline.length * 1000) / pymod.Module.render_test_sample_rate()
+
+
+def test_timeline_ticks():
+    # -- ode2ptk.mod changes the tempo and ticks per line a lot
+    module = _setup_module({'filename': 'ode2ptk'})
+    module.set_sample_rate(44100)
+    timeline = module.get_timeline()
+
+    for index in range(0, len(timeline)):
+        ticks = timeline.ticks[index]
+        line_length = timeline.tick_lengths[index] * ticks
+        expected = []
+        for frame in range(0, timeline.line_frames(index)):  # the same tick counter the player uses
+            if int((frame / line_length) * ticks) == len(expected):
+                expected.append(timeline.frames[index] + frame)
+        assert timeline.tick_frames(index) == expected
+        assert timeline.find_line(timeline.frames[index]) == index or timeline.line_frames(index) == 0
@@ -0,0 +1,85 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+import pytest
+import sys
+import os
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+from tests.render_test import _setup_module  # noqa: E402
+from tests.seek_test import read_frames  # noqa: E402
+
+
+# -- Utility functions
+def record_voices(monkeypatch):
+    '''Keeps every player that schedules its voices, along with how many voices it had on each tick.'''
+    schedule_voices = pymod.pymod._Player._schedule_voices
+    players = []
+    voices = []
+
+    def schedule_voices_checked(player):
+        schedule_voices(player)
+        if player not in players:
+            players.append(player)
+        voices.append(len(player.mod_voices))
+
+        # -- A channel that's playing, or still making a sound, can't be left out
+        for channel in range(0, player.mod_channels):
+            if player.mod_sample_playing[channel]:
+                assert channel in player.mod_voices
+            if player.mod_channel_byte[channel] != 0 or player.mod_channel_byte_last[channel] != 0:
+                assert channel in player.mod_voices
+                assert channel in player.mod_mixdown_channels
+
+    monkeypatch.setattr(pymod.pymod._Player, '_schedule_voices', schedule_voices_checked)
+    return players, voices
+
+
+# -- Tests
+@pytest.mark.parametrize("filename", ['nosamp', 'delayfx', 'basschan'])
+@pytest.mark.parametrize("engine", ['python', 'numpy'])
+def test_voices(filename, engine, tmp_path, monkeypatch):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+
+    module = _setup_module({'filename': filename})
+    module.set_engine(engine)
+    temp_file = os.path.join(tmp_path, f'pymod-test-{filename}.wav')
+
+    players, voices = record_voices(monkeypatch)
+    module.render_to(temp_file)
+    assert read_frames(temp_file) == read_frames(os.path.join(sys.path[0], 'tests', 'wavs', f'{filename}.wav'))
+    assert min(voices) < module._channels  # (every one of these has ticks where some channels are silent)
+
+
+def test_advance_delay_counter(tmp_path, monkeypatch):
+    # -- Skipping channels has to leave the delay counter exactly where going through them would've done
+    module = _setup_module({'filename': 'delayfx'})
+    players, voices = record_voices(monkeypatch)
+    module.render_to(os.path.join(tmp_path, 'pymod-test-delayfx.wav'))
+    player = players[0]
+
+    for mod_delay_counter in (0, 1, 5, player.mod_delay_length - 2, player.mod_delay_length - 1):
+        expected = mod_delay_counter
+        for steps in range(0, player.mod_delay_length * 2):
+            assert player._advance_delay_counter(mod_delay_counter, steps) == expected
+            if expected == player.mod_delay_length - 1:
+                expected = 0
+            expected += 1
@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2023-present Presley Peters (Prezzo).
+#
+# This file is part of pymod.
+#
+# pymod is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pymod is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public
+# License for more details.
+#
+# You should have received a copy of the GNU General Public License along with pymod. If not,
+# see <https://www.gnu.org/licenses/>.
+#
+import pytest
+import sys
+import os
+import wave
+import filecmp
+
+# -- We need to import from our parent folder here.
+sys.path.append(os.path.join(sys.path[0], '..'))
+
+import pymod    # noqa: E402
+
+from pymod.wavwriter import WavWriter  # noqa: E402
+from tests.render_test import _setup_module  # noqa: E402
+from tests.resume_test import interrupt_after  # noqa: E402
+from tests.seek_test import read_frames  # noqa: E402
+
+
+# -- Tests
+def test_wav_writer(tmp_path):
+    # -- The header's filled in with the right sizes when the file's closed
+    temp_file = os.path.join(tmp_path, 'pymod-test-writer.wav')
+    wav_writer = WavWriter(temp_file, 2, 8000)
+    blocks = [bytes([a]) * 4000 for a in range(0, 20)]
+    for block in blocks:
+        wav_writer.write(block)
+    wav_writer.close()
+
+    with wave.open(temp_file, 'rb') as wave_file:
+        assert wave_file.getnchannels() == 2
+        assert wave_file.getframerate() == 8000
+        assert wave_file.getnframes() == 20000
+        assert wave_file.readframes(20000) == b''.join(blocks)
+
+
+@pytest.mark.parametrize("filename", ['ode2ptk', 'delayfx', 'vibwave'])
+def test_render_stream(filename, tmp_path):
+    module = _setup_module({'filename': filename})
+    temp_file = os.path.join(tmp_path, f'pymod-test-{filename}.wav')
+    module.render_to(temp_file, stream=True)
+    assert filecmp.cmp(os.path.join(sys.path[0], 'tests', 'wavs', f'{filename}.wav'), temp_file)
+
+
+def test_render_stream_channels(tmp_path):
+    temp_files = {}
+    for stream in (False, True):
+        module = _setup_module({'filename': 'basschan'})
+        temp_files[stream] = os.path.join(tmp_path, f'pymod-test-basschan-{stream}_1.wav')
+        module.render_to(temp_files[stream], separate_channels=True, stream=stream)
+
+    for channel in range(0, module._channels):
+        assert filecmp.cmp(temp_files[False].replace('_1.wav', f'_{channel + 1}.wav'), temp_files[True].replace('_1.wav', f'_{channel + 1}.wav'))
+
+
+def test_render_range_stream(tmp_path):
+    # -- Only the part that's been asked for is written (the last line usually goes past the end)
+    module = _setup_module({'filename': 'vibwave'})
+    module.seek(1.3)
+    temp_file = os.path.join(tmp_path, 'pymod-test-vibwave.wav')
+    module.render_to(temp_file, stream=True)
+    expected = read_frames(os.path.join(sys.path[0], 'tests', 'wavs', 'vibwave.wav'))[int(1.3 * pymod.Module.render_test_sample_rate()) * 4:]
+    assert read_frames(temp_file) == expected
+
+
+def test_resume_stream(tmp_path, monkeypatch):
+    module = _setup_module({'filename': 'ode2ptk'})
+    module.set_resume_interval(0)
+    temp_file = os.path.join(tmp_path, 'pymod-test-ode2ptk.wav')
+
+    interrupt_after(monkeypatch, 150)
+    with pytest.raises(KeyboardInterrupt):
+        module.render_to(temp_file, resume=True, stream=True)
+    monkeypatch.undo()
+    assert os.path.exists(temp_file + '.part')
+
+    _setup_module({'filename': 'ode2ptk'})
+    module.render_to(temp_file, resume=True, stream=True)
+    assert filecmp.cmp(os.path.join(sys.path[0], 'tests', 'wavs', 'ode2ptk.wav'), temp_file)
+    assert not os.path.exists(temp_file + '.resume')
+    assert not os.path.exists(temp_file + '.part')